@@ -0,0 +1,234 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Profiling mode of the random action runner.
+
+Runs the random actions of the RIDE model and records the latency of every
+action by its name, like ``add_row``, ``rename_keyword``, ``undo`` or
+``save``. The report tells the percentiles of the latencies per action,
+and for the slowest steps optionally their cProfile statistics and the
+memory allocations of the step from tracemalloc.
+
+Usage: python -m rtest.profiler path [--steps 10000] [--seed N]
+                                     [--cprofile] [--tracemalloc]
+                                     [--slowest 5] [--output report.json]
+"""
+
+import argparse
+import bisect
+import cProfile
+import io
+import json
+import math
+import os
+import pstats
+import sys
+import time
+import traceback
+import tracemalloc
+from contextlib import nullcontext, redirect_stdout
+
+ROOT = os.path.dirname(__file__)
+src = os.path.join(ROOT, '..', 'src')
+
+sys.path.insert(0, src)
+
+from .test_runner import Runner
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, percent):
+    """Returns the nearest-rank percentile of the sorted values."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(percent / 100.0 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class SlowStep(object):
+
+    def __init__(self, index, action, duration, profile_stats=None, allocations=None):
+        self.index = index
+        self.action = action
+        self.duration = duration
+        self.profile_stats = profile_stats
+        self.allocations = allocations
+
+    def as_dict(self):
+        return {'step': self.index, 'action': self.action, 'duration': self.duration,
+                'profile': self.profile_stats, 'allocations': self.allocations}
+
+
+class ActionProfile(object):
+    """Latencies and errors of the steps by action, and the slowest steps."""
+
+    def __init__(self, slowest=5):
+        self.latencies = {}
+        self.errors = {}
+        self.slowest = []
+        self._slowest_count = slowest
+
+    def add(self, index, action, duration, error=None):
+        bisect.insort(self.latencies.setdefault(action, []), duration)
+        if error:
+            self.errors.setdefault(action, []).append((index, error))
+
+    def is_slowest(self, duration):
+        return len(self.slowest) < self._slowest_count or duration > self.slowest[-1].duration
+
+    def add_slow_step(self, step):
+        self.slowest.append(step)
+        self.slowest.sort(key=lambda s: s.duration, reverse=True)
+        del self.slowest[self._slowest_count:]
+
+    def summary(self):
+        actions = {}
+        for action, latencies in self.latencies.items():
+            summary = {'count': len(latencies), 'total': sum(latencies), 'max': latencies[-1],
+                       'errors': len(self.errors.get(action, []))}
+            for percent in PERCENTILES:
+                summary['p%d' % percent] = percentile(latencies, percent)
+            actions[action] = summary
+        return actions
+
+    def as_dict(self):
+        return {'actions': self.summary(),
+                'errors': dict((action, [{'step': index, 'error': error} for index, error in errors])
+                               for action, errors in self.errors.items()),
+                'slowest': [step.as_dict() for step in self.slowest]}
+
+
+class ProfilingRunner(Runner):
+    """Runs the random actions and records how long each of them takes.
+
+    With ``use_cprofile`` every step is profiled, and the statistics are kept
+    for the slowest steps. With ``use_tracemalloc`` the allocations are traced,
+    and a snapshot of them is taken after a step that is among the slowest.
+    The output of the model is discarded unless ``quiet`` is false. An error
+    in a step is recorded for its action, and the run continues.
+    """
+
+    def __init__(self, seed, path, root, slowest=5, use_cprofile=False, use_tracemalloc=False, quiet=True):
+        Runner.__init__(self, seed, path, root)
+        self.profile = ActionProfile(slowest)
+        self._use_cprofile = use_cprofile
+        self._use_tracemalloc = use_tracemalloc
+        self._quiet = quiet
+
+    def initialize(self):
+        if self._use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        with self._output():
+            return Runner.initialize(self)
+
+    def _output(self):
+        return redirect_stdout(io.StringIO()) if self._quiet else nullcontext()
+
+    def step(self):
+        self._count += 1
+        self._model._do_not_skip()
+        action = self._random.choice(self._actions)
+        profiler = cProfile.Profile() if self._use_cprofile else None
+        if self._use_tracemalloc:
+            tracemalloc.clear_traces()
+        error = None
+        with self._output():
+            start = time.perf_counter()
+            if profiler:
+                profiler.enable()
+            try:
+                getattr(self._model, action)()
+            except Exception as err:
+                error = ''.join(traceback.format_exception_only(type(err), err)).strip()
+            finally:
+                if profiler:
+                    profiler.disable()
+                duration = time.perf_counter() - start
+        self.profile.add(self._count, action, duration, error)
+        if self.profile.is_slowest(duration):
+            self.profile.add_slow_step(SlowStep(self._count, action, duration,
+                                                self._profile_stats(profiler), self._allocations()))
+
+    @staticmethod
+    def _profile_stats(profiler, limit=20):
+        if not profiler:
+            return None
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(limit)
+        return output.getvalue()
+
+    def _allocations(self, limit=10):
+        if not self._use_tracemalloc:
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>')])
+        return [str(stat) for stat in snapshot.statistics('lineno')[:limit]]
+
+
+def write_report(profile, write):
+    write('%s%8s%10s%10s%10s%10s%10s%8s\n' % ('Action'.ljust(30), 'Count', 'Total s', 'p50 ms', 'p95 ms',
+                                              'p99 ms', 'Max ms', 'Errors'))
+    summary = profile.summary()
+    for action in sorted(summary, key=lambda name: summary[name]['total'], reverse=True):
+        stats = summary[action]
+        write('%s%8d%10.3f%10.2f%10.2f%10.2f%10.2f%8d\n'
+              % (action.ljust(30), stats['count'], stats['total'], stats['p50'] * 1000, stats['p95'] * 1000,
+                 stats['p99'] * 1000, stats['max'] * 1000, stats['errors']))
+    write('\nSlowest steps:\n')
+    for step in profile.slowest:
+        write('  step %d %s %.2f ms\n' % (step.index, step.action, step.duration * 1000))
+        for details in (step.profile_stats, '\n'.join(step.allocations or [])):
+            if details:
+                write('\n'.join('    ' + line for line in details.strip().splitlines()) + '\n')
+
+
+def profile_run(path, steps=10000, seed=None, **options):
+    seed = int(time.time() * 256) if seed is None else seed
+    runner = ProfilingRunner(seed, path, ROOT, **options).initialize()
+    start = time.perf_counter()
+    for _ in range(steps):
+        runner.step()
+    return seed, time.perf_counter() - start, runner.profile
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Profile the random actions of the RIDE model.')
+    parser.add_argument('path', help='directory where the test data is copied to')
+    parser.add_argument('--steps', type=int, default=10000, help='number of random actions')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the random actions')
+    parser.add_argument('--slowest', type=int, default=5, help='number of the slowest steps to report')
+    parser.add_argument('--cprofile', action='store_true', help='profile the slowest steps with cProfile')
+    parser.add_argument('--tracemalloc', action='store_true', help='trace the allocations of the slowest steps')
+    parser.add_argument('--verbose', action='store_true', help='show the output of the model')
+    parser.add_argument('--output', default=None, help='file to write the JSON report to')
+    options = parser.parse_args(args)
+    seed, elapsed, profile = profile_run(options.path, options.steps, options.seed, slowest=options.slowest,
+                                         use_cprofile=options.cprofile, use_tracemalloc=options.tracemalloc,
+                                         quiet=not options.verbose)
+    if options.output:
+        with open(options.output, 'w') as output:
+            report = {'seed': seed, 'steps': options.steps, 'elapsed': elapsed}
+            report.update(profile.as_dict())
+            json.dump(report, output, indent=2)
+    write_report(profile, sys.stdout.write)
+    sys.stdout.write('\n%d steps in %.2f s, seed was %d\n' % (options.steps, elapsed, seed))
+    return not profile.errors
+
+
+if __name__ == '__main__':
+    if not main():
+        sys.exit(1)
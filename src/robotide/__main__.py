@@ -15,6 +15,11 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import sys
+
 from robotide import main
 
-main()
+# Must be protected against reimporting, because the worker processes
+# started with the spawn method import the main module of RIDE again
+if __name__ == '__main__':
+    main(*sys.argv[1:])
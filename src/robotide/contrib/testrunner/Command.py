@@ -51,9 +51,12 @@ class Command:
         self._prefix = prefix
         return self
 
-    def with_listener(self, port, pause_on_failure=False):
+    def with_listener(self, port, pause_on_failure=False, framing=None, events=None, log_level=None):
         if port:
-            self._listener = (port, pause_on_failure)
+            options = [framing, events, log_level]
+            while options and not options[-1]:
+                options.pop()
+            self._listener = (port, pause_on_failure) + tuple(option or '' for option in options)
         else:
             self._listener = None
         return self
@@ -86,7 +89,7 @@ class Command:
         path = self._get_listener_path()
         if path[-1] in ['c', 'o']:
             path = path[:-1]
-        return '%s:%s:%s' % (path, self._listener[0], self._listener[1])
+        return ':'.join([path] + [str(arg) for arg in self._listener])
 
     def _get_listener_path(self):
         return os.path.abspath(inspect.getfile(TestRunnerAgent))
@@ -36,19 +36,20 @@ import subprocess
 import sys
 import threading
 
-from queue import Empty, Queue
 from robotide.context import IS_WINDOWS
+from .consolebuffer import OutputBuffer
 
 OUTPUT_ENCODING = sys.getfilesystemencoding()
 
 
 class Process(object):
 
-    def __init__(self, cwd):
+    def __init__(self, cwd, output_parser=None):
         self._process = None
         self._error_stream = None
         self._output_stream = None
         self._cwd = cwd
+        self._output_parser = output_parser
         self._port = None
         self._sock = None
         self._kill_called = False
@@ -76,7 +77,7 @@ class Process(object):
             subprocess_args['shell'] = True
         self._process = subprocess.Popen(command, **subprocess_args)
         self._process.stdin.close()
-        self._output_stream = StreamReaderThread(self._process.stdout)
+        self._output_stream = StreamReaderThread(self._process.stdout, self._output_parser)
         self._error_stream = StreamReaderThread(self._process.stderr)
         self._output_stream.run()
         self._error_stream.run()
@@ -161,8 +162,8 @@ class Process(object):
 
 class StreamReaderThread(object):
 
-    def __init__(self, stream):
-        self._queue = Queue()
+    def __init__(self, stream, parser=None):
+        self._buffer = OutputBuffer(parser)
         self._thread = None
         self._stream = stream
 
@@ -174,14 +175,7 @@ class StreamReaderThread(object):
 
     def _enqueue_output(self, out):
         for line in iter(out.readline, b''):
-            self._queue.put(line)
+            self._buffer.append(line)
 
     def pop(self):
-        result = b''
-        my_queue_rng = range(self._queue.qsize())
-        for _ in my_queue_rng:
-            try:
-                result += self._queue.get_nowait()
-            except Empty:
-                pass
-        return result
+        return self._buffer.pop()
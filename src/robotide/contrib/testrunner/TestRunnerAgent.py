@@ -63,15 +63,27 @@
 This uses a custom streamhandler module, preferring json but sending either
 json or pickle to send objects to the listening server. It should probably be
 refactored to call an XMLRPC server.
+
+When RIDE gives the framing ``binary`` or ``msgpack`` as the third listener
+argument, events are sent in batches with a fixed size binary header. The
+batches are encoded with msgpack when requested and msgpack is installed,
+otherwise with json.
+
+The fourth listener argument tells which events RIDE subscribes to and the
+fifth the lowest level of log messages to send. Without them every event
+is sent as before.
 """
 
+import codecs
 import copy
 import os
 import pickle
 import platform
+import struct
 import sys
 import socket
 import threading
+import time
 
 PLATFORM = platform.python_implementation()
 
@@ -100,6 +112,11 @@ except ImportError:
     json = None
     _JSONAVAIL = False
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 try:
     from StringIO import StringIO
 except ImportError:  # py3 <=3.6
@@ -107,6 +124,27 @@ except ImportError:  # py3 <=3.6
 
 HOST = "localhost"
 
+FRAMING_JSON = 'json'
+FRAMING_BINARY = 'binary'
+FRAMING_MSGPACK = 'msgpack'
+
+# Events are written at latest when this many are waiting or after the interval
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.05
+# Events RIDE must get without waiting for the batch, for example to show
+# that the execution is paused or to be able to stop it
+IMMEDIATE_EVENTS = ('pid', 'port', 'paused', 'continue', 'close')
+
+# Subscription levels. Below EVENTS_TRACE keyword starts and ends are sent
+# only as 'current_keyword' events of the running keyword name, at most
+# KEYWORD_UPDATES_PER_SECOND times in a second.
+EVENTS_TESTS = 'tests'  # Suites and tests, no keywords nor log messages
+EVENTS_FAILURES = 'failures'  # Also the running keyword and warnings and errors
+EVENTS_KEYWORDS = 'keywords'  # Also log messages from the given level
+EVENTS_TRACE = 'trace'  # Every event
+KEYWORD_UPDATES_PER_SECOND = 10
+LOG_LEVELS = {'TRACE': 0, 'DEBUG': 1, 'INFO': 2, 'HTML': 2, 'WARN': 3, 'ERROR': 4, 'FAIL': 5, 'NONE': 6}
+
 # Setting Output encoding to UTF-8 and ignoring the platform specs
 # RIDE will expect UTF-8
 # Set output encoding to UTF-8 for piped output streams
@@ -119,8 +157,9 @@ HOST = "localhost"
 class TestRunnerAgent:
     """Pass all listener events to a remote listener
 
-    If called with one argument, that argument is a port
-    If called with two, the first is a hostname, the second is a port
+    The first argument is the port, the second tells whether to pause on
+    failure and the optional ones are the framing of the events, the
+    subscription level and the lowest level of sent log messages.
     """
     ROBOT_LISTENER_API_VERSION = 2
 
@@ -130,13 +169,31 @@ class TestRunnerAgent:
         self.sock = None
         self.filehandler = None
         self.streamhandler = None
+        self.batchwriter = None
+        self._send_lock = threading.Lock()
         self._connect()
+        if self.filehandler and len(args) >= 3 and args[2] in (FRAMING_BINARY, FRAMING_MSGPACK):
+            self.batchwriter = BatchWriter(self.streamhandler, use_msgpack=args[2] == FRAMING_MSGPACK)
+        self._subscribe(args[3] if len(args) >= 4 and args[3] else EVENTS_TRACE,
+                        args[4] if len(args) >= 5 and args[4] else 'TRACE')
         self._send_pid()
         self._create_debugger((len(args) >= 2) and (args[1] == 'True'))
         self._create_kill_server()
         print("TestRunnerAgent: Running under %s %s\n" %
               (PLATFORM, sys.version.split()[0]))
 
+    def _subscribe(self, events, log_level):
+        self._events = events
+        self._min_log_level = LOG_LEVELS.get(log_level.upper(), 0)
+        if events == EVENTS_FAILURES:
+            self._min_log_level = max(self._min_log_level, LOG_LEVELS['WARN'])
+        elif events == EVENTS_TESTS:
+            self._min_log_level = LOG_LEVELS['NONE']
+        self._keyword_updates = None
+        if events in (EVENTS_FAILURES, EVENTS_KEYWORDS):
+            self._keyword_updates = KeywordCoalescer(
+                lambda name: self._send_socket('current_keyword', name))
+
     def _create_debugger(self, pause_on_failure):
         self._debugger = RobotDebugger(pause_on_failure)
 
@@ -178,12 +235,14 @@ class TestRunnerAgent:
 
         # we're cutting args from original attrs dict, because it may contain
         # objects which are not json-serializable, and we don't need them anyway
-        attrs_copy = copy.copy(attrs)
-        del attrs_copy['args']
-        del attrs_copy['doc']
-        del attrs_copy['assign']
-
-        self._send_socket("start_keyword", name, attrs_copy)
+        if self._events == EVENTS_TRACE:
+            attrs_copy = copy.copy(attrs)
+            del attrs_copy['args']
+            del attrs_copy['doc']
+            del attrs_copy['assign']
+            self._send_socket("start_keyword", name, attrs_copy)
+        elif self._keyword_updates:
+            self._keyword_updates.start_keyword(name)
         if self._debugger.is_breakpoint(name, attrs):  # must check original
             self._debugger.pause()
         paused = self._debugger.is_paused()
@@ -195,12 +254,14 @@ class TestRunnerAgent:
 
     def end_keyword(self, name, attrs):
         # pass empty args, see https://github.com/nokia/RED/issues/32
-        attrs_copy = copy.copy(attrs)
-        del attrs_copy['args']
-        del attrs_copy['doc']
-        del attrs_copy['assign']
-
-        self._send_socket("end_keyword", name, attrs_copy)
+        if self._events == EVENTS_TRACE:
+            attrs_copy = copy.copy(attrs)
+            del attrs_copy['args']
+            del attrs_copy['doc']
+            del attrs_copy['assign']
+            self._send_socket("end_keyword", name, attrs_copy)
+        elif self._keyword_updates:
+            self._keyword_updates.end_keyword()
         self._debugger.end_keyword(attrs['status'] == 'PASS')
 
     def message(self, message):
@@ -208,7 +269,8 @@ class TestRunnerAgent:
         pass
 
     def log_message(self, message):
-        self._send_socket("log_message", message)
+        if LOG_LEVELS.get(message['level'], LOG_LEVELS['NONE']) >= self._min_log_level:
+            self._send_socket("log_message", message)
 
     def log_file(self, path):
         self._send_socket("log_file", path)
@@ -229,7 +291,11 @@ class TestRunnerAgent:
         pass
 
     def close(self):
+        if self._keyword_updates:
+            self._keyword_updates.close()
         self._send_socket("close")
+        if self.batchwriter:
+            self.batchwriter.close()
         if self.sock:
             self.filehandler.close()
             self.sock.close()
@@ -252,8 +318,12 @@ class TestRunnerAgent:
         try:
             if self.filehandler:
                 packet = (name, args)
-                self.streamhandler.dump(packet)
-                self.filehandler.flush()
+                if self.batchwriter:
+                    self.batchwriter.write(packet, immediate=name in IMMEDIATE_EVENTS)
+                    return
+                with self._send_lock:
+                    self.streamhandler.dump(packet)
+                    self.filehandler.flush()
         except Exception:
             import traceback
             traceback.print_exc(file=sys.stdout)
@@ -261,6 +331,107 @@ class TestRunnerAgent:
             raise
 
 
+class BatchWriter(object):
+    """Writes events in batches with ``StreamHandler.dump_batch``.
+
+    Waiting events are written when the batch is full, when an immediate
+    event is written, and by a background thread after a short interval.
+    """
+
+    def __init__(self, streamhandler, use_msgpack=False, size=BATCH_SIZE, interval=FLUSH_INTERVAL):
+        self._streamhandler = streamhandler
+        self._use_msgpack = use_msgpack
+        self._size = size
+        self._interval = interval
+        self._events = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically)
+        self._flusher.daemon = True
+        self._flusher.start()
+
+    def write(self, event, immediate=False):
+        with self._lock:
+            self._events.append(event)
+            if immediate or len(self._events) >= self._size:
+                self._flush()
+
+    def close(self):
+        self._stopped.set()
+        with self._lock:
+            self._flush()
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self._interval):
+            try:
+                with self._lock:
+                    self._flush()
+            except (IOError, OSError, ValueError):  # Socket closed
+                break
+
+    def _flush(self):
+        if self._events:
+            events, self._events = self._events, []
+            self._streamhandler.dump_batch(events, self._use_msgpack)
+            self._streamhandler.fp.flush()
+
+
+class KeywordCoalescer(object):
+    """Sends the name of the running keyword at most ``rate`` times in a second.
+
+    A change within the interval is sent by a timer when the interval ends,
+    so the last keyword is shown also when no more keywords are run.
+    """
+
+    def __init__(self, send, rate=KEYWORD_UPDATES_PER_SECOND):
+        self._send = send
+        self._interval = 1.0 / rate
+        self._keywords = []
+        self._sent = ''
+        self._sent_time = 0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def start_keyword(self, name):
+        with self._lock:
+            self._keywords.append(name)
+            self._update()
+
+    def end_keyword(self):
+        with self._lock:
+            if self._keywords:
+                self._keywords.pop()
+            self._update()
+
+    def close(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def _update(self):
+        elapsed = time.time() - self._sent_time
+        if elapsed >= self._interval:
+            self._send_current()
+        elif self._timer is None:
+            self._timer = threading.Timer(self._interval - elapsed, self._send_pending)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _send_pending(self):
+        with self._lock:
+            if self._timer:
+                self._timer = None
+                self._send_current()
+
+    def _send_current(self):
+        self._sent_time = time.time()
+        current = self._keywords[-1] if self._keywords else ''
+        if current != self._sent:
+            self._sent = current
+            self._send(current)
+
+
 class RobotDebugger(object):
 
     def __init__(self, pause_on_failure=False):
@@ -494,6 +665,81 @@ class StreamHandler(object):
             write_list.extend([str(len(s)), '|', s])
         self.fp.write(bytes(''.join(write_list), "UTF-8"))
 
+    def dump_batch(self, objs, use_msgpack=False):
+        """
+        Writes a list of objects in one binary frame: the frame type ``M``
+        (msgpack) or ``B`` (json), the length of the encoded list as a four
+        byte big endian integer, and the encoded list.
+        """
+        data = None
+        if use_msgpack and msgpack:
+            try:
+                data = msgpack.packb(objs, use_bin_type=True, default=str)
+                msgtype = b'M'
+            except (TypeError, ValueError, OverflowError) as ex:
+                print(f"Exception at StreamHandler.dump_batch(): {ex}")
+        if data is None:
+            data = json.dumps(objs, separators=(',', ':'), default=str).encode('UTF-8')
+            msgtype = b'B'
+        self.fp.write(msgtype + struct.pack('>I', len(data)) + data)
+
+    def load_events(self):
+        """
+        Reads the objects of the next message from a binary file or socket.
+
+        Returns the list of a binary frame written by ``dump_batch``, or a
+        list of the one object of a message written by ``dump``.
+        """
+        msgtype = self.fp.read(1)
+        if not msgtype:
+            raise EOFError('File/Socket closed while reading load header')
+        if msgtype in (b'B', b'M'):
+            header = self._read_bytes(4)
+            data = self._read_bytes(struct.unpack('>I', header)[0])
+            try:
+                if msgtype == b'M':
+                    if not msgpack:
+                        raise DecodeError('Message type %r needs msgpack' % msgtype)
+                    return msgpack.unpackb(data, raw=False)
+                return self._json_decoder(data.decode('UTF-8'))
+            except DecodeError.wrapped_exceptions as ex:
+                raise DecodeError(str(ex))
+        header = msgtype
+        while header[-1:] != b'|':
+            recv_char = self.fp.read(1)
+            if not recv_char:
+                raise EOFError('File/Socket closed while reading load header')
+            header += recv_char
+        msglen = header[1:-1]
+        if not msglen.isdigit():
+            raise DecodeError('Message header not valid: %r' % header)
+        if msgtype != b'J':
+            raise DecodeError("Message type %r not supported" % msgtype)
+        try:
+            return [self._json_decoder(self._read_chars(int(msglen)))]
+        except DecodeError.wrapped_exceptions as ex:
+            raise DecodeError(str(ex))
+
+    def _read_bytes(self, size):
+        data = self.fp.read(size)
+        while len(data) < size:
+            more = self.fp.read(size - len(data))
+            if not more:
+                raise EOFError('File/Socket closed while reading message')
+            data += more
+        return data
+
+    def _read_chars(self, size):
+        # The length in the header of json messages is in characters
+        decoder = codecs.getincrementaldecoder('UTF-8')()
+        text = ''
+        while len(text) < size:
+            data = self.fp.read(size - len(text))
+            if not data:
+                raise EOFError('File/Socket closed while reading message')
+            text += decoder.decode(data)
+        return text
+
     def load(self):
         """
         Reads in json message prepended with message length header from a file
@@ -0,0 +1,99 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+import threading
+
+# Console colors of Robot Framework and the hyperlinks of RF 7.1 file:// URIs
+_ESCAPES = re.compile(rb'\x1b(?:\[(3[1-4])m|\[0m|\\|\]8;;\x1b\\|(\]8;;))')
+_COLORS = {b'31': 'RED', b'32': 'GREEN', b'33': 'YELLOW', b'34': 'BLUE'}
+
+
+class ColoredText(object):
+    """Console output without the ANSI escapes, and the colors they set.
+
+    ``colors`` is a list of ``(index, color)`` pairs, where ``color`` is
+    ``'RED'``, ``'GREEN'``, ``'YELLOW'``, ``'BLUE'`` or ``None`` for the
+    default color, and applies from ``index`` of ``text`` to the next pair.
+    """
+    __slots__ = ('text', 'colors')
+
+    def __init__(self, text=b'', colors=None):
+        self.text = text
+        self.colors = colors or []
+
+    def __len__(self):
+        return len(self.text)
+
+    @classmethod
+    def join(cls, parts):
+        texts = []
+        colors = []
+        offset = 0
+        for part in parts:
+            texts.append(part.text)
+            colors.extend((offset + index, color) for index, color in part.colors)
+            offset += len(part.text)
+        return cls(b''.join(texts), colors)
+
+
+def parse_colors(data):
+    """Returns the output ``data`` bytes as ``ColoredText``.
+
+    Text given as a string is returned without colors.
+    """
+    if not isinstance(data, bytes):
+        return ColoredText(data)
+    texts = []
+    colors = []
+    length = 0
+    position = 0
+    for match in _ESCAPES.finditer(data):
+        text = data[position:match.start()]
+        texts.append(text)
+        length += len(text)
+        position = match.end()
+        code, link = match.groups()
+        colors.append((length, _COLORS[code] if code else 'BLUE' if link else None))
+    texts.append(data[position:])
+    return ColoredText(b''.join(texts), colors)
+
+
+class OutputBuffer(object):
+    """Output read by a thread and waiting to be shown, in the order it was read.
+
+    When ``parser`` is given, it converts the read data to ``ColoredText``
+    before it is stored, so that the work is done by the reading thread, and
+    ``pop`` returns the joined ``ColoredText``. Otherwise ``pop`` returns the
+    read bytes.
+    """
+
+    def __init__(self, parser=None):
+        self._parser = parser
+        self._parts = []
+        self._lock = threading.Lock()
+
+    def append(self, data):
+        if self._parser:
+            data = self._parser(data)
+        with self._lock:
+            self._parts.append(data)
+
+    def pop(self):
+        with self._lock:
+            parts, self._parts = self._parts, []
+        if self._parser:
+            return ColoredText.join(parts)
+        return b''.join(parts)
@@ -33,7 +33,7 @@ import socketserver as SocketServer
 import threading
 
 from robotide.contrib.testrunner.Process import Process
-from robotide.contrib.testrunner.TestRunnerAgent import StreamHandler
+from robotide.contrib.testrunner.TestRunnerAgent import StreamHandler, FRAMING_BINARY, FRAMING_MSGPACK, msgpack
 from robotide.controller.testexecutionresults import TestExecutionResults
 
 
@@ -66,6 +66,7 @@ class TestRunner(object):
         self._pause_testname = None
         self._named_suite = ''
         self._suite_name = None
+        self._test_controllers = {}
 
     def enable(self, result_handler):
         self._start_listener_server(result_handler)
@@ -130,6 +131,13 @@ class TestRunner(object):
                                                                    testname))
 
     def _get_test_controller(self, longname, testname=None):
+        # Every test gets start and end events, and more when paused
+        key = (longname, testname)
+        if key not in self._test_controllers:
+            self._test_controllers[key] = self._find_test_controller(longname, testname)
+        return self._test_controllers[key]
+
+    def _find_test_controller(self, longname, testname):
         ret = self._project.find_controller_by_longname(longname, testname)
         if not ret and self._named_suite:
             ret = self._project.find_controller_by_longname(longname.replace(self._named_suite, self._suite_name)
@@ -144,6 +152,7 @@ class TestRunner(object):
             self._server.shutdown()
 
     def test_execution_started(self):
+        self._test_controllers = {}
         self._results.test_execution_started()
 
     def kill_process(self):
@@ -174,9 +183,9 @@ class TestRunner(object):
         if self._process:
             self._process.step_over()
 
-    def run_command(self, command, cwd):
+    def run_command(self, command, cwd, output_parser=None):
         self._pid_to_kill = None
-        self._process = Process(cwd)
+        self._process = Process(cwd, output_parser)
         self._process.run_command(command)
 
     def get_output_and_errors(self, profile):
@@ -189,6 +198,11 @@ class TestRunner(object):
     def get_listener_port(self):
         return self._port
 
+    @staticmethod
+    def get_listener_framing():
+        """Returns the framing the listener server asks the agent to use for events"""
+        return FRAMING_MSGPACK if msgpack else FRAMING_BINARY
+
     def is_running(self):
         return self._process and self._process.is_alive()
 
@@ -197,6 +211,7 @@ class TestRunner(object):
         self._process = None
         self._named_suite = ''
         self._suite_name = None
+        self._test_controllers = {}
 
 
 # The following two classes implement a small line-buffered socket
@@ -214,11 +229,11 @@ class RideListenerServer(SocketServer.TCPServer):
 
 class RideListenerHandler(SocketServer.StreamRequestHandler):
     def handle(self):
-        decoder = StreamHandler(self.request.makefile('r'))
+        decoder = StreamHandler(self.request.makefile('rb'))
         while True:
             try:
-                (name, args) = decoder.load()
-                self.server.callback(name, *args)
+                for (name, args) in decoder.load_events():
+                    self.server.callback(name, *args)
             except (EOFError, IOError):
                 # I should log this...
                 break
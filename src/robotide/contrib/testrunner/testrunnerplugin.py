@@ -54,7 +54,6 @@ import tempfile
 import threading
 import time
 import os
-import psutil
 import re
 import wx
 import wx.stc
@@ -71,6 +70,7 @@ from robotide.contrib.testrunner.CommandArgs import CommandArgs
 from robotide.contrib.testrunner.Command import Command
 from robotide.contrib.testrunner.FileWriter import FileWriter
 from robotide.contrib.testrunner.SettingsParser import SettingsParser
+from robotide.contrib.testrunner.consolebuffer import ColoredText, parse_colors
 from robotide.controller.macrocontrollers import TestCaseController
 from robotide.controller.filecontrollers import start_filemanager
 from robotide.publish import RideSettingsChanged, PUBLISHER
@@ -118,6 +118,7 @@ STYLE_PASS = 1
 STYLE_SKIP = 3
 STYLE_FAIL = 4
 STYLE_LINK = 5
+COLOR_STYLES = {'RED': STYLE_FAIL, 'GREEN': STYLE_PASS, 'YELLOW': STYLE_SKIP, 'BLUE': STYLE_LINK}
 FILE_MANAGER = 'file manager'
 
 ATEXIT_LOCK = threading.RLock()
@@ -135,6 +136,9 @@ class TestRunnerPlugin(Plugin):
                 "profile_name": "robot",
                 "show_console_log": True,
                 "show_message_log": True,
+                "listener events": 'keywords',
+                "console max lines": 20000,
+                "console max bytes": 8000000,
                 "active_status_bar": True,
                 "sash_position": 200,
                 "run_profiles":
@@ -177,10 +181,6 @@ class TestRunnerPlugin(Plugin):
         self._min_log_level_number = LOG_LEVELS['INFO']
         self._pause_on_failure = False
         self._selected_tests: {TestCaseController} = set()
-        self._process = psutil.Process()
-        self._initmemory = None
-        self._limitmemory = None  # This will be +80%
-        self._maxmemmsg = None
         self._named_suite = ''
         self.active_status_bar = self.__getattr__('active_status_bar')
         self.use_colors = self.__getattr__('use colors')
@@ -314,11 +314,6 @@ class TestRunnerPlugin(Plugin):
         self._test_runner.shutdown_server()
         event.Skip()
 
-    def _reset_memory_calc(self):
-        self._initmemory = self._process.memory_info()[0]
-        self._limitmemory = self._initmemory * 1.80
-        self._maxmemmsg = None
-
     def on_stop(self, event):
         """Called when the user clicks the "Stop" button
 
@@ -326,7 +321,6 @@ class TestRunnerPlugin(Plugin):
         same effect as typing control-c when running from the
         command line."""
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING STOP SIGNAL ]\n'),
                                     source='stderr')
         self._test_runner.send_stop_signal()
@@ -335,7 +329,6 @@ class TestRunnerPlugin(Plugin):
 
     def on_pause(self, event):
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING PAUSE SIGNAL ]\n'))
         self._test_runner.send_pause_signal()
         if self.active_status_bar:
@@ -343,7 +336,6 @@ class TestRunnerPlugin(Plugin):
 
     def on_continue(self, event):
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING CONTINUE SIGNAL ]\n'))
         self._test_runner.send_continue_signal()
         if self.active_status_bar:
@@ -351,7 +343,6 @@ class TestRunnerPlugin(Plugin):
 
     def on_step_next(self, event):
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING STEP NEXT SIGNAL ]\n'))
         self._test_runner.send_step_next_signal()
         if self.active_status_bar:
@@ -359,7 +350,6 @@ class TestRunnerPlugin(Plugin):
 
     def on_step_over(self, event):
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING STEP OVER SIGNAL ]\n'))
         self._test_runner.send_step_over_signal()
         if self.active_status_bar:
@@ -385,19 +375,19 @@ class TestRunnerPlugin(Plugin):
                 and not self._ask_user_to_run_anyway():
             # In Linux NO runs dialog 4 times
             return
-        self._reset_memory_calc()
         profile = self.get_current_profile()
         self.use_colors = self.__getattr__('use colors')
         command_args = self._create_command_args(profile.get_command_args(), log_level, self.use_colors)
         args_file = self._save_command_args_in_file(command_args)
         # print(f"DEBUG: testrunnerplugin _run_tests AFTER _save_command_args_in_file")
-        command = self._create_command(profile.get_command(), args_file)
+        command = self._create_command(profile.get_command(), args_file, command_args)
         self._initialize_variables_for_running(profile.get_settings(), command_args)
         self._initialize_ui_for_running()
         # DEBUG on Py3 it not shows correct if tags with latin chars
         self._append_to_console_log(_("command: %s\n") % command)
         try:
-            self._test_runner.run_command(command, self._get_current_working_dir(profile))
+            self._test_runner.run_command(command, self._get_current_working_dir(profile),
+                                          parse_colors if self.use_colors else None)
             self._process_timer.Start(41)  # roughly 24fps
             self._set_running()
             self._progress_bar.Start()
@@ -423,14 +413,25 @@ class TestRunnerPlugin(Plugin):
         FileWriter.write(arg_file, args, 'wb')
         return arg_file
 
-    def _create_command(self, profile_command, args_file):
+    def _create_command(self, profile_command, args_file, command_args):
         return Command().with_prefix(profile_command) \
             .with_args_file(args_file) \
             .with_listener(self._test_runner.get_listener_port(),
-                           self._pause_on_failure) \
+                           self._pause_on_failure,
+                           self._test_runner.get_listener_framing(),
+                           self.__getattr__('listener events'),
+                           self._get_message_log_level_name(command_args)) \
             .with_tests_suite_file(self.model.suite.source) \
             .build()
 
+    @staticmethod
+    def _get_message_log_level_name(args):
+        try:
+            level = ArgsParser.get_message_log_level(args)
+        except TypeError:
+            return None
+        return next((name for name, number in LOG_LEVELS.items() if number == level), None)
+
     def _initialize_variables_for_running(self, profile_settings, args):
         self._report_file = self._log_file = None
         self._log_message_queue = Queue()
@@ -578,15 +579,10 @@ class TestRunnerPlugin(Plugin):
         """Get process output"""
         __ = event
         if not self._log_message_queue.empty():
-            if self._process.memory_info()[0] <= self._limitmemory:
-                texts = []
-                while not self._log_message_queue.empty():
-                    texts += [self._log_message_queue.get()]
-                self._append_to_message_log('\n' + '\n'.join(texts))
-            else:
-                if not self._maxmemmsg:
-                    self._maxmemmsg = '\n' + _("Messages log exceeded 80% of process memory, stopping for now...")
-                    self._append_to_message_log(self._maxmemmsg, "stderr")
+            texts = []
+            while not self._log_message_queue.empty():
+                texts += [self._log_message_queue.get()]
+            self._append_to_message_log('\n' + '\n'.join(texts))
         if not self._test_runner.is_running():
             self.on_process_ended(None)
             return
@@ -622,17 +618,19 @@ class TestRunnerPlugin(Plugin):
 
     def _append_to_console_log(self, text, source="stdout"):
         """Put output to the text control"""
-        self._append_text(self._console_log_ctrl, text, source)
         if self._console_log:
-            FileWriter.write(self._console_log, [text], "ab", "a")
+            FileWriter.write(self._console_log, [text.text if isinstance(text, ColoredText) else text], "ab", "a")
+        self._append_text(self._console_log_ctrl, text, source)
 
     def _append_text(self, text_ctrl, text, source="stdout"):
-        # text could be bytes or str
+        # text could be bytes, str or ColoredText parsed by the output reader
         if not self.panel or not text_ctrl:
             return
-        self._color_map = list()
-        if self.use_colors:
-            text = self.parse_colors(text)
+        if self.use_colors and not isinstance(text, ColoredText):
+            text = parse_colors(text)
+        colors = []
+        if isinstance(text, ColoredText):
+            text, colors = text.text, text.colors
         text_ctrl.update_scroll_width(text)
         # we need this information to decide whether to autoscroll or not
         new_text_start = text_ctrl.GetLength()
@@ -641,98 +639,49 @@ class TestRunnerPlugin(Plugin):
             text_ctrl.GetFirstVisibleLine() + text_ctrl.LinesOnScreen() - 1
 
         text_ctrl.SetReadOnly(False)
-        pos = text_ctrl.GetLastPosition()   # DEBUG: Process \r with Replace
-        # print(f"DEBUG: _append_text lastposition={pos}")
         text_ctrl.AppendText(text)
         new_text_end = text_ctrl.GetLength()
 
-        if wx.VERSION < (4, 1, 0):
-            text_ctrl.StartStyling(new_text_start, 0x1f)
-        else:
-            text_ctrl.StartStyling(new_text_start)
-        text_ctrl.SetStyling(0, STYLE_DEFAULT)
         if source == "stderr" and not self.use_colors:
+            self._start_styling(text_ctrl, new_text_start)
             text_ctrl.SetStyling(new_text_end - new_text_start, STYLE_STDERR)
-
-        if self.use_colors and self._color_map:
-            style = None
-            previous_start = None
-            for item in self._color_map:
-                previous_style = style
-                if item[1] == 'RED':
-                    style = STYLE_FAIL
-                elif item[1] == 'GREEN':
-                    style = STYLE_PASS
-                elif item[1] == 'YELLOW':
-                    style = STYLE_SKIP
-                elif item[1] == 'BLUE':
-                    style = STYLE_LINK
-                elif item[1] is None:
-                    style = STYLE_DEFAULT
-                if style:
-                    if wx.VERSION < (4, 1, 0):
-                        text_ctrl.StartStyling(pos + item[0], 0x1f)
-                    else:
-                        text_ctrl.StartStyling(pos + item[0])
-                    previous_start = item[0]
-                if previous_style and style == STYLE_DEFAULT:
-                    text_ctrl.SetStyling(item[0] - previous_start, previous_style)
-            if previous_start and style:
-                text_ctrl.SetStyling(item[0] - previous_start, STYLE_DEFAULT)
+        if self.use_colors and colors:
+            ends = [index for index, _ in colors[1:]] + [new_text_end - new_text_start]
+            for (start, color), end in zip(colors, ends):
+                self._start_styling(text_ctrl, new_text_start + start)
+                text_ctrl.SetStyling(end - start, COLOR_STYLES.get(color, STYLE_DEFAULT))
 
         text_ctrl.SetReadOnly(True)
+        self._limit_text(text_ctrl)
         if last_visible_line >= line_count - 4:
             line_count = text_ctrl.GetLineCount()
             text_ctrl.ScrollToLine(line_count)
 
-    def parse_colors(self, txt):
-        # print(f"DEBUG: enter parse_colors {txt}")
-        idx = 0
-        t_size = len(txt)
-        while idx < t_size:
-            # print(f"{str(txt[idx])}")
-            if txt[idx] == 27:  # .startswith('\033[32m'):
-                color = False
-                if txt[idx + 1:idx+5] == b']8;;' and txt[idx+6] != 27:  # New file:// URI in RF 7.1, Start
-                    color = True
-                    self.store_color(idx, 'BLUE')
-                if txt[idx + 1:idx+5] == b'[34m':
-                    color = True
-                    self.store_color(idx, 'BLUE')
-                    # print(f"DEBUG: parse_colors got BLUE")
-                if txt[idx + 1:idx+5] == b'[33m':
-                    color = True
-                    self.store_color(idx, 'YELLOW')
-                    # print(f"DEBUG: parse_colors got YELLOW")
-                if txt[idx+1:idx+5] == b'[32m':
-                    color = True
-                    self.store_color(idx, 'GREEN')
-                    # print(f"DEBUG: parse_colors got GREEN")
-                if txt[idx+1:idx+5] == b'[31m':
-                    color = True
-                    self.store_color(idx, 'RED')
-                    # print(f"DEBUG: parse_colors got RED")
-                if txt[idx+1:idx+4] == b'[0m':
-                    # print(f"DEBUG: parse_colors reset to NORMAL")
-                    self.store_color(idx, None)
-                    txt = txt[:idx] + txt[idx+4:]
-                elif txt[idx + 1] == 92:
-                    self.store_color(idx, None)
-                    txt = txt[:idx] + txt[idx+2:]
-                elif txt[idx + 1:idx + 7] == b']8;;\x1b\\':  # New file:// URI in RF 7.1, End
-                    self.store_color(idx, None)
-                    txt = txt[:idx] + txt[idx + 7:]
-                elif color:
-                    txt = txt[:idx] + txt[idx+5:]
-                if idx >= len(txt):
-                    break
-            t_size = len(txt)
-            if idx < t_size:
-                idx += 1
-        return txt
-
-    def store_color(self, idx, color):
-        self._color_map.append((idx, color))
+    @staticmethod
+    def _start_styling(text_ctrl, position):
+        if wx.VERSION < (4, 1, 0):
+            text_ctrl.StartStyling(position, 0x1f)
+        else:
+            text_ctrl.StartStyling(position)
+
+    def _limit_text(self, text_ctrl):
+        """Keeps at most the configured number of lines and bytes in the control
+
+        When the console output of a run is first trimmed and it is not saved
+        to a console log, the whole output is saved to a new one in the logs
+        directory, replacing the one of an earlier run, and later output of
+        the run is appended to it.
+        """
+        max_lines = self.__getattr__('console max lines')
+        max_bytes = self.__getattr__('console max bytes')
+        if not text_ctrl.exceeds(max_lines, max_bytes):
+            return
+        if text_ctrl is self._console_log_ctrl and not self._console_log:
+            self._console_log = os.path.join(self._logs_directory, 'Console.txt')
+            FileWriter.write(self._console_log, [text_ctrl.GetText()], "wb", "w")
+            self.statusbar_message(_('Older console output was removed, full output is in %s')
+                                   % self._console_log, 5000)
+        text_ctrl.trim(max_lines, max_bytes)
 
     def _get_console_width(self):
         # robot wants to know a fixed size for output, so calculate the
@@ -1074,6 +1023,9 @@ class TestRunnerPlugin(Plugin):
         if event == 'start_keyword':
             self._handle_start_keyword(args)
             return
+        if event == 'current_keyword':
+            self._progress_bar.replace_current_keyword(args[0])
+            return
         if event == 'end_keyword':
             self._handle_end_keyword()
             return
@@ -1237,6 +1189,9 @@ class ProgressBar(wx.Panel):
     def set_current_keyword(self, name):
         self._current_keywords.append(name)
 
+    def replace_current_keyword(self, name):
+        self._current_keywords = [name] if name else []
+
     def empty_current_keyword(self):
         if self._current_keywords:
             self._current_keywords.pop()
@@ -1346,6 +1301,26 @@ class OutputStyledTextCtrl(wx.stc.StyledTextCtrl):
         self.stylizer = OutputStylizer(self, app_settings)
         self._max_row_len = 0
 
+    def exceeds(self, max_lines, max_bytes):
+        return self.GetLineCount() > max_lines or self.GetLength() > max_bytes
+
+    def trim(self, max_lines, max_bytes, keep=0.9):
+        """Removes whole lines from the start so that only ``keep`` of the limits is used
+
+        Leaving room below the limits keeps the control from being trimmed
+        again on every following append.
+        """
+        line = self.GetLineCount() - int(max_lines * keep)
+        excess = self.GetLength() - int(max_bytes * keep)
+        if excess > 0:
+            line = max(line, self.LineFromPosition(excess) + 1)
+        line = min(line, self.GetLineCount() - 1)
+        if line <= 0:
+            return
+        self.SetReadOnly(False)
+        self.DeleteRange(0, self.PositionFromLine(line))
+        self.SetReadOnly(True)
+
     def update_scroll_width(self, string):
         if isinstance(string, bytes):
             linesep = b'\n'
@@ -702,11 +702,18 @@ class FindOccurrences(_Command):
         # print(f"DEBUG: ctlcommands.py FindOccurrences INIT normalized_name_res={self.normalized_name_res}"
         #       f"\nSOURCE={self._keyword_source} PREFIX={self.prefix}")
         self._keyword_regexp = self._create_regexp(keyword_name)
+        self._usage_names = None if self._is_embedded(keyword_name) else \
+            [name for name in (keyword_name, keyword_name.split('.')[-1], self.normalized_name,
+                               self.normalized_name_res) if name]
+
+    @staticmethod
+    def _is_embedded(keyword_name):
+        return variablematcher.contains_scalar_variable(keyword_name) and \
+            not variablematcher.is_variable(keyword_name)
 
     @staticmethod
     def _create_regexp(keyword_name):
-        if variablematcher.contains_scalar_variable(keyword_name) and \
-                not variablematcher.is_variable(keyword_name):
+        if FindOccurrences._is_embedded(keyword_name):
             kw = lambda: 0
             kw.arguments = None
             kw.name = keyword_name
@@ -735,10 +742,20 @@ class FindOccurrences(_Command):
         for df in context.datafiles:
             # print(f"DEBUG: ctrlcommands FindOccurrences _items_from FILENAME: df={df.source}")
             self._yield_for_other_threads()
+            items = self._indexed_items_from_datafile(df)
+            if items == []:
+                continue
             if self._items_from_datafile_should_be_checked(df):
-                for item in self._items_from_datafile(df):
+                for item in items if items is not None else self._items_from_datafile(df):
                     yield item
 
+    def _indexed_items_from_datafile(self, df):
+        # Embedded arguments keywords are matched with a regexp, so all items must be checked
+        index = getattr(df, 'keyword_usages', None)
+        if self._usage_names is None or index is None:
+            return None
+        return index.items_using(self._usage_names, self._keyword_source)
+
     def _items_from_datafile_should_be_checked(self, datafile):
         if datafile.filename and \
                 os.path.basename(datafile.filename) == self._keyword_source:
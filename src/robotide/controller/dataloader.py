@@ -13,12 +13,19 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from threading import Thread
 
 from robotide.lib.compat.parsing import language as lang
 from robotide.lib.robot.errors import DataError
+from robotide.lib.robot.parsing import populators
 from .. import robotapi
+from .modelcache import ParsedModelCache
+
+# Smaller projects are parsed faster than the worker processes start
+PARALLEL_PARSING_MIN_FILES = 200
 
 
 class DataLoader(object):
@@ -102,7 +109,18 @@ class _DataLoader(_DataLoaderThread):
                 self.language = lang.check_file_language(self._path)
             except Exception:
                 self.language = 'en'
-        return test_data(source=self._path, settings=self._settings, language=self.language)
+        processes = self._settings.get('suite parsing processes', 0) if self._settings else 0
+        # One processor is left for building the model from the parsed files
+        processes = max(0, min(processes, (os.cpu_count() or 1) - 1))
+        model_cache = ParsedModelCache.open(self._settings)
+        try:
+            with ParallelParser(processes, model_cache) as parser:
+                parsed_files = parser.parse_directory(self._path, self._settings, self.language)
+                return test_data(source=self._path, settings=self._settings, language=self.language,
+                                 parsed_files=parsed_files)
+        finally:
+            if model_cache:
+                model_cache.close()
 
 
 class _InitFileLoader(_DataLoaderThread):
@@ -140,23 +158,27 @@ class _ResourceLoader(_DataLoaderThread):
 
 class TestDataDirectoryWithExcludes(robotapi.TestDataDirectory):
 
-    def __init__(self, parent, source, settings, language=None):
+    def __init__(self, parent, source, settings, language=None, parsed_files=None):
         self._settings = settings
         self.language = language
+        self._parsed_files = parsed_files
         robotapi.TestDataDirectory.__init__(self, parent, source, settings=self._settings, language=self.language)
 
     def add_child(self, path, include_suites, extensions=None,
                   warn_on_skipped=False, language=None):
         if not self._settings.excludes.contains(path):
-            self.children.append(test_data(parent=self, source=path, settings=self._settings, language=self.language))
+            self.children.append(test_data(parent=self, source=path, settings=self._settings, language=self.language,
+                                           parsed_files=self._parsed_files))
         else:
             self.children.append(ExcludedDirectory(self, path, language=self.language))
 
 
-def test_data(source, parent=None, settings=None, language=None):
+def test_data(source, parent=None, settings=None, language=None, parsed_files=None):
     """Parses a file or directory to a corresponding model object.
 
     :param source: path where test data is read from.
+    :param parsed_files: :class:`ParsedFiles` used instead of parsing
+        the files again.
     :returns: :class:`~.model.TestDataDirectory`  if `source` is a directory,
         :class:`~.model.TestCaseFile` otherwise.
     """
@@ -170,16 +192,24 @@ def test_data(source, parent=None, settings=None, language=None):
                 language = lang.check_file_language(init_file)
                 # print(f"DEBUG: Dataloader TestCaseFile init file {init_file=}\n"
                 #       f" language={language} {source=}")
-        data = TestDataDirectoryWithExcludes(parent, source, settings, language)
+        data = TestDataDirectoryWithExcludes(parent, source, settings, language, parsed_files)
         # print("DEBUG: Dataloader testdata %s\n" % data.name)
         data.populate()
         # print("DEBUG: Dataloader after populate %s  %s\n" % (data._tables, data.name))
         return data
-    language = language if language else lang.check_file_language(source)
+    if parsed_files is not None:
+        datafile = parsed_files.take(source, parent, settings, language)
+        if datafile is not NOT_PARSED:
+            return datafile
+    return _parse_datafile(source, parent, settings, language)
+
+
+def _parse_datafile(source, parent, settings, language, content=None):
+    language = language if language else lang.check_file_language(source, content)
     # print(f"DEBUG: Dataloader TestCaseFile getting datafile language={language}")
     datafile = None
     try:
-        datafile = robotapi.TestCaseFile(parent, source, settings, language).populate()
+        datafile = robotapi.TestCaseFile(parent, source, settings, language).populate(content)
     except DataError:
         # print(f"DEBUG: Dataloader TestCaseFile testdata DataError source={source}")
         pass  # We try once more in case is a Resource
@@ -187,7 +217,7 @@ def test_data(source, parent=None, settings=None, language=None):
         # print(f"DEBUG: Dataloader TestCaseFile return datafile={datafile}")
         return datafile
     if source.endswith(("resource", "robot")):
-        datafile = robotapi.ResourceFile(source, settings, language).populate()
+        datafile = robotapi.ResourceFile(source, settings, language).populate(content)
     # print(f"DEBUG: Dataloader returning TestCaseFile datafile={datafile}, type={type(datafile)}")
     return datafile
 
@@ -201,3 +231,195 @@ class ExcludedDirectory(robotapi.TestDataDirectory):
 
     def has_tests(self):
         return True
+
+
+NOT_PARSED = object()
+
+
+class ParallelParser(object):
+    """Parses the files of a directory project concurrently in worker processes.
+
+    The directory tree is walked once and every file that is not found
+    from the ``model_cache`` is read and parsed by a worker. :func:`test_data`
+    then builds the directory model in the usual order, taking the parsed
+    files from :class:`ParsedFiles` instead of parsing them itself.
+    """
+
+    def __init__(self, processes, model_cache=None, min_files=PARALLEL_PARSING_MIN_FILES):
+        self._processes = processes
+        self._model_cache = model_cache
+        self._min_files = min_files
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def parse_directory(self, source, settings, language=None):
+        """Starts parsing the files under ``source`` and returns :class:`ParsedFiles`.
+
+        Returns None if there is neither a model cache nor enough files to
+        benefit from parsing them in parallel.
+        """
+        tab_size = settings.get('txt number of spaces', 2) if settings else 2
+        if os.path.basename(source) == '__init__.robot':
+            source = os.path.dirname(source)
+        files = []
+        if self._processes and os.path.isdir(source):
+            self._collect_files(source, settings, language, files)
+        if self._model_cache:
+            files = [(path, language) for path, language in files
+                     if not self._model_cache.is_fresh(path, language, tab_size)]
+        if len(files) < self._min_files:
+            files = []
+        if not files and not self._model_cache:
+            return None
+        if files:
+            self._executor = ProcessPoolExecutor(max_workers=self._processes,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_initialize_parsing_process)
+        return ParsedFiles(((path, language, self._executor.submit(_parse_in_process, path, language, tab_size))
+                            for path, language in files), tab_size, self._model_cache)
+
+    def _collect_files(self, directory, settings, language, files):
+        # Mirrors how test_data and TestDataDirectoryWithExcludes walk the tree
+        if not language:
+            init_file = os.path.join(directory, '__init__.robot')
+            if os.path.isfile(init_file):
+                language = lang.check_file_language(init_file)
+        _, children = populators.FromDirectoryPopulator()._get_children(directory, None, None)
+        for path in children:
+            if settings.excludes.contains(path):
+                continue
+            if os.path.isdir(path):
+                self._collect_files(path, settings, language, files)
+            else:
+                files.append((path, language))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class ParsedFiles(object):
+    """Data files parsed by the worker processes of :class:`ParallelParser` or stored in a model cache.
+
+    Files are parsed without a parent. A parse result is a tuple of the
+    parsed model, the error that prevented parsing, the tasks flag set to
+    the parent and the warnings and errors logged during parsing.
+    """
+
+    def __init__(self, parsed, tab_size=2, model_cache=None):
+        self._parsed = {path: (language, future) for path, language, future in parsed}
+        self._tab_size = tab_size
+        self._model_cache = model_cache
+
+    def __len__(self):
+        return len(self._parsed)
+
+    def take(self, source, parent, settings, language):
+        """Returns the parsed file attached to ``parent`` or `NOT_PARSED`.
+
+        Errors and warnings reported while parsing are logged now, as if the
+        file had been parsed here. Errors that prevented parsing the file are
+        raised. Files not parsed by the workers are taken from the model
+        cache, or parsed and stored to it.
+        """
+        if source in self._parsed:
+            expected_language, future = self._parsed.pop(source)
+            if language == expected_language:
+                try:
+                    result, state = future.result()
+                except Exception:
+                    pass
+                else:
+                    self._store(source, language, state, result)
+                    return self._attach(result, parent, settings)
+            else:
+                future.cancel()
+        if self._model_cache is None:
+            return NOT_PARSED
+        result = self._model_cache.get(source, language, self._tab_size)
+        if result is not None:
+            return self._attach(result, parent, settings)
+        try:
+            content, state = _read(source)
+        except OSError:
+            return NOT_PARSED
+        result = _parse_detached(source, language, self._tab_size, content)
+        self._store(source, language, state, result)
+        # Messages were already logged while parsing
+        return self._attach(result, parent, settings, log_messages=False)
+
+    def _store(self, source, language, state, result):
+        if self._model_cache is not None:
+            self._model_cache.put(source, language, self._tab_size, state, result)
+
+    @staticmethod
+    def _attach(result, parent, settings, log_messages=True):
+        datafile, error, tasks, messages = result
+        if log_messages:
+            for message, level in messages:
+                robotapi.ROBOT_LOGGER.write(message, level)
+        if tasks is not None and hasattr(parent, 'tasks'):
+            parent.tasks = tasks
+        if error:
+            raise error
+        if isinstance(datafile, robotapi.TestCaseFile):
+            datafile.parent = parent
+            datafile._settings = settings
+        elif isinstance(datafile, robotapi.ResourceFile):
+            datafile.settings = settings
+        if datafile is not None and datafile.language:
+            populators.store_language(datafile.language)
+        return datafile
+
+
+class _DetachedParent(object):
+    # Records the tasks flag that parsing a file sets to its parent directory
+    tasks = None
+
+
+class _MessageCollector(object):
+
+    def __init__(self):
+        self.messages = []
+
+    def message(self, msg):
+        if msg.level in ('WARN', 'ERROR'):
+            self.messages.append((msg.message, msg.level))
+
+
+def _read(source):
+    with open(source, 'rb') as data:
+        stat = os.fstat(data.fileno())
+        return data.read(), (stat.st_mtime_ns, stat.st_size)
+
+
+def _parse_detached(source, language, tab_size, content):
+    collector = _MessageCollector()
+    robotapi.ROBOT_LOGGER.register_logger(collector)
+    # Registering relays all earlier cached messages to the new logger
+    collector.messages = []
+    parent = _DetachedParent()
+    try:
+        datafile = _parse_datafile(source, parent, {'txt number of spaces': tab_size}, language, content)
+        error = None
+    except DataError as err:
+        datafile = None
+        error = err
+    finally:
+        robotapi.ROBOT_LOGGER.unregister_logger(collector)
+    return datafile, error, parent.tasks, collector.messages
+
+
+def _initialize_parsing_process():
+    populators.STORE_LANGUAGE = False
+
+
+def _parse_in_process(source, language, tab_size):
+    content, state = _read(source)
+    return _parse_detached(source, language, tab_size, content), state
@@ -24,6 +24,7 @@ from ..publish import (RideDataFileRemoved, RideInitFileRemoved, RideDataChanged
                        RideSuiteAdded, RideItemSettingsChanged)
 from ..publish.messages import RideDataFileSet, RideOpenResource
 from ..robotapi import TestDataDirectory, TestCaseFile, ResourceFile
+from ..lib.robot.errors import DataError
 from .. import utils
 
 from .basecontroller import WithUndoRedoStacks, _BaseController, WithNamespace, ControllerWithParent
@@ -33,6 +34,7 @@ from .settingcontrollers import (DocumentationController, FixtureController, Tim
 from .tablecontrollers import (VariableTableController, TestCaseTableController, KeywordTableController,
                                ImportSettingsController, MetadataListController)
 from .macrocontrollers import TestCaseController, UserKeywordController
+from .keywordusages import KeywordUsageIndex
 
 
 def _get_controller(project, data, parent, tasks=False):
@@ -186,6 +188,8 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
         self._testcase_table_controller = None
         self._keywords_table_controller = None
         self._imports = None
+        self._keyword_usages = None
+        self._tests_by_name = None
         RideDataFileSet(item=self).publish()
 
     def _children(self, data):
@@ -233,6 +237,24 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
             self._testcase_table_controller = TestCaseTableController(self, self.data.testcase_table)
         return self._testcase_table_controller
 
+    @property
+    def keyword_usages(self):
+        if self._keyword_usages is None:
+            self._keyword_usages = KeywordUsageIndex(self)
+        return self._keyword_usages
+
+    def find_test(self, name):
+        """Returns the first test named exactly ``name`` or ``None``.
+
+        Tests are found from a name index that is dropped whenever the
+        datafile is marked dirty or replaced.
+        """
+        if self._tests_by_name is None:
+            self._tests_by_name = {}
+            for test in self.tests:
+                self._tests_by_name.setdefault(test.name, test)
+        return self._tests_by_name.get(name)
+
     @property
     def datafile(self):
         return self.data
@@ -246,6 +268,10 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
     def datafile_controller(self):
         return self
 
+    @property
+    def project(self):
+        return self._project
+
     @property
     def keywords(self):
         if self._keywords_table_controller is None:
@@ -278,7 +304,14 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
         # print(f"DEBUG: filecontrollers.py _DataController keyword_info call keyword_info keyword_name={keyword_name}")
         return WithNamespace.keyword_info(self, self.data, keyword_name)
 
+    def update_namespace(self):
+        if not self.namespace:
+            return
+        self.namespace.update(datafile=self.data)
+
     def mark_dirty(self):
+        self._keyword_usages = None
+        self._tests_by_name = None
         if not self.dirty:
             self.dirty = True
             RideDataChangedToDirty(datafile=self).publish()
@@ -521,11 +554,11 @@ class TestDataDirectoryController(_DataController, _FileSystemElement, _BaseCont
         if not children:
             return
         for filename in self._get_unknown_files_in_directory(children, path, initfile):
-            if not self._is_robot_ignored_name(filename):
+            if not self.is_robot_ignored_name(filename):
                 self._add_directory_child(children, filename)
 
     @staticmethod
-    def _is_robot_ignored_name(filename):
+    def is_robot_ignored_name(filename):
         base = os.path.basename(filename)
         robotformat = (".txt", ".robot", ".resource", ".rst", " .rest", ".tsv")  # Removed ".htm", ".html"
         nonrobot_file = os.path.isfile(filename) and not base.endswith(robotformat)
@@ -589,6 +622,22 @@ class TestDataDirectoryController(_DataController, _FileSystemElement, _BaseCont
         self.children.append(data_controller(datafile, self._project, self, tasks=self.tasks))
         return self.children[-1]
 
+    def add_datafile_from_disk(self, path):
+        """Adds a suite or resource file created on disk to this directory."""
+        try:
+            datafile = TestCaseFile(parent=self.data, source=path, tasks=self.tasks,
+                                    language=self._language).populate()
+        except DataError:
+            self.namespace.resource_changed(path)
+            resource = self.namespace.get_resource(path, report_status=False)
+            if self._is_valid_resource(resource):
+                controller = self._resource_controller(resource)
+                if controller not in self.children:
+                    self.add_child(controller)
+                controller.notify_opened()
+            return
+        self.notify_suite_added(self._new_data_controller(datafile))
+
     def notify_suite_added(self, suite):
         RideSuiteAdded(parent=self, suite=suite).publish()
 
@@ -788,10 +837,7 @@ class TestCaseFileController(_FileSystemElement, _DataController):
             return None
         if len(names) == 1:
             return self
-        for test in self.tests:
-            if test.name == node_testname:
-                return test
-        return None
+        return self.find_test(node_testname)
 
     @property
     def default_tags(self):
@@ -815,10 +861,14 @@ class TestCaseFileController(_FileSystemElement, _DataController):
         RideDataFileRemoved(path=self.filename, datafile=self).publish()
 
     def reload(self):
+        old_data = self.data
         self.__init__(TestCaseFile(parent=self.data.parent, source=self.filename, tasks=self.tasks,
                                    language=self._language).populate(),
                       project=self._project,
                       parent=self.parent)
+        siblings = getattr(self.data.parent, 'children', [])
+        if old_data in siblings:
+            siblings[siblings.index(old_data)] = self.data
 
     def get_template(self):
         return self.data.setting_table.test_template
@@ -979,7 +1029,12 @@ class ResourceFileController(_FileSystemElement, _DataController):
         return None
 
     def reload(self):
-        self.__init__(ResourceFile(source=self.filename).populate(), self._project,
+        data = None
+        if self.namespace:
+            # Share the reloaded model with the namespace like when loading
+            self.namespace.resource_changed(self.filename)
+            data = self.namespace.get_resource(self.filename, report_status=False)
+        self.__init__(data or ResourceFile(source=self.filename).populate(), self._project,
                       parent=self.parent)
 
     def remove(self):
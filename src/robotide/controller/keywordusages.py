@@ -0,0 +1,168 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from collections import Counter
+from itertools import chain
+
+from .. import utils
+from ..lib.compat.parsing.language import Language
+
+BDD_ENGLISH = ('given', 'when', 'then', 'and', 'but')
+
+
+class KeywordUsageIndex(object):
+    """Settings, steps and keyword names of a datafile by the names in their cells.
+
+    The index finds every item having a cell that could refer to a keyword,
+    also when the cell has a BDD prefix like ``Given``, in English or in the
+    language of the datafile, or a resource or library prefix. It may thus
+    find more items than actually use the keyword, and the found items must
+    still be checked with ``contains_keyword``.
+
+    ``usage_counts`` tells how many settings and steps have a cell with a
+    normalized name, also counting the name after a library or resource
+    prefix.
+
+    The datafile controller drops its index whenever the datafile is marked
+    dirty or replaced, and a new one is built on the next search.
+    """
+
+    def __init__(self, datafile_controller):
+        self._items = []
+        self._positions = {}
+        self._bdd_prefixes = _bdd_prefixes(getattr(datafile_controller, 'language', None))
+        self.usage_counts = Counter()
+        for setting in datafile_controller.settings:
+            self._add(setting)
+        for test in datafile_controller.tests:
+            for item in chain(test.settings, test.steps):
+                self._add(item)
+        for kw in datafile_controller.keywords:
+            self._add(kw.keyword_name, [kw.name], keyword=kw)
+            for item in chain(kw.steps, [kw.setup] if kw.setup else [], [kw.teardown] if kw.teardown else []):
+                self._add(item)
+
+    def _add(self, item, cells=None, keyword=None):
+        position = len(self._items)
+        self._items.append((item, keyword))
+        cells = item.as_list() if cells is None else cells
+        keys = set(chain.from_iterable(_keys(cell, self._bdd_prefixes)
+                                       for cell in cells if cell and isinstance(cell, str)))
+        for key in keys:
+            self._positions.setdefault(key, []).append(position)
+        if keyword is None:
+            self.usage_counts.update(set(chain.from_iterable(_names(cell) for cell in cells
+                                                             if cell and isinstance(cell, str))))
+
+    def items_using(self, names, keyword_source):
+        """Returns the items that may use any of the given keyword names.
+
+        Items are returned in the order they are in the datafile. The name of
+        a user keyword is returned only if the keyword is from
+        ``keyword_source``. The items are candidates, for example a cell with
+        a prefix before the library or resource prefix is found by the name
+        after the dot, and the caller must check them with
+        ``contains_keyword``.
+        """
+        positions = set()
+        for name in names:
+            positions.update(self._positions.get(_normalize(name), ()))
+        result = []
+        for position in sorted(positions):
+            item, keyword = self._items[position]
+            if keyword is None or keyword.source == keyword_source:
+                result.append(item)
+        return result
+
+    def calls(self):
+        """Returns the settings and steps in the order they are in the datafile."""
+        return [item for item, keyword in self._items if keyword is None]
+
+
+class KeywordCalls(object):
+    """Calls of the user keywords of a project, counted in one pass.
+
+    Every cell of the settings and steps that may refer to a keyword is
+    resolved through the namespace of its datafile once, and the call is
+    counted for the keyword it resolves to, also when the call has a BDD
+    prefix or a resource prefix. ``count`` tells how many settings and
+    steps call a keyword.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def add_datafile(self, datafile_controller):
+        index = getattr(datafile_controller, 'keyword_usages', None)
+        if index is None:
+            return
+        resolved = {}
+        for item in index.calls():
+            keys = set()
+            for cell in item.as_list():
+                if not (cell and isinstance(cell, str)):
+                    continue
+                if cell not in resolved:
+                    resolved[cell] = self._resolve(datafile_controller, cell)
+                key = resolved[cell]
+                if key and key not in keys and item.contains_keyword(cell):
+                    keys.add(key)
+            self.counts.update(keys)
+
+    @staticmethod
+    def _resolve(datafile_controller, name):
+        info = datafile_controller.keyword_info(None, name)
+        source = getattr(info, 'source', None)
+        return (source, _normalize(info.name)) if source and info.name else None
+
+    def count(self, keyword):
+        return self.counts[(keyword.source, _normalize(keyword.name))]
+
+    def is_used(self, keyword):
+        return self.count(keyword) > 0
+
+
+def _normalize(name):
+    return utils.normalize(name, ignore=('_',))
+
+
+def _names(cell):
+    name = _normalize(cell)
+    yield name
+    if '.' in name:
+        yield name.rsplit('.', 1)[1]
+
+
+def _bdd_prefixes(language):
+    prefixes = set(BDD_ENGLISH)
+    language = language[0] if isinstance(language, list) and language else language
+    if language:
+        try:
+            prefixes.update(prefix.lower() for prefix in Language.from_name(language.replace('_', '-')).bdd_prefixes)
+        except ValueError:
+            pass
+    return tuple(prefix + ' ' for prefix in prefixes)
+
+
+def _keys(cell, bdd_prefixes):
+    # The whole cell, the cell without a BDD prefix and the names after a library or resource prefix
+    names = [cell]
+    lower = cell.lower()
+    names.extend(cell[len(prefix):] for prefix in bdd_prefixes if lower.startswith(prefix))
+    for name in names:
+        key = _normalize(name)
+        yield key
+        if '.' in key:
+            yield key.rsplit('.', 1)[1]
@@ -0,0 +1,127 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import pickle
+import sqlite3
+import sys
+import time
+
+from ..context import SETTINGS_DIRECTORY
+from ..version import VERSION
+
+MODEL_CACHE_FILE = os.path.join(SETTINGS_DIRECTORY, 'parsedmodels.db')
+
+CREATION_SCRIPT = """\
+CREATE TABLE IF NOT EXISTS models (path TEXT PRIMARY KEY,
+                                   mtime INTEGER,
+                                   size INTEGER,
+                                   language TEXT,
+                                   tab_size INTEGER,
+                                   format TEXT,
+                                   used REAL,
+                                   model BLOB);
+"""
+
+# Models pickled by another RIDE or Python version are parsed again
+_FORMAT = '%s/%d.%d' % (VERSION, sys.version_info[0], sys.version_info[1])
+# Models of files not opened for this long are removed
+_MAX_AGE = 30 * 24 * 60 * 60
+
+
+class ParsedModelCache(object):
+    """Parsed data files stored between RIDE sessions.
+
+    A stored model is used only when the file still has the same
+    modification time and size, and is parsed with the same language and
+    tab size. The models are stored as the results of parsing a file
+    without a parent, see `robotide.controller.dataloader.ParsedFiles`.
+    """
+
+    def __init__(self, database=None):
+        self._connection = sqlite3.connect(database or MODEL_CACHE_FILE, timeout=5.0)
+        self._connection.executescript(CREATION_SCRIPT)
+        self._used = []
+
+    @classmethod
+    def open(cls, settings):
+        """Returns the cache, or None if it is disabled or cannot be used."""
+        if not settings or not settings.get('parsed model cache', False):
+            return None
+        try:
+            if not os.path.exists(SETTINGS_DIRECTORY):
+                os.makedirs(SETTINGS_DIRECTORY)
+            return cls()
+        except (OSError, sqlite3.Error) as err:
+            print('Cannot use parsed model cache "%s": %s' % (MODEL_CACHE_FILE, err))
+            return None
+
+    def get(self, source, language, tab_size):
+        """Returns the stored parse result of ``source`` or None if it is stale."""
+        row = self._fresh_row(source, language, tab_size, 'model')
+        if row is None:
+            return None
+        try:
+            result = pickle.loads(row[0])
+        except Exception:
+            return None
+        self._used.append(source)
+        return result
+
+    def is_fresh(self, source, language, tab_size):
+        """Tells whether a result of ``source`` is stored, without reading it."""
+        return self._fresh_row(source, language, tab_size) is not None
+
+    def _fresh_row(self, source, language, tab_size, columns=None):
+        # Returns the requested columns, if any, of a stored result that is not stale
+        try:
+            stat = os.stat(source)
+            row = self._connection.execute('select mtime, size, language, tab_size, format%s from models'
+                                           ' where path = ?' % (', ' + columns if columns else ''),
+                                           (source,)).fetchone()
+        except (OSError, sqlite3.Error):
+            return None
+        if row is None or row[:5] != (stat.st_mtime_ns, stat.st_size, str(language), tab_size, _FORMAT):
+            return None
+        return row[5:]
+
+    def put(self, source, language, tab_size, state, result):
+        """Stores the parse result of ``source``.
+
+        ``state`` is the ``(mtime_ns, size)`` of the file when it was read.
+        """
+        try:
+            blob = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        mtime, size = state
+        try:
+            self._connection.execute('insert or replace into models values (?, ?, ?, ?, ?, ?, ?, ?)',
+                                     (source, mtime, size, str(language), tab_size, _FORMAT, time.time(),
+                                      blob))
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        try:
+            now = time.time()
+            self._connection.executemany('update models set used = ? where path = ?',
+                                         [(now, path) for path in self._used])
+            self._connection.execute('delete from models where used < ?', (now - _MAX_AGE,))
+            self._connection.commit()
+        except sqlite3.Error:
+            pass
+        finally:
+            self._connection.close()
@@ -16,11 +16,14 @@
 import os
 import shutil
 import tempfile
+from collections import Counter
+from functools import partial
 
 from .basecontroller import WithNamespace, _BaseController
 from .dataloader import DataLoader
 from .robotdata import new_test_case_file, new_test_data_directory
 from ..context import LOG
+from ..lib.robot.errors import DataError
 from ..controller.ctrlcommands import NullObserver, SaveFile
 from ..publish.messages import RideOpenSuite, RideNewProject, RideFileNameChanged
 from .. import spec
@@ -45,11 +48,13 @@ class Project(_BaseController, WithNamespace):
         self.file_language = file_language
         self._resource_file_controller_factory = ResourceFileControllerFactory(self._name_space, self)
         self._serializer = Serializer(settings, LOG)
+        self._keyword_usage_counts = None
 
     @staticmethod
     def _construct_library_manager(library_manager, settings):
         return library_manager or \
-            spec.LibraryManager(spec.DATABASE_FILE, SpecInitializer(settings.get('library xml directories', [])[:]))
+            spec.LibraryManager(spec.DATABASE_FILE, SpecInitializer(settings.get('library xml directories', [])[:]),
+                                processes=settings.get('library import processes', 0))
 
     def __del__(self):
         if self._library_manager:
@@ -98,6 +103,22 @@ class Project(_BaseController, WithNamespace):
     def resource_file_controller_factory(self):
         return self._resource_file_controller_factory
 
+    def keyword_usage_counts(self, compute=True):
+        """Returns the number of uses of normalized keyword names in all datafiles.
+
+        With ``compute=False`` the counts computed last are returned, or
+        ``None``, without building the usage indexes of the datafiles.
+        """
+        if not compute:
+            return self._keyword_usage_counts[1] if self._keyword_usage_counts else None
+        indexes = [df.keyword_usages for df in self.datafiles]
+        if self._keyword_usage_counts is None or self._keyword_usage_counts[0] != indexes:
+            counts = Counter()
+            for index in indexes:
+                counts.update(index.usage_counts)
+            self._keyword_usage_counts = (indexes, counts)
+        return self._keyword_usage_counts[1]
+
     def find_controller_by_longname(self, longname, testname=None):
         return self.controller.find_controller_by_longname(longname, testname)
 
@@ -326,6 +347,64 @@ class Project(_BaseController, WithNamespace):
         if resource:
             return self._create_resource_controller(resource)
 
+    def reload_changed_files(self, paths):
+        """Reloads only the given files that were changed, created or removed on disk.
+
+        Returns False when the changes cannot be applied file by file, for
+        example when directories or initialization files have changed, and
+        the whole project must be reloaded instead.
+        """
+        if not self.controller:
+            return False
+        changes = []
+        for path in sorted(set(os.path.abspath(path) for path in paths)):
+            change = self._file_change(path)
+            if change is False:
+                return False
+            if change:
+                changes.append(change)
+        try:
+            for change in changes:
+                change()
+        except DataError:
+            return False
+        return True
+
+    def _file_change(self, path):
+        from .filecontrollers import TestDataDirectoryController
+        if self.is_excluded(path):
+            return None
+        for controller in self.datafiles:
+            if controller.is_directory_suite():
+                if path in (controller.directory, controller.filename):
+                    return False
+            elif controller.filename == path:
+                if not os.path.isfile(path):
+                    return False if controller is self.controller else partial(self._remove_changed_file, controller)
+                return controller.reload if controller.has_been_modified_on_disk() else None
+        if os.path.isdir(path):
+            return False
+        if not os.path.isfile(path):
+            # Removed file that was not in the project, or a removed directory
+            return None if os.path.splitext(path)[1] else False
+        if TestDataDirectoryController.is_robot_ignored_name(path):
+            return None
+        for controller in self.datafiles:
+            if controller.is_directory_suite() and controller.directory == os.path.dirname(path):
+                return partial(controller.add_datafile_from_disk, path)
+        return False if self.controller.is_directory_suite() else None
+
+    def _remove_changed_file(self, controller):
+        from .filecontrollers import ResourceFileController
+        if isinstance(controller, ResourceFileController):
+            self.namespace.resource_changed(controller.filename)
+            if controller.parent:
+                controller.parent.remove_child(controller)
+        siblings = getattr(controller.data.parent, 'children', [])
+        if controller.data in siblings:
+            siblings.remove(controller.data)
+        controller.remove()
+
     def is_project_changed_from_disk(self):
         from .filecontrollers import TestDataDirectoryController
         for data_file in self.datafiles:
@@ -32,9 +32,28 @@ def obtain_bdd_prefixes(language):
     return bdd_prefixes
 
 
+class _StepAnalysis(object):
+    """Keyword lookups, cell positions and variable checks of a step.
+
+    The analysis is computed once for the cells of the step and the
+    generation of the namespace, which are its ``key``, and reused by all
+    the columns of the step.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.keyword_infos = {}
+        self.user_keywords = {}
+        self.library_keywords = {}
+        self.positions = {}
+        self.unknown_variables = {}
+        self.local_namespace = None
+
+
 class StepController(_BaseController):
 
     indent = None
+    _analysis = None
 
     def __init__(self, parent, step):
         self.continuing_kw = None
@@ -88,12 +107,22 @@ class StepController(_BaseController):
         if not kw:
             return None
         # print(f"DEBUG: stepcontrollers.py StepController get_keyword_info call parent kw={kw}")
-        kw_info = self.parent.get_keyword_info(kw)
-        if kw_info:  # and kw_info.type == CellType.KEYWORD:
-            private = kw_info.is_private_keyword
-            # print(f"DEBUG: stepcontrollers.py StepController get_keyword_info called parent get_keyword_info  kw_info={kw_info} "
-            #       f"kw={kw} is PRIVATE?=={private}")
-        return kw_info
+        keyword_infos = self._get_analysis().keyword_infos
+        if kw not in keyword_infos:
+            keyword_infos[kw] = self.parent.get_keyword_info(kw)
+        return keyword_infos[kw]
+
+    def _get_analysis(self):
+        key = (tuple(self.as_list()), self._namespace_generation())
+        if self._analysis is None or self._analysis.key != key:
+            self._analysis = _StepAnalysis(key)
+        return self._analysis
+
+    def _namespace_generation(self):
+        try:
+            return self.datafile_controller.namespace.generation
+        except AttributeError:
+            return None
 
     def __eq__(self, other):
         if self is other:
@@ -119,7 +148,7 @@ class StepController(_BaseController):
         return values[col]
 
     def get_cell_info(self, col):
-        position = self._get_cell_position(col)
+        position = self._get_analyzed_cell_position(col)
         content = self._get_content_with_type(col, position)
         # print(f"DEBUG: stepcontrollers.py StepController call get_cell_info col={col} content.type={content.type}")
         if content.type == ContentType.COMMENTED:
@@ -138,6 +167,14 @@ class StepController(_BaseController):
             return True
         return False
 
+    def _get_analyzed_cell_position(self, col):
+        if self.keyword == '...':  # The position depends on the previous steps
+            return self._get_cell_position(col)
+        positions = self._get_analysis().positions
+        if col not in positions:
+            positions[col] = self._get_cell_position(col)
+        return positions[col]
+
     def _build_cell_info(self, content, position):
         # print(f"DEBUG: stepcontrollers.py StepController _build_cell_info call CellInfo content={content} position={position}")
         return CellInfo(content, position)
@@ -266,15 +303,23 @@ class StepController(_BaseController):
     def _is_unknow_variable(self, value, position):
         if position.type == CellType.ASSIGN:
             return False
+        analysis = self._get_analysis()
+        if value not in analysis.unknown_variables:
+            analysis.unknown_variables[value] = self._find_unknown_variable(value, analysis)
+        return analysis.unknown_variables[value]
+
+    def _find_unknown_variable(self, value, analysis):
         try:
-            is_known = self._get_local_namespace().has_name(value)
+            if analysis.local_namespace is None:
+                analysis.local_namespace = self._get_local_namespace()
+            is_known = analysis.local_namespace.has_name(value)
         except AttributeError:
             return False
         if is_known:
             return False
         inner_value = value[2:-1]
         modified = re.split(r'\W', inner_value, 1)[0]
-        return not self._get_local_namespace().has_name('%s{%s}' % (value[0], modified))
+        return not analysis.local_namespace.has_name('%s{%s}' % (value[0], modified))
 
     def _get_local_namespace(self):
         index = self.parent.index_of_step(self.step_controller_step)
@@ -294,10 +339,16 @@ class StepController(_BaseController):
     def is_user_keyword(self, value):
         # print(f"DEBUG: stepcontrollers.py StepController is_user_keyword CALL parent.is_user_keyword"
         #       f" = {self.parent.source}")
-        return self.parent.is_user_keyword(value)
+        user_keywords = self._get_analysis().user_keywords
+        if value not in user_keywords:
+            user_keywords[value] = self.parent.is_user_keyword(value)
+        return user_keywords[value]
 
     def is_library_keyword(self, value):
-        return self.parent.is_library_keyword(value)
+        library_keywords = self._get_analysis().library_keywords
+        if value not in library_keywords:
+            library_keywords[value] = self.parent.is_library_keyword(value)
+        return library_keywords[value]
 
     def as_list(self):
         # print(f"\nDEBUG: Stepcontrollers enter as_list")
@@ -699,7 +750,7 @@ class ForLoopStepController(StepController):
         return CellPosition(CellType.MUST_BE_EMPTY, None)
 
     def get_cell_info(self, col):
-        position = self._get_cell_position(col)
+        position = self._get_analyzed_cell_position(col)
         content = self._get_content_with_type(col, position)
         return self._build_cell_info(content, position)
 
@@ -37,6 +37,7 @@ class TreeController(object):
         self.settings = settings
         self._history = history or _History()
         self._test_selection = test_selection
+        self._nodes = {}
 
     def register_tree_actions(self):
         tree_actions = _("""[Navigate]
@@ -100,11 +101,29 @@ class TreeController(object):
         if not text.startswith('*'):
             self._tree.SetItemText(node, '*' + text)
 
+    def register_node(self, node, controller):
+        """Remembers the node of the controller for ``find_node_by_controller``."""
+        self._nodes[id(controller)] = node
+
+    def unregister_node(self, node):
+        handler = self._tree.GetItemData(node)
+        if handler and self._nodes.get(id(handler.controller)) is node:
+            del self._nodes[id(handler.controller)]
+
+    def clear_nodes(self):
+        self._nodes.clear()
+
     def find_node_by_controller(self, controller):
         def match_handler(n):
             handler = self.get_handler(n)
             return handler and controller is handler.controller
-        return self._find_node_with_predicate(self._tree.root, match_handler)
+        node = self._nodes.get(id(controller))
+        if node is not None and match_handler(node):
+            return node
+        node = self._find_node_with_predicate(self._tree.root, match_handler)
+        if node:
+            self.register_node(node, controller)
+        return node
 
     def find_node_with_label(self, node, label):
         # print(f"DEBUG: treecontroller.py TreeController find_node_with_label node={node} LABEL={label}")
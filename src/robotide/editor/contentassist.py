@@ -38,6 +38,7 @@ def obtain_bdd_prefixes(language):
 
 _PREFERRED_POPUP_SIZE = (200, 400)
 _AUTO_SUGGESTION_CFG_KEY = "enable auto suggestions"
+_RANKED_SUGGESTION_CFG_KEY = "ranked suggestions"
 
 
 class _ContentAssistTextCtrlBase(wx.TextCtrl):
@@ -87,6 +88,8 @@ class _ContentAssistTextCtrlBase(wx.TextCtrl):
         section, setting = message.keys
         if section == 'Grid' and _AUTO_SUGGESTION_CFG_KEY in setting:
             self._is_auto_suggestion_enabled = message.new
+        if section == 'Grid' and _RANKED_SUGGESTION_CFG_KEY in setting:
+            self._popup.set_ranked(message.new)
 
     def set_row(self, row):
         self._row = row
@@ -293,7 +296,11 @@ class _ContentAssistTextCtrlBase(wx.TextCtrl):
             popup_value = self._popup.get_value()
         else:
             popup_value = in_value
-        if popup_value:
+        query = self._popup.ranked_query()
+        if popup_value and query is not None and initial_value.endswith(query):
+            # Fuzzy matched suggestions replace the whole text they were searched with
+            initial_value = initial_value[:len(initial_value) - len(query)]
+        elif popup_value:
             if popup_value.lower() in initial_value.lower():
                 initial_value = initial_value.replace(initial_value, '')
             parts = initial_value.split()
@@ -319,6 +326,7 @@ class _ContentAssistTextCtrlBase(wx.TextCtrl):
 
     # DEBUG THIS IS BEING CALLED FROM kweditor and ContentAssistPopup
     def fill_suggestion(self, value=None):
+        self._popup.note_used(value or self._popup.get_value())
         value = self._get_popup_suggestion(value)
         # print(f"DEBUG: contentassist.py ContentAssistTextCtrlBase fill_suggestion writting value={value}")
         if value:
@@ -393,6 +401,7 @@ class _ContentAssistTextCtrlBase(wx.TextCtrl):
         if suggestion is None:
             return suggestion
         else:
+            self._popup.note_used(suggestion)
             return self.gherkin_prefix + suggestion
 
     def hide(self):
@@ -511,10 +520,11 @@ class ContentAssistFileButton(FileBrowseButton):
 
 class Suggestions(object):
 
-    def __init__(self, suggestion_source):
+    def __init__(self, suggestion_source, ranked=False):
         self._suggestion_source = suggestion_source
         self._previous_value = None
         self._previous_choices = []
+        self.ranked = ranked and hasattr(suggestion_source, 'get_ranked_suggestions')
 
     def get_for(self, value, row=None):
         self._previous_choices = self._get_choices(value, row)
@@ -527,7 +537,18 @@ class Suggestions(object):
                 return v
         raise AttributeError('Item not in choices "%s"' % name)
 
+    def note_used(self, name):
+        if name and hasattr(self._suggestion_source, 'note_used'):
+            self._suggestion_source.note_used(name)
+
     def _get_choices(self, value, row):
+        if self.ranked:
+            # Ranked suggestions keep their order and are not narrowed by prefix
+            choices = self._suggestion_source.get_ranked_suggestions(value, row)
+            if hasattr(self._suggestion_source, 'update_usage_counts'):
+                # Keyword uses are counted after the keystroke for ranking the next suggestions
+                wx.CallAfter(self._suggestion_source.update_usage_counts)
+            return self._format_choices(choices, '', self._get_duplicate_names(choices))
         if self._previous_value and value.startswith(self._previous_value):
             return [(key, val) for key, val in self._previous_choices
                     if utils.normalize(key).startswith(utils.normalize(value))]
@@ -582,10 +603,29 @@ class ContentAssistPopup(object):
         self._list: ContentAssistList = ContentAssistList(self._main_popup,
                                                           self.on_list_item_selected,
                                                           self.on_list_item_activated)
-        self._suggestions = Suggestions(suggestion_source)
+        self._suggestion_source = suggestion_source
+        self._suggestions = Suggestions(suggestion_source, self._get_ranked_config())
         self._choices = None
+        self._query = None
         # print(f"DEBUG: contentassist.py ContentAssistPopup INIT suggestion_source={suggestion_source}")
 
+    @staticmethod
+    def _get_ranked_config():
+        from robotide.context import APP
+        if not APP:
+            return False
+        return APP.settings['Grid'].get(_RANKED_SUGGESTION_CFG_KEY, False)
+
+    def set_ranked(self, ranked):
+        self._suggestions = Suggestions(self._suggestion_source, ranked)
+
+    def ranked_query(self):
+        """Returns the text of the shown ranked suggestions, or None when not ranked."""
+        return self._query if self._suggestions.ranked else None
+
+    def note_used(self, name):
+        self._suggestions.note_used(name)
+
     def reset(self):
         self._selection = -1
 
@@ -594,15 +634,21 @@ class ContentAssistPopup(object):
             self._selection) or None
 
     def content_assist_for(self, value, row=None):
+        self._query = value
         self._choices = self._suggestions.get_for(value, row=row)
         if not self._choices and ' ' in value:  # Find choices for last word
-            self._choices = self._suggestions.get_for(value.split()[-1], row=row)
+            self._query = value.split()[-1]
+            self._choices = self._suggestions.get_for(self._query, row=row)
         # print(f"DEBUG: contentassist.py ContentAssistPopup content_assist_for  value={value} choices={self._choices}")
         if not self._choices:
             self._list.ClearAll()
             if not isinstance(self._parent, GridEditor):
                 self._parent.hide()
             return False
+        if self._suggestions.ranked:
+            self._choices = list(dict.fromkeys(c for c in self._choices if c is not None))
+            self._list.populate(self._choices)
+            return True
         self._choices = list(set([c for c in self._choices if c is not None]))
         # print(f"DEBUG: contentassist.py ContentAssistPopup content_assist_for CALL POPULATE Choices={self._choices}")
         self._list.populate(sorted(self._choices))
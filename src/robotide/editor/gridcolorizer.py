@@ -28,6 +28,16 @@ from ..controller.macrocontrollers import UserKeywordController
 prefix=re.compile(r'^\d+_{2,}')
 
 class Colorizer(object):
+    """Colors the cells of a grid by their content and the selected content.
+
+    Only the rows in view and a margin of rows around them are colored, a
+    batch of cells per event loop round. Rows scrolled into view later are
+    colored by ``colorize_view``. The cell info of a row is kept with the
+    content of the row until ``invalidate`` is called, so changing the
+    selection does not look up the keywords of the cells again.
+    """
+    _margin = 20
+    _batch_size = 200
 
     def __init__(self, grid, controller):
         self._grid = grid
@@ -35,30 +45,87 @@ class Colorizer(object):
         self._colors = ColorizationSettings(grid.settings)
         self._current_task_id = 0
         self._timer = None
+        self._selection_content = None
+        self._colored_rows = set()
+        self._cell_info_cache = {}
 
     def close(self):
         self._grid = None
 
+    def invalidate(self):
+        """Forgets the cell infos and colors, when steps or keywords have changed."""
+        self._cell_info_cache.clear()
+        self._colored_rows.clear()
+
     def colorize(self, selection_content):
+        if selection_content != self._selection_content:
+            self._selection_content = selection_content
+            self._colored_rows.clear()
         self._current_task_id += 1
         if self._timer is None:
             self._timer = wx.CallLater(1, self._coloring_task, self._current_task_id, selection_content)
         else:
             self._timer.Restart(50, self._current_task_id, selection_content)
 
-    def _coloring_task(self, task_index, selection_content, row=0, col=0):
+    def colorize_view(self):
+        if self._grid is not None and self._rows_to_color():
+            self.colorize(self._selection_content)
+
+    def _coloring_task(self, task_index, selection_content, rows=None):
         if task_index != self._current_task_id or self._grid is None:
             return
-        if row >= self._grid.NumberRows:
-            self._grid.ForceRefresh()
-        elif col < self._grid.NumberCols:
-            self._colorize_cell(row, col, selection_content)
-            wx.CallAfter(self._coloring_task, task_index, selection_content, row, col+1)
+        if rows is None:
+            rows = self._rows_to_color()
+            rows.reverse()
+        for _ in range(max(1, self._batch_size // max(1, self._grid.NumberCols))):
+            if not rows:
+                break
+            row = rows.pop()
+            self._colorize_row(row, selection_content)
+            self._colored_rows.add(row)
+        if rows:
+            wx.CallAfter(self._coloring_task, task_index, selection_content, rows)
         else:
-            self._coloring_task(task_index, selection_content, row+1, 0)
+            self._grid.ForceRefresh()
+
+    def _rows_to_color(self):
+        # Rows in view first, then the margins below and above them
+        first, last = self._visible_rows()
+        number_rows = self._grid.NumberRows
+        rows = list(range(first, last + 1))
+        rows.extend(range(last + 1, min(last + 1 + self._margin, number_rows)))
+        rows.extend(range(first - 1, max(first - 1 - self._margin, -1), -1))
+        return [row for row in rows if row not in self._colored_rows]
+
+    def _visible_rows(self):
+        grid = self._grid
+        try:
+            top = grid.CalcUnscrolledPosition(0, 0)[1]
+            height = grid.GetGridWindow().GetClientSize().height
+        except AttributeError:
+            return 0, grid.NumberRows - 1
+        first = grid.YToRow(top)
+        last = grid.YToRow(top + height)
+        return max(first, 0), last if last >= 0 else grid.NumberRows - 1
+
+    def _colorize_row(self, row, selection_content):
+        for col, cell_info in enumerate(self._get_cell_infos(row)):
+            self._colorize_cell_with_info(row, col, cell_info, selection_content)
+
+    def _get_cell_infos(self, row):
+        columns = range(self._grid.NumberCols)
+        content = tuple(self._grid.GetCellValue(row, col) for col in columns)
+        cached = self._cell_info_cache.get(row)
+        if cached and cached[0] == content:
+            return cached[1]
+        cell_infos = [self._controller.get_cell_info(row, col) for col in columns]
+        self._cell_info_cache[row] = content, cell_infos
+        return cell_infos
 
     def _colorize_cell(self, row, col, selection_content):
-        cell_info = self._controller.get_cell_info(row, col)
+        self._colorize_cell_with_info(row, col, self._controller.get_cell_info(row, col), selection_content)
+
+    def _colorize_cell_with_info(self, row, col, cell_info, selection_content):
         if cell_info is None:
             self._set_default_colors(row, col)
             return
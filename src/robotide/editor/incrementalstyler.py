@@ -0,0 +1,164 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+from bisect import bisect_right
+
+import wx
+
+# A section heading, or the name of a test, task, keyword, setting or variable
+_BLOCK_START = re.compile(r'(?:\| +)?(?!\.\.\.)[^\s#|]')
+
+
+class IncrementalLexer(object):
+    """Lexes Robot Framework data starting from any section or block start.
+
+    The row tokenizer of the Robot Framework Pygments lexer carries state
+    from row to row. At a row starting a section, a test, a keyword, a
+    setting or a variable, the state is only the current section and the
+    test templates, so it is saved at those rows and lexing can restart
+    from the nearest one before a change.
+
+    Saved states are valid for the rows before the row lexing last started
+    from, and are replaced for the rows after it.
+    """
+
+    def __init__(self, lexer_module, lexer):
+        self._module = lexer_module
+        self._new_lang = getattr(lexer, 'new_lang', None)
+        self._lines = []
+        self._states = []
+
+    def restart_line(self, line):
+        """Returns the nearest line at or before ``line`` lexing can start from."""
+        index = bisect_right(self._lines, line)
+        return self._lines[index - 1] if index else 0
+
+    def lex(self, rows, first_line=0):
+        """Generates the ``(value, token)`` pairs of each row as a list.
+
+        ``first_line`` must be a line returned by ``restart_line``.
+        """
+        index = bisect_right(self._lines, first_line)
+        state = self._states[index - 1] if index and self._lines[index - 1] == first_line else None
+        del self._lines[index - 1 if state else index:]
+        del self._states[len(self._lines):]
+        row_tokenizer = self._row_tokenizer(state)
+        var_tokenizer = self._module.VariableTokenizer()
+        for line, row in enumerate(rows, first_line):
+            if _BLOCK_START.match(row):
+                self._lines.append(line)
+                self._states.append(self._save_state(row_tokenizer))
+            yield [(value, token) for val, tokn in row_tokenizer.tokenize(row)
+                   for value, token in var_tokenizer.tokenize(val, tokn) if value]
+
+    def _row_tokenizer(self, state):
+        if self._new_lang is None:
+            row_tokenizer = self._module.RowTokenizer()
+        else:
+            row_tokenizer = self._module.RowTokenizer(self._new_lang)
+        if state:
+            self._restore_state(row_tokenizer, state)
+        return row_tokenizer
+
+    def _save_state(self, row_tokenizer):
+        table = next((name for name, table in row_tokenizer._tables.items()
+                      if table is row_tokenizer._table), None)
+        return table, [(t._test_template, t._default_template) for t in self._macro_tables(row_tokenizer)]
+
+    def _restore_state(self, row_tokenizer, state):
+        table, templates = state
+        for macro_table, (test_template, default_template) in zip(self._macro_tables(row_tokenizer), templates):
+            macro_table._test_template = test_template
+            macro_table._default_template = default_template
+        if table is not None:
+            row_tokenizer._table = row_tokenizer._tables[table]
+            # Creates the tokenizer of the next row for the restored templates
+            row_tokenizer._table.end_row()
+
+    def _macro_tables(self, row_tokenizer):
+        tables = []
+        for table in row_tokenizer._tables.values():
+            if isinstance(table, self._module.TestCaseTable) and table not in tables:
+                tables.append(table)
+        return tables
+
+
+class IncrementalStyler(object):
+    """Styles the text of a StyledTextCtrl from the first line not yet styled.
+
+    ``styles`` maps lexer tokens to style numbers. Styling restarts from
+    the start of the section or block where the unstyled text begins, and
+    continues to the requested position, usually the end of the visible
+    text given by ``EVT_STC_STYLENEEDED``.
+    """
+
+    def __init__(self, editor, lexer_module, lexer, styles):
+        self._editor = editor
+        self._lexer = IncrementalLexer(lexer_module, lexer)
+        self._styles = styles
+
+    def style(self, end=None):
+        editor = self._editor
+        length = editor.GetLength()
+        end = length if end is None else min(end, length)
+        styled = editor.GetEndStyled()
+        if styled >= end:
+            return
+        first_line = self._lexer.restart_line(editor.LineFromPosition(styled))
+        next_line = editor.LineFromPosition(end) + 1
+        start = editor.PositionFromLine(first_line)
+        stop = editor.PositionFromLine(next_line) if next_line < editor.GetLineCount() else length
+        rows = editor.GetTextRange(start, stop).split('\n')
+        # Only the last row of the document can be without a line feed
+        eols = [1] * (len(rows) - 1) + [0]
+        if not rows[-1]:
+            rows.pop()
+            eols.pop()
+        if wx.VERSION < (4, 1, 0):
+            editor.StartStyling(start, 31)
+        else:
+            editor.StartStyling(start)
+        tokens = self._lexer.lex((row.rstrip('\r') for row in rows), first_line)
+        for row, eol, row_tokens in zip(rows, eols, tokens):
+            self._style_row(row, eol, row_tokens)
+
+    def _style_row(self, row, eol, tokens):
+        # Scintilla positions are UTF-8 bytes, and consecutive tokens of a style are styled at once
+        ascii_row = row.isascii()
+        remaining = (len(row) if ascii_row else _utf8_length(row)) + eol
+        run_style = None
+        run_length = 0
+        for value, token in tokens:
+            style = self._styles[token]
+            length = len(value) if ascii_row else _utf8_length(value)
+            length = min(length, remaining)
+            remaining -= length
+            if style != run_style and run_length:
+                self._editor.SetStyling(run_length, run_style)
+                run_length = 0
+            run_style = style
+            run_length += length
+        # The row ends with a line feed token, and a carriage return gets its style
+        run_length += remaining
+        if run_length:
+            self._editor.SetStyling(run_length, run_style or 0)
+
+
+def _utf8_length(value):
+    try:
+        return len(value.encode('utf-8'))
+    except UnicodeEncodeError:
+        return len(value)
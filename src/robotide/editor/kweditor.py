@@ -306,6 +306,8 @@ class KeywordEditor(GridEditor, Plugin):
         self.Bind(grid.EVT_GRID_LABEL_LEFT_CLICK, self.on_label_left_click)
         self.Bind(wx.EVT_KILL_FOCUS, self.on_kill_focus)
         self.Bind(wx.EVT_MOUSEWHEEL, self.on_zoom)
+        self.Bind(wx.EVT_SCROLLWIN, self.on_scroll)
+        self.GetGridWindow().Bind(wx.EVT_SIZE, self.on_scroll)
 
     def get_tooltip_content(self):
         if self.IsCellEditControlShown() or self._popup_menu_shown:
@@ -339,7 +341,7 @@ class KeywordEditor(GridEditor, Plugin):
             self.ClearSelection()
             self.GoToCell(rows[0], 0)
             wx.CallAfter(self.SelectBlock, rows[0], 0, rows[-1], self.NumberCols-1)
-        self._colorize_grid()
+        self._colorize_grid(invalidate=False)
         event.Skip()
 
     def on_kill_focus(self, event):
@@ -623,7 +625,9 @@ class KeywordEditor(GridEditor, Plugin):
         for empty_col in range(col + 1, 26):  # DEBUG to be sure all are empty, was: self.NumberCols + 1
             self.SetColLabelValue(empty_col, '')
 
-    def _colorize_grid(self):
+    def _colorize_grid(self, invalidate=True):
+        if invalidate:
+            self._colorizer.invalidate()
         selection_content = self._get_single_selection_content_or_none_on_first_call()
         if selection_content is None:
             self.highlight(None)
@@ -935,6 +939,11 @@ class KeywordEditor(GridEditor, Plugin):
         self._set_zoom(rotation)
         self.zoom = self.settings.get(ZOOM_FACTOR, 0)
 
+    def on_scroll(self, event):
+        # The rows scrolled into view are colored after the grid has scrolled
+        wx.CallAfter(self._colorizer.colorize_view)
+        event.Skip()
+
     def _set_zoom(self, rotation):
         if rotation == 0:  # Special value to reset
             self.settings.set(ZOOM_FACTOR, 0)
@@ -15,7 +15,6 @@
 import builtins
 import os
 import re
-import tempfile
 from io import StringIO, BytesIO
 from os.path import dirname
 from time import time
@@ -24,6 +23,7 @@ import wx
 from wx import stc, Colour
 from wx.adv import HyperlinkCtrl, EVT_HYPERLINK
 from multiprocessing import shared_memory
+from .incrementalstyler import IncrementalStyler
 from .popupwindow import HtmlPopupWindow
 from .pythoneditor import PythonSTC
 from . import _EDIT_nt, get_menudata
@@ -65,6 +65,7 @@ AUTO_SUGGESTIONS = 'enable auto suggestions'
 LANG_SETTING = 'Language: '
 PATH_EXCLUSIONS = dirname(__file__)
 PLUGIN_NAME = 'Text Edit'
+RANKED_SUGGESTIONS = 'ranked suggestions'
 TOKEN_TXT = 'Token('
 TXT_NUM_SPACES = 'txt number of spaces'
 ZOOM_FACTOR = 'zoom factor'
@@ -688,9 +689,6 @@ class DataValidationHandler(object):
             self._doc_language = lang
         else:
             self._get_shared_doc_lang()
-        file = tempfile.NamedTemporaryFile(prefix="model_saved_from_RIDE_",
-                                           suffix=".robot", mode="w+", delete=False)
-        self.tempfilename=file.name
 
     def _get_shared_doc_lang(self):
         try:
@@ -812,13 +810,15 @@ class DataValidationHandler(object):
 
         # print(f"DEBUG: textedit.py validate_and_update Language after sanity_check result={result}\n"
         #       f" lang params: {initial_lang=}, {self._doc_language=}")
+        checked_text, checked_lang = m_text, get_rf_lang_code(self._doc_language)
         if isinstance(result, tuple):
             m_text = transform_doc_language(initial_lang, self._doc_language, m_text, node_info=result)
         __ = self._get_shared_doc_lang()
-        try:
-            result = self._sanity_check(data, m_text)  # Check if language changed and is valid content
-        except DataError as err:
-            result = (err.message, err.details)
+        if m_text != checked_text or get_rf_lang_code(self._doc_language) != checked_lang:
+            try:
+                result = self._sanity_check(data, m_text)  # Check if language changed and is valid content
+            except DataError as err:
+                result = (err.message, err.details)
         if isinstance(result, tuple):
             handled = self._handle_sanity_check_failure(result)
             if not handled:
@@ -840,37 +840,31 @@ class DataValidationHandler(object):
         return True
 
     def _sanity_check(self, data, text):
-        from robotide.lib.compat.parsing import ErrorReporter
+        """Parses ``text`` once, and returns True or the first error as a tuple.
+
+        Invalid tokens are searched from the parsed model before the errors
+        of its statements, so the text is tokenized only by ``get_model``.
+        """
+        from robotide.lib.compat.parsing import ErrorReporter, find_token_error
         from robot.parsing.parser.parser import get_model
         from robotide.lib.robot.errors import DataError
         result = None
         rf_lang = get_rf_lang_code(self._doc_language)
         # print(f"DEBUG: textedit.py _sanity_check data is type={type(data)} lang={self._doc_language},"
         #       f" transformed lang={rf_lang}")
-        from robot.api.parsing import get_tokens
-        for token in get_tokens(text):
-            # print(repr(token))
-            if token.type == token.ERROR:
-                # print("DEBUG: textedit.py _sanity_check TOKEN in ERROR")
-                result = 'ERROR', repr(token)
-                return result
-            if token.type == token.INVALID_HEADER:
-                # print("DEBUG: textedit.py _sanity_check TOKEN in INVALID_HEADER")
-                result = 'INVALID_HEADER', repr(token)
-                return result
-
         try:
             model = get_model(text, lang=rf_lang)
         except AttributeError:
             return "Failed validation by Robot Framework", "Please, check if Language setting is valid!"
+        token = find_token_error(model)
+        if token is not None:
+            return token.type, repr(token)
         validator = ErrorReporter()
         try:
             validator.visit(model)
         except DataError as err:
             result = (err.message, err.details)
-        model.save(self.tempfilename)
         # print(f"DEBUG: textedit.py _sanity_check after calling validator {validator}\n"
-        #       f"Save model in /tmp/model_saved_from_RIDE.robot"
         #       f" result={result}")
         return True if not result else result
 
@@ -1352,6 +1346,9 @@ class SourceEditor(wx.Panel):
             self._controller_for_context = DummyController(self._data.wrapper_data, self._data.wrapper_data)
             self._suggestions = SuggestionSource(self.plugin, self._controller_for_context)
         self._suggestions.update_from_local(self.words_cache(self.source_editor.GetLineCount()), self.language)
+        if self._ranked_suggestions_enabled():
+            self._show_ranked_suggestions(selected)
+            return
         sugs = set()
         if selected:
             selected = list(selected)
@@ -1430,6 +1427,34 @@ class SourceEditor(wx.Panel):
             self.source_editor.SetInsertionPoint(self._position)  # We should know if list was canceled or value change
         """
 
+    def _ranked_suggestions_enabled(self):
+        try:
+            return self.source_editor_parent.app.settings[PLUGIN_NAME].get(RANKED_SUGGESTIONS, False)
+        except (AttributeError, KeyError, TypeError):
+            return False
+
+    def _show_ranked_suggestions(self, selected):
+        start = list(selected)[0] if selected else ''
+        entry_word = start.split('.')[-1].strip() if '.' in start else start
+        names = [getattr(s, 'name', s) for s in self._suggestions.get_ranked_suggestions(start)]
+        # Keyword uses are counted after the keystroke for ranking the next suggestions
+        wx.CallAfter(self._suggestions.update_usage_counts)
+        suggestions = ";".join(name for name in dict.fromkeys(names) if name)
+        if suggestions:
+            self.source_editor.AutoCompSetDropRestOfWord(False)
+            self.source_editor.AutoCompSetFillUps('=')
+            self.source_editor.AutoCompSetIgnoreCase(True)
+            self.source_editor.AutoCompSetOrder(stc.STC_ORDER_CUSTOM)
+            self.source_editor.AutoCompSetSeparator(ord(';'))
+            self.source_editor.AutoCompShow(len(entry_word), suggestions)
+            self.autocomp_pos = self.source_editor.AutoCompPosStart()
+            self._showing_list = True
+
+    def on_autocomp_selection(self, event):
+        if self._suggestions:
+            self._suggestions.note_used(event.GetText())
+        event.Skip()
+
     def open(self, data):
         self.reset()
         self._data = data
@@ -1757,6 +1782,7 @@ class SourceEditor(wx.Panel):
         self.source_editor.Bind(wx.EVT_KILL_FOCUS, self.LeaveFocus)
         self.source_editor.Bind(wx.EVT_SET_FOCUS, self.GetFocus)
         self.source_editor.Bind(wx.EVT_MENU, self.on_menu)
+        self.source_editor.Bind(stc.EVT_STC_AUTOCOMP_SELECTION, self.on_autocomp_selection)
         # DEBUG: Add here binding for keyword help
 
     def on_menu(self, event):
@@ -2741,8 +2767,7 @@ class RobotDataEditor(PythonSTC):
         return self.GetText().encode('UTF-8')
 
     def on_style(self, event):
-        __ = event
-        self.stylizer.stylize()
+        self.stylizer.stylize(event.GetPosition())
 
     def on_zoom(self, event):
         __ = event
@@ -2904,7 +2929,8 @@ class RobotDataEditor(PythonSTC):
             self.BraceBadLight(brace_at_caret)
         else:
             self.BraceHighlight(brace_at_caret, brace_opposite)
-        self.stylizer.stylize()
+        last_visible_line = self.DocLineFromVisible(self.GetFirstVisibleLine() + self.LinesOnScreen())
+        self.stylizer.stylize(self.GetLineEndPosition(last_visible_line))
 
     def _show_keyword_details(self, value, coords=None):
         """
@@ -3053,6 +3079,7 @@ class RobotStylizer(object):
         self.tokens = {}
         self.editor = editor
         self.lexer = None
+        self._styler = None
         self.settings = settings
         self._readonly = readonly
         self._ensure_default_font_is_valid()
@@ -3067,6 +3094,7 @@ class RobotStylizer(object):
         # print(f"DEBUG: texteditor.py RobotStylizer _init_ language={self.language}\n")
         if robotframeworklexer:
             self.lexer = robotframeworklexer.RobotFrameworkLexer(**options)
+            self._styler = IncrementalStyler(self.editor, robotframeworklexer, self.lexer, self.tokens)
         else:
             self.editor.GetParent().create_syntax_colorization_help()
         self.set_styles(self._readonly)
@@ -3189,21 +3217,15 @@ class RobotStylizer(object):
             sys_font = wx.SystemSettings.GetFont(wx.SYS_ANSI_FIXED_FONT)
             self.settings[PLUGIN_NAME]['font face'] = sys_font.GetFaceName()
 
-    def stylize(self):
+    def stylize(self, end=None):
+        """Styles the text up to ``end``, by default to the end of the text.
+
+        Lexing restarts from the start of the section, test or keyword
+        block containing the first unstyled position.
+        """
         # print(f"DEBUG: texteditor.py RobotStylizer stylize ENTER lexer={self.lexer}")
         if not self.lexer:
             return
-        self.editor.ConvertEOLs(2)
-        shift = 0
-        for position, token, value in self.lexer.get_tokens_unprocessed(self.editor.GetText()):
-            # print(f"DEBUG: texteditor.py RobotStylizer stylize token={token} value={value}")
-            if wx.VERSION < (4, 1, 0):
-                self.editor.StartStyling(position + shift, 31)
-            else:
-                self.editor.StartStyling(position + shift)
-            try:
-                self.editor.SetStyling(len(value.encode('utf-8')), self.tokens[token])
-                shift += len(value.encode('utf-8')) - len(value)
-            except UnicodeEncodeError:
-                self.editor.SetStyling(len(value), self.tokens[token])
-                shift += len(value) - len(value)
+        if self.editor.GetEndStyled() == 0:
+            self.editor.ConvertEOLs(2)
+        self._styler.style(end)
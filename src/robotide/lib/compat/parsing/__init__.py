@@ -13,7 +13,7 @@
 #  limitations under the License.
 
 try:
-    from .validator import ErrorReporter
+    from .validator import ErrorReporter, find_token_error
 except ImportError:
     pass
 from .language import get_english_label, get_localized_setting
@@ -13,6 +13,7 @@
 #  limitations under the License.
 import os.path
 import sys
+from io import BytesIO
 
 try:
     from robot.conf.languages import Language
@@ -29,17 +30,20 @@ from robot.errors import DataError
 from robotide.lib.robot.utils import Utf8Reader
 
 
-def check_file_language(path):
+def check_file_language(path, content=None):
     """
     Returns the language code if defined and valid, error if not valid, or None if file does not have preamble.
 
     :param path: Path to robot or resource file
+    :param content: Content of the file as bytes, if it has already been read
     :return: language, error or None
     """
     if not Language:
         return None
     language_string = None
-    if os.path.isfile(path):
+    if content is not None:
+        language_string = read(BytesIO(content))
+    elif os.path.isfile(path):
         language_string = read(path)
     if not language_string:
         return None
@@ -1,4 +1,8 @@
+import ast
+
+from robot.api import Token
 from robot.api.parsing import ModelVisitor
+from robot.parsing.model.statements import Statement
 from robotide.lib.robot.errors import DataError
 
 
@@ -11,3 +15,23 @@ class ErrorReporter(ModelVisitor):
                 print(f"- {error}")
                 raise DataError(message=error,details=node.lineno)
         ModelVisitor.generic_visit(self, node)
+
+
+def find_token_error(model):
+    """Returns the first ``ERROR`` or ``INVALID_HEADER`` token of ``model``, or ``None``.
+
+    Tokens are searched from the already parsed model, in the order they are
+    in the data, so the text does not need to be tokenized again.
+    """
+    for token in _tokens(model):
+        if token.type in (Token.ERROR, Token.INVALID_HEADER):
+            return token
+    return None
+
+
+def _tokens(node):
+    if isinstance(node, Statement):
+        yield from node.tokens
+        return
+    for child in ast.iter_child_nodes(node):
+        yield from _tokens(child)
@@ -348,8 +348,8 @@ class TestCaseFile(_TestData):
         self._tab_size = self._settings.get('txt number of spaces', 2) if self._settings else 2
         _TestData.__init__(self, parent, source, language)
 
-    def populate(self):
-        FromFilePopulator(self, self._tab_size, self.language).populate(self.source)
+    def populate(self, content=None):
+        FromFilePopulator(self, self._tab_size, self.language, content).populate(self.source)
         self._validate()
         return self
 
@@ -391,8 +391,8 @@ class ResourceFile(_TestData):
         self._tab_size = self.settings.get('txt number of spaces', 2) if self.settings else 2
         _TestData.__init__(self, source=source, language=self.language)
 
-    def populate(self):
-        FromFilePopulator(self, self._tab_size, self.language).populate(self.source, resource=True)
+    def populate(self, content=None):
+        FromFilePopulator(self, self._tab_size, self.language, content).populate(self.source, resource=True)
         self._report_status()
         return self
 
@@ -15,6 +15,7 @@
 
 import os
 
+from io import BytesIO
 from multiprocessing import shared_memory
 from robotide.lib.compat.parsing import language
 from robotide.lib.robot.errors import DataError
@@ -38,9 +39,14 @@ READERS = {'tsv': TsvReader, 'rst': RestReader, 'rest': RestReader,
 # Hook for external tools for altering ${CURDIR} processing
 PROCESS_CURDIR = True
 
+# Hook for processes parsing files on behalf of RIDE, which must not share their language
+STORE_LANGUAGE = True
+
 
 def store_language(lang: list):
     assert lang is not None
+    if not STORE_LANGUAGE:
+        return
     # Shared memory to store language definition
     try:
         sharemem = shared_memory.ShareableList(['en'], name="language")
@@ -66,13 +72,14 @@ class FromFilePopulator(object):
                    'keywords': KeywordTablePopulator,
                    'comments': CommentsTablePopulator}
 
-    def __init__(self, datafile, tab_size=2, lang=None):
+    def __init__(self, datafile, tab_size=2, lang=None, content=None):
         self._datafile = datafile
         self._populator = NullPopulator()
         self._curdir = self._get_curdir(datafile.directory)
         self._tab_size = tab_size
+        self._content = content
         if datafile.source:
-            self._language = lang if lang else language.check_file_language(datafile.source)
+            self._language = lang if lang else language.check_file_language(datafile.source, content)
         else:
             self._language = lang if lang else None
         if self._language:
@@ -88,7 +95,7 @@ class FromFilePopulator(object):
 
     def populate(self, path, resource=False):
         LOGGER.info("Parsing file '%s'." % path)
-        source = self._open(path)
+        source = BytesIO(self._content) if self._content is not None else self._open(path)
         try:
             # print(f"DEBUG: populators populate path={path} READER={self._get_reader(path, resource)}")
             self._get_reader(path, resource).read(source, self)
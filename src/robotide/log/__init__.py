@@ -14,5 +14,6 @@
 #  limitations under the License.
 
 from .log import LogPlugin
+from .logmodel import LogFilter, LogModel, RotatingLogFile
 from .logwindow import LogWindow, message_to_string
 from .logoutput import LogOutput
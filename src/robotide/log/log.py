@@ -16,13 +16,13 @@
 import atexit
 import builtins
 import glob
-import io
 import os
 import sys
 import tempfile
 import uuid
 import wx
 
+from .logmodel import LogModel, RotatingLogFile
 from .logwindow import LogWindow, message_to_string
 from .. import context
 from .. import widgets
@@ -43,33 +43,26 @@ class LogPlugin(Plugin):
             'log_to_file': True
         })
         self.title = _('RIDE Log')
-        self._log = []
+        self._log = LogModel()
         self._panel = None
         self._path = os.path.join(
             tempfile.gettempdir(), '{}-ride.log'.format(uuid.uuid4()))
-        self._outfile = None
+        self._logfile = RotatingLogFile(self._path)
         self._remove_old_log_files()
         atexit.register(self._close)
 
     def _close(self):
-        if self._outfile is not None:
-            self._outfile.close()
+        self._logfile.close()
 
     @staticmethod
     def _remove_old_log_files():
         for fname in glob.glob(
-                os.path.join(tempfile.gettempdir(), '*-ride.log')):
+                os.path.join(tempfile.gettempdir(), '*-ride.log*')):
             try:
                 os.remove(fname)
             except (OSError, IOError) as e:
                 sys.stderr.write(f"Removing old *-ride.log files failed with: {repr(e)}\n")
 
-    @property
-    def _logfile(self):
-        if self._outfile is None:
-            self._outfile = io.open(self._path, 'w', encoding='utf8')
-        return self._outfile
-
     def enable(self):
         self._create_menu()
         self.subscribe(self._log_message, RideLog)
@@ -93,7 +86,6 @@ class LogPlugin(Plugin):
             print('{}'.format(message_to_string(message)))
         if self.log_to_file:
             self._logfile.write(message_to_string(message))
-            self._outfile.flush()
         if message.notify_user:
             font_size = 13 if context.IS_MAC else -1
             widgets.HtmlDialog(message.level, message.message,
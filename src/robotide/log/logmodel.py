@@ -0,0 +1,112 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import os
+from collections import deque
+
+
+class LogModel(object):
+    """Log messages in the order they were logged, keeping only the latest ones.
+
+    ``count`` is the number of messages ever appended, and a message keeps
+    the index it got when it was appended, so that a view can ask for the
+    messages appended after the ones it has shown with ``since``.
+    """
+    max_messages = 10000
+
+    def __init__(self, messages=(), max_messages=None):
+        self.max_messages = max_messages or self.max_messages
+        self._messages = deque(maxlen=self.max_messages)
+        self.count = 0
+        for message in messages:
+            self.append(message)
+
+    def append(self, message):
+        self._messages.append(message)
+        self.count += 1
+
+    def since(self, index):
+        """Returns the kept messages appended after the first ``index`` messages."""
+        new = self.count - index
+        if new <= 0:
+            return []
+        if new >= len(self._messages):
+            return list(self._messages)
+        return [self._messages[i] for i in range(len(self._messages) - new, len(self._messages))]
+
+    @property
+    def levels(self):
+        return sorted(set(message.level for message in self._messages))
+
+    def __iter__(self):
+        return iter(self._messages)
+
+    def __len__(self):
+        return len(self._messages)
+
+
+class LogFilter(object):
+    """Matches messages by their level and a case-insensitive text."""
+
+    def __init__(self, level=None, text=''):
+        self.level = level or None
+        self.text = text.lower()
+
+    @property
+    def active(self):
+        return bool(self.level or self.text)
+
+    def matches(self, message):
+        if self.level and message.level != self.level:
+            return False
+        return not self.text or self.text in message.message.lower()
+
+
+class RotatingLogFile(object):
+    """A log file that is moved to ``<path>.1`` when it grows over ``max_bytes``.
+
+    The file is opened on the first write and flushed after every write.
+    Older files are moved to ``<path>.2`` and so on, up to ``backups`` files.
+    """
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backups=1):
+        self.path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._file = None
+        self._size = 0
+
+    def write(self, text):
+        if self._file is None:
+            self._file = io.open(self.path, 'w', encoding='utf8')
+            self._size = 0
+        self._file.write(text)
+        self._file.flush()
+        self._size += len(text.encode('utf-8', 'replace'))
+        if self._size > self._max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self.close()
+        for index in range(self._backups, 0, -1):
+            source = self.path if index == 1 else '%s.%d' % (self.path, index - 1)
+            if os.path.exists(source):
+                os.replace(source, '%s.%d' % (self.path, index))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -13,13 +13,20 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import builtins
+from collections import deque
+
 import wx
 from wx import Colour
 
+from .logmodel import LogFilter, LogModel
 from .. import widgets
 from ..widgets import RIDEDialog
 from wx.stc import StyledTextCtrl
 
+_ = wx.GetTranslation  # To keep linter/code analyser happy
+builtins.__dict__['_'] = wx.GetTranslation
+
 
 def message_to_string(msg, parserlog=False):
     message = msg.message.replace('\n\t', '') if parserlog else msg.message
@@ -27,6 +34,12 @@ def message_to_string(msg, parserlog=False):
 
 
 class LogWindow(wx.Panel):
+    """Shows the messages of a ``LogModel``, or of a list of messages.
+
+    New messages are appended to the end of the shown text, and the oldest
+    ones are removed when more messages than the model keeps are shown.
+    The text is only rebuilt when the filter changes.
+    """
 
     def __init__(self, notebook, title, log):
         wx.Panel.__init__(self, notebook)
@@ -41,42 +54,101 @@ class LogWindow(wx.Panel):
         self._output.StyleSetSpec(wx.stc.STC_STYLE_DEFAULT, f"fore:{fore}, back:{backg}")
         self._output.StyleSetBackground(wx.stc.STC_STYLE_DEFAULT, backg)
         self._output.Bind(wx.EVT_KEY_DOWN, self.on_key_down)
-        self._log = log
+        self._log = log if isinstance(log, LogModel) else LogModel(log)
+        self._filter = LogFilter()
+        self._shown = 0
+        # Byte lengths of the shown messages, as Scintilla positions are bytes
+        self._shown_lengths = deque()
+        self._create_filter_bar()
         self._add_to_notebook(notebook)
         self.SetFont(widgets.Font().fixed_log)
         self.Bind(wx.EVT_SIZE, self.on_size)
 
     def _create_ui(self):
         self.SetSizer(widgets.VerticalSizer())
+        self.Sizer.Add(self._filter_bar, 0, wx.EXPAND)
         self.Sizer.add_expanding(self._output)
 
+    def _create_filter_bar(self):
+        self._filter_bar = wx.Panel(self)
+        self._level_choice = wx.Choice(self._filter_bar, choices=[_('All levels')])
+        self._level_choice.SetSelection(0)
+        self._filter_text = wx.SearchCtrl(self._filter_bar, style=wx.TE_PROCESS_ENTER)
+        self._filter_text.ShowCancelButton(True)
+        sizer = wx.BoxSizer(wx.HORIZONTAL)
+        sizer.Add(self._level_choice, 0, wx.ALL, 2)
+        sizer.Add(self._filter_text, 1, wx.ALL, 2)
+        self._filter_bar.SetSizer(sizer)
+        self._level_choice.Bind(wx.EVT_CHOICE, self.on_filter)
+        self._filter_text.Bind(wx.EVT_TEXT, self.on_filter)
+        self._filter_text.Bind(wx.EVT_SEARCHCTRL_CANCEL_BTN, self.on_filter_cancel)
+
     def _add_to_notebook(self, notebook):
         notebook.add_tab(self, self.title, allow_closing=True)
         notebook.show_tab(self)
-        self._output.SetSize(self.Size)
+        self._layout()
 
     def close(self, notebook):
         self._output.Close()
         notebook.delete_tab(self)
 
     def update_log(self):
-        content = self._decode_log(self._log)
-        text_size = len(content)
+        """Appends the messages logged after the previous update."""
+        messages = self._log.since(self._shown)
+        self._shown = self._log.count
+        self._update_levels(messages)
+        self._append([m for m in messages if self._filter.matches(m)])
+
+    def set_filter(self, level=None, text=''):
+        """Shows only the kept messages with ``level`` and containing ``text``."""
+        self._filter = LogFilter(level, text)
         self._output.SetReadOnly(False)
-        self._output.SetText(content)
-        self._output.SetStyling(text_size, wx.stc.STC_STYLE_DEFAULT)
+        self._output.ClearAll()
+        self._output.SetReadOnly(True)
+        self._shown_lengths.clear()
+        self._shown = self._log.count
+        self._update_levels(self._log)
+        self._append([m for m in self._log if self._filter.matches(m)])
+
+    def _append(self, messages):
+        if not messages:
+            return
+        texts = [message_to_string(msg, self._removetabs) for msg in messages]
+        self._output.SetReadOnly(False)
+        self._output.AppendText(''.join(texts))
+        self._shown_lengths.extend(len(text.encode('utf-8')) for text in texts)
+        excess = len(self._shown_lengths) - self._log.max_messages
+        if excess > 0:
+            self._output.DeleteRange(0, sum(self._shown_lengths.popleft() for __ in range(excess)))
         self._output.SetReadOnly(True)
         self._output.Refresh()
 
-    def _decode_log(self, log):
-        result = ''
-        for msg in log:
-            result += message_to_string(msg, self._removetabs)
-        return result
+    def _update_levels(self, messages):
+        levels = self._level_choice.GetItems()
+        for level in sorted(set(msg.level for msg in messages)):
+            if level not in levels:
+                self._level_choice.Append(level)
+                levels.append(level)
+
+    def on_filter(self, event):
+        __ = event
+        selection = self._level_choice.GetSelection()
+        level = self._level_choice.GetString(selection) if selection > 0 else None
+        self.set_filter(level, self._filter_text.GetValue())
+
+    def on_filter_cancel(self, event):
+        self._filter_text.SetValue('')
+        self.on_filter(event)
 
     def on_size(self, evt):
         _ = evt
-        self._output.SetSize(self.Size)
+        self._layout()
+
+    def _layout(self):
+        width, height = self.Size
+        bar_height = self._filter_bar.GetBestSize().height
+        self._filter_bar.SetSize(0, 0, width, bar_height)
+        self._output.SetSize(0, bar_height, width, max(height - bar_height, 0))
 
     def on_key_down(self, event):
         keycode = event.GetKeyCode()
@@ -15,14 +15,20 @@
 
 import os
 import time
+from itertools import chain
 
 from ..robotapi import normpath, ALIAS_MARKER
 from ..spec.iteminfo import BlockKeywordInfo
+from ..spec.libraryfingerprint import failed_imports, fingerprint_changed
 
 BOOL_COND = '(boolean) condition'
 SELECTOR_FOR = ('Selector for `FOR`. See `BuiltIn.FOR` docs at '
                 'https://robotframework.org/robotframework/latest/RobotFrameworkUserGuide.html#for-loops.')
 ARG_VALUES = '*values'
+# Seconds after which importing a library that failed is tried again, doubled after every
+# failure in a row up to the maximum
+_FAILED_IMPORT_RETRY_INTERVAL = 10.0
+_MAX_FAILED_IMPORT_RETRY_INTERVAL = 3600.0
 
 
 class LibraryCache(object):
@@ -65,31 +71,77 @@ class LibraryCache(object):
         return all_libraries
 
     def _get_library(self, name, args):
-        library_database = \
-            self._library_manager.get_new_connection_to_library_database()
-        try:
-            last_updated = library_database.get_library_last_updated(name, args)
-            if last_updated:
-                if time.time() - last_updated > 10.0:
+        return self._get_libraries([(name, args)])[0]
+
+    def _get_libraries(self, libraries):
+        library_database = self._library_manager.get_library_database()
+        stored = library_database.fetch_keywords_of_libraries(libraries)
+        missing = {}
+        for name, args in libraries:
+            if (name, str(args)) not in stored:
+                missing.setdefault((name, str(args)), (name, args))
+        # All missing libraries are requested at once to import them concurrently
+        fetched = dict(zip(missing, self._library_manager.get_and_insert_keywords_of_libraries(
+            list(missing.values()))))
+        result = []
+        for name, args in libraries:
+            key = (name, str(args))
+            if key in stored:
+                last_updated, fingerprint, keywords = stored[key]
+                if self._is_stale(last_updated, fingerprint):
+                    self._library_manager.fetch_keywords(
+                        name, args, self._library_refresh_listener(name))
+            else:
+                keywords = fetched[key]
+                if keywords is None:
+                    # Still being imported, the namespace is refreshed once it is done
+                    keywords = []
                     self._library_manager.fetch_keywords(
-                        name, args, self._libraries_need_refresh_listener)
-                return library_database.fetch_library_keywords(name, args)
-            return self._library_manager.get_and_insert_keywords(name, args)
-        finally:
-            library_database.close()
+                        name, args, self._library_refresh_listener(name))
+            result.append(keywords)
+        return result
+
+    @staticmethod
+    def _is_stale(last_updated, fingerprint):
+        if fingerprint is None:
+            # Stored before fingerprints were recorded
+            return True
+        attempts = failed_imports(fingerprint)
+        if attempts:
+            # Import failed, it may succeed once the library is installed or
+            # found from the pythonpath, even if a spec file was used meanwhile
+            interval = min(_FAILED_IMPORT_RETRY_INTERVAL * 2 ** (attempts - 1), _MAX_FAILED_IMPORT_RETRY_INTERVAL)
+            return time.time() - last_updated > interval or fingerprint_changed(fingerprint)
+        return fingerprint_changed(fingerprint)
+
+    def _library_refresh_listener(self, name):
+        def listener(*args):
+            self._libraries_need_refresh_listener(*args, library=name)
+        return listener
 
     @staticmethod
     def _key(name, args):
         return name, str(tuple(args or ''))
 
     def get_library_keywords(self, name, args=None, alias=None):
-        args_with_alias = self._alias_to_args(alias, args)
-        key = self._key(name, args_with_alias)
-        if key not in self._library_keywords:
-            self._library_keywords[key] = [k.with_alias(alias) for k in
-                                           self._get_library(name, args)]
+        return self.get_keywords_of_libraries([(name, args, alias)])[0]
+
+    def get_keywords_of_libraries(self, libraries):
+        """Returns the keywords of several ``(name, args, alias)`` library imports.
 
-        return self._library_keywords[key]
+        The libraries not cached yet are read from the library database with
+        a single batch of queries.
+        """
+        keys = [self._key(name, self._alias_to_args(alias, args)) for name, args, alias in libraries]
+        uncached = {}
+        for key, library in zip(keys, libraries):
+            if key not in self._library_keywords:
+                uncached.setdefault(key, library)
+        if uncached:
+            keywords = self._get_libraries([(name, args) for name, args, _ in uncached.values()])
+            for (key, (_, _, alias)), library_keywords in zip(uncached.items(), keywords):
+                self._library_keywords[key] = [k.with_alias(alias) for k in library_keywords]
+        return [self._library_keywords[key] for key in keys]
 
     @staticmethod
     def _alias_to_args(alias, args):
@@ -226,11 +278,10 @@ class LibraryCache(object):
         return kws
 
     def _get_default_libraries(self):
-        default_libs = {}
-        for libsetting in self._settings['auto imports'] + ['BuiltIn']:
-            name, args = self._get_name_and_args(libsetting)
-            default_libs[name] = self._get_library(name, args)
-        return default_libs
+        libraries = [self._get_name_and_args(libsetting)
+                     for libsetting in self._settings['auto imports'] + ['BuiltIn']]
+        keywords = self._get_libraries(libraries)
+        return {name: kws for (name, _), kws in zip(libraries, keywords)}
 
     def get_user_libraries(self):
         """ Obtain the libraries defined in settings.cfg to allow showing in completion lists """
@@ -277,3 +328,61 @@ class ExpiringCache(object):
         except KeyError:
             path = normpath(os.path.join(os.path.dirname(source), name))
             return self._resource_files[path]
+
+
+class KeywordIndex(object):
+    """Keywords of datafiles, kept until the data they were collected from changes.
+
+    Each entry is keyed by the datafile source and remembers the sources of
+    the resources it imports (transitively) and the names of the libraries
+    it uses, so that a change in any of those drops only the entries that
+    depend on it.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._dependants = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source):
+        values = self._entries.get(source)
+        if values is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return values
+
+    def put(self, source, values, resources=(), libraries=()):
+        self._entries[source] = values
+        for dependency in chain([self._resource_key(source)],
+                                (self._resource_key(r) for r in resources),
+                                (self._library_key(lib) for lib in libraries)):
+            self._dependants.setdefault(dependency, set()).add(source)
+
+    def invalidate(self, source):
+        self._invalidate(self._resource_key(source))
+
+    def invalidate_library(self, name):
+        self._invalidate(self._library_key(name))
+
+    def _invalidate(self, dependency):
+        for source in self._dependants.pop(dependency, ()):
+            self._entries.pop(source, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._dependants.clear()
+
+    @property
+    def statistics(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries)}
+
+    @staticmethod
+    def _resource_key(source):
+        return 'resource', source
+
+    @staticmethod
+    def _library_key(name):
+        return 'library', name
@@ -14,6 +14,7 @@
 #  limitations under the License.
 
 from robotide.lib.robot.running.arguments.embedded import EmbeddedArgumentParser
+from robotide.lib.robot.variables import VariableIterator
 
 
 class EmbeddedArgsHandler(object):
@@ -28,3 +29,54 @@ class EmbeddedArgsHandler(object):
             self.longname_regexp, _ = EmbeddedArgumentParser().parse(keyword.longname)
         if not self.embedded_args:
             raise TypeError('Must have embedded arguments')
+
+
+class EmbeddedKeywordMatcher(object):
+    """Finds the keyword whose embedded arguments template matches a name.
+
+    Templates are indexed by the literal text before their first and after
+    their last embedded argument, so a lookup only runs the regular
+    expressions of the few templates that can match the name at all.
+    """
+    _key_length = 3
+
+    def __init__(self):
+        self._keywords = {}
+        self._index = {}
+
+    def add(self, regexp, template, keyword):
+        if regexp is None:
+            return
+        if regexp in self._keywords:
+            self._keywords[regexp] = keyword
+            return
+        prefix, suffix = self._literals(template)
+        self._keywords[regexp] = keyword
+        self._index.setdefault(prefix[:self._key_length], []).append(
+            (len(self._keywords), regexp, prefix, suffix))
+
+    @staticmethod
+    def _literals(template):
+        prefix = suffix = ''
+        for index, (before, _, after) in enumerate(VariableIterator(template, identifiers='$')):
+            if index == 0:
+                prefix = before
+            suffix = after
+        return prefix.lower(), suffix.lower()
+
+    def match(self, *names):
+        names = [name for name in names if name]
+        for regexp in self._candidates(names):
+            if any(regexp.match(name) for name in names):
+                return self._keywords[regexp]
+        return None
+
+    def _candidates(self, names):
+        candidates = set()
+        for name in names:
+            lowered = name.lower()
+            for length in range(min(len(lowered), self._key_length) + 1):
+                for position, regexp, prefix, suffix in self._index.get(lowered[:length], ()):
+                    if lowered.startswith(prefix) and lowered.endswith(suffix):
+                        candidates.add((position, regexp))
+        return [regexp for _, regexp in sorted(candidates, key=lambda item: item[0])]
@@ -33,6 +33,13 @@ class LocalMacroNamespace(object):
         # print(f"DEBUG: local_namespace.py LocalMacroNamespace get_suggestions ENTER start={start}")
         return self.namespace.get_suggestions_for(self._controller, start)
 
+    def get_ranked_suggestions(self, start, limit=50, usage=None):
+        return self.namespace.get_ranked_suggestions_for(self._controller, start, limit, usage,
+                                                         self._local_variables())
+
+    def _local_variables(self):
+        return []
+
     def has_name(self, value):
         for sug in self.namespace.get_suggestions_for(self._controller, value):
             if sug.name == value:
@@ -81,6 +88,14 @@ class LocalRowNamespace(LocalMacroNamespace):
                                                          local_variables))
         return suggestions
 
+    def _local_variables(self):
+        assignments = set()
+        for row, step in enumerate(self._controller.steps):
+            if self._row == row:
+                break
+            assignments.update(val.replace('=', '').strip() for val in step.assignments)
+        return [LocalVariableInfo(name) for name in assignments]
+
     @staticmethod
     def _could_be_variable(start):
         return len(start) == 0 or start[0] in ['$', '@', '&']
@@ -23,13 +23,20 @@ from multiprocessing import shared_memory
 from robotide.lib.compat.parsing.language import Language
 
 from .. import robotapi, utils
-from ..publish import PUBLISHER, RideSettingsChanged, RideLogMessage
+from ..publish import (PUBLISHER, RideSettingsChanged, RideLogMessage, RideImportSetting, RideUserKeyword,
+                       RideItemNameChanged, RideItemSettingsChanged, RideVariableAdded, RideVariableRemoved,
+                       RideVariableUpdated, RideDataFileSet, RideFileNameChanged, RideDataFileRemoved,
+                       RideInitFileRemoved, RideOpenSuite, RideOpenResource, RideNewProject)
 from ..robotapi import VariableFileSetter
 from ..spec.iteminfo import (TestCaseUserKeywordInfo, ResourceUserKeywordInfo, VariableInfo, UserKeywordInfo,
-                             ArgumentInfo, LibraryKeywordInfo, BlockKeywordInfo)
-from .cache import LibraryCache, ExpiringCache
+                             ArgumentInfo, LibraryKeywordInfo, BlockKeywordInfo, LocalVariableInfo)
+from .cache import LibraryCache, KeywordIndex
 from .resourcefactory import ResourceFactory
-from .embeddedargs import EmbeddedArgsHandler
+from .embeddedargs import EmbeddedArgsHandler, EmbeddedKeywordMatcher
+from .prefixindex import PrefixIndex
+from .ranking import RankedIndex, RecentlyUsed, top, OTHER, LIBRARY, RESOURCE, SAME_FILE
+
+_DECORATION = '$&@%{[()]}='
 
 
 class Namespace(object):
@@ -40,12 +47,25 @@ class Namespace(object):
         self._library_manager = None
         self._content_assist_hooks = []
         self._update_listeners = set()
+        # Changes whenever the keywords or variables found through the namespace may change
+        self.generation = 0
         self._init_caches()
         self._set_pythonpath()
         self._words_cache = set()
+        self._words_index = None
+        self._ranked_words_index = None
+        self._ranked_variables_index = None, None, None
+        self._recently_used = RecentlyUsed()
         PUBLISHER.subscribe(self._setting_changed, RideSettingsChanged)
+        for message in (RideImportSetting, RideUserKeyword, RideItemNameChanged, RideItemSettingsChanged,
+                        RideVariableAdded, RideVariableRemoved, RideVariableUpdated, RideDataFileSet,
+                        RideFileNameChanged, RideDataFileRemoved, RideInitFileRemoved):
+            PUBLISHER.subscribe(self._data_changed, message)
+        for message in (RideOpenSuite, RideOpenResource, RideNewProject):
+            PUBLISHER.subscribe(self._project_changed, message)
 
     def _init_caches(self):
+        self.generation += 1
         self._lib_cache = LibraryCache(
             self.settings, self.update, self._library_manager)
         self._resource_factory = ResourceFactory(self.settings)
@@ -80,8 +100,31 @@ class Namespace(object):
                     sys.path.remove(p)
             self._set_pythonpath()
 
+    def _data_changed(self, message):
+        self.generation += 1
+        sources = [self._source_of(getattr(message, name, None)) for name in ('datafile', 'item')]
+        sources = [source for source in sources if source]
+        if not sources:
+            self._retriever.expire_keywords()
+            return
+        if getattr(message, 'old_filename', None):
+            sources.append(message.old_filename)
+        for source in sources:
+            self._retriever.datafile_changed(source)
+
+    def _project_changed(self, message):
+        _ = message
+        self.generation += 1
+        self._retriever.expire_keywords()
+
+    @staticmethod
+    def _source_of(item):
+        datafile = getattr(item, 'datafile', None) or item
+        return getattr(datafile, 'source', None)
+
     def update_exec_dir_global_var(self, exec_dir):
         _VariableStash.global_variables['${EXECDIR}'] = exec_dir
+        self.generation += 1
         self._context_factory.reload_context_global_vars()
 
     def update_cur_dir_global_var(self, cur_dir):
@@ -93,22 +136,41 @@ class Namespace(object):
         else:
             os.environ['RIDE_DOC_PATH'] = f"{cur_dir}, {parent_cur_dir}"
         _VariableStash.global_variables['${CURDIR}'] = cur_dir
+        self.generation += 1
         self._context_factory.reload_context_global_vars()
 
     def set_library_manager(self, library_manager):
+        self.generation += 1
         self._library_manager = library_manager
         self._lib_cache.set_library_manager(library_manager)
 
-    def update(self, *args):
+    def update(self, *args, datafile=None, library=None):
+        """Refreshes the namespace after its data has changed.
+
+        When ``datafile`` or ``library`` is given, only keywords depending on
+        it are collected again, otherwise all caches are expired.
+        """
         _ = args
-        self._retriever.expire_cache()
+        self.generation += 1
+        if datafile is not None:
+            self._retriever.datafile_changed(datafile.source)
+        elif library is not None:
+            self._retriever.library_changed(library)
+        else:
+            self._retriever.expire_cache()
         self._context_factory = _RetrieverContextFactory()
         for listener in self._update_listeners:
             listener()
 
+    def keyword_cache_statistics(self):
+        return self._retriever.keyword_cache.statistics
+
     def resource_filename_changed(self, old_name, new_name):
         self._resource_factory.resource_filename_changed(old_name, new_name)
 
+    def resource_changed(self, path):
+        self._resource_factory.resource_changed(path)
+
     def reset_resource_and_library_cache(self):
         self._init_caches()
 
@@ -145,20 +207,64 @@ class Namespace(object):
         sugs.update(self._get_suggestions_from_hooks(datafile, start))
         if self._blank(start) or not self._looks_like_variable(start):
             sugs.update(self._variable_suggestions(controller, start, ctx))
-            sugs.update(self._keyword_suggestions(datafile, start, ctx))
+            sugs.update(self._keyword_suggestions(datafile, start))
         else:
             sugs.update(self._variable_suggestions(controller, start, ctx))
         # print(f"DEBUG: namespace.py Namespace get_suggestions_for BEFORE CONTENT start={start} {sugs=}")
         if not self._looks_like_variable(start):  # Search in content
-            for v in ['${', '@{', '&{', '%{', '$']:
-                sugs.update(self._content_suggestions(f'{v}{utils.normalize(start)}'))
+            sugs.update(self._content_suggestions([f'{v}{utils.normalize(start)}'
+                                                   for v in ['${', '@{', '&{', '%{', '$']]))
         else:
-            sugs.update(self._content_suggestions(f'{utils.normalize(start, suffixless=True)}'))
+            sugs.update(self._content_suggestions([f'{utils.normalize(start, suffixless=True)}']))
         # print(f"DEBUG: namespace.py Namespace get_suggestions_for FROM CONTENT start={start} {sugs=}")
         sugs_list = list(sugs)
         sugs_list.sort()
         return sugs_list
 
+    def get_ranked_suggestions_for(self, controller, start, limit=50, usage=None, local_variables=()):
+        """Returns at most ``limit`` suggestions fuzzy matching ``start``, best first.
+
+        ``usage`` is an optional mapping from normalized keyword names to
+        the number of their uses in the project.
+        """
+        if not controller:
+            return []
+        datafile = controller.datafile
+        ctx = self._context_factory.ctx_for_controller(controller)
+        while start and start[-1] in [']', '}', '=', ',']:
+            start = start[:-1]
+        keywords = self._retriever.get_keywords_cached(datafile, self._context_factory)
+        others = RankedIndex(chain(self._get_suggestions_from_hooks(datafile, start), local_variables),
+                             locality=self._locality)
+        indexes = [keywords.ranked_index(), self._ranked_variables(controller, ctx), self._ranked_words(), others]
+        return [item for _, item in top(chain.from_iterable(index.scored(start, usage, self._recently_used, limit)
+                                                            for index in indexes), limit)]
+
+    def _ranked_variables(self, controller, ctx):
+        # Kept until the namespace changes or suggestions are asked for another controller
+        cached_controller, generation, index = self._ranked_variables_index
+        if cached_controller is not controller or generation != self.generation:
+            index = RankedIndex(self._variable_suggestions(controller, '', ctx), locality=self._locality)
+            self._ranked_variables_index = controller, self.generation, index
+        return index
+
+    def _ranked_words(self):
+        if self._ranked_words_index is None:
+            self._ranked_words_index = RankedIndex(self._words_cache, locality=self._locality)
+        return self._ranked_words_index
+
+    def note_suggestion_used(self, name):
+        """Records an accepted suggestion to rank it higher in the next ranked suggestions."""
+        self._recently_used.add(name)
+
+    @staticmethod
+    def _locality(item):
+        if isinstance(item, (ArgumentInfo, LocalVariableInfo)):
+            return SAME_FILE
+        if isinstance(item, VariableInfo):
+            return RESOURCE
+        return OTHER
+
     def _get_suggestions_from_hooks(self, datafile, start):
         sugs = []
         for hook in self._content_assist_hooks:
@@ -185,36 +291,19 @@ class Namespace(object):
         sugs = (v for v in variables if v.name_matches(start))
         return sugs
 
-    def _content_suggestions(self, start):
-        sugs = set()
-        for v in self._words_cache:
-            if isinstance(v, (TestCaseUserKeywordInfo, ResourceUserKeywordInfo, UserKeywordInfo,
-                              LibraryKeywordInfo, BlockKeywordInfo)):
-                if v.name.lower().startswith(start.lower()):
-                    sugs.add(v.name)
-            elif isinstance(v, (VariableInfo, ArgumentInfo)):
-                if v.name_matches(start):
-                    # print(f"DEBUG: namespace.py Namespace _content_suggestions SUGGESTION from VARIABLE {v.name=}")
-                    sugs.add(v.name)
-            elif (v.lower().startswith(start.lower()) or v.strip('$&@%{[()]}=').lower()
-                    .startswith(start.strip('$&@%{[()]}=').lower())):
-                # print(f"DEBUG: namespace.py Namespace _content_suggestions SUGGESTION from STRING {v=}"
-                #       f"\n v.lower().startswith(start.lower() ={v.lower().startswith(start.lower())}")
-                sugs.add(v)
-        return sugs
+    def _content_suggestions(self, starts):
+        if self._words_index is None:
+            self._words_index = _WordsIndex(self._words_cache)
+        return self._words_index.find(starts)
 
     @staticmethod
     def _add_kw_arg_vars(controller, variables):
         for name, value in controller.get_local_variables().items():
             variables.set_argument(name, value)
 
-    def _keyword_suggestions(self, datafile, start, ctx):
-        start_normalized = utils.normalize(start)
-        all_kws = chain(self._get_default_keywords(),
-                        self._retriever.get_keywords_from(datafile, ctx))
-        return (sug for sug in all_kws
-                if sug.name_begins_with(start_normalized) or
-                sug.longname_begins_with(start_normalized))
+    def _keyword_suggestions(self, datafile, start):
+        keywords = self._retriever.get_keywords_cached(datafile, self._context_factory)
+        return keywords.begins_with(utils.normalize(start))
 
     def get_resources(self, datafile, language=None):
         return self._retriever.get_resources_from(datafile, language=language)
@@ -277,10 +366,45 @@ class Namespace(object):
         return kw.details if kw else None
 
     def update_words_cache(self, words_list:list, reset=False):
+        words = set(words_list)
+        if not reset and words <= self._words_cache:
+            # The indexes of the words are kept while no new words are added
+            return
+        self._words_index = None
+        self._ranked_words_index = None
         if reset:
             self._words_cache.clear()
             return
-        self._words_cache.update(set(words_list))
+        self._words_cache.update(words)
+
+
+class _WordsIndex(object):
+    """Prefix indexes of the words and items collected from the edited content.
+
+    Finds the same suggestions as checking every word with the prefix: keyword
+    names and words by their lower case name, words also without the variable
+    decoration, and variables by their normalized undecorated name.
+    """
+
+    def __init__(self, words):
+        keywords, variables, strings = [], [], []
+        for v in words:
+            if isinstance(v, (TestCaseUserKeywordInfo, ResourceUserKeywordInfo, UserKeywordInfo,
+                              LibraryKeywordInfo, BlockKeywordInfo)):
+                keywords.append(v)
+            elif isinstance(v, (VariableInfo, ArgumentInfo)):
+                variables.append(v)
+            else:
+                strings.append(v)
+        self._names = PrefixIndex(keywords + strings, lambda v: [getattr(v, 'name', v).lower()])
+        self._undecorated = PrefixIndex(strings, lambda v: [v.strip(_DECORATION).lower()])
+        self._variables = PrefixIndex(variables, lambda v: [utils.normalize(v.name[2:-1])])
+
+    def find(self, starts):
+        found = chain(self._names.find([start.lower() for start in starts]),
+                      self._undecorated.find([start.strip(_DECORATION).lower() for start in starts]),
+                      self._variables.find([utils.normalize(VariableInfo.undecorate(start)) for start in starts]))
+        return set(getattr(v, 'name', v) for v in found)
 
 
 class _RetrieverContextFactory(object):
@@ -310,6 +434,7 @@ class RetrieverContext(object):
     def __init__(self):
         self.vars = _VariableStash()
         self.parsed = set()
+        self.libraries = set()
 
     def set_variables_from_datafile_variable_table(self, datafile):
         self.vars.set_from_variable_table(datafile.variable_table)
@@ -463,7 +588,7 @@ class DatafileRetriever(object):
         self._namespace = namespace
         self._lib_cache = lib_cache
         self._resource_factory = resource_factory
-        self.keyword_cache = ExpiringCache()
+        self.keyword_cache = KeywordIndex()
         self._default_kws = None
 
     def get_all_cached_library_names(self):
@@ -476,7 +601,17 @@ class DatafileRetriever(object):
         return self._default_kws
 
     def expire_cache(self):
-        self.keyword_cache = ExpiringCache()
+        self.keyword_cache.clear()
+        self._lib_cache.expire()
+
+    def expire_keywords(self):
+        self.keyword_cache.clear()
+
+    def datafile_changed(self, source):
+        self.keyword_cache.invalidate(source)
+
+    def library_changed(self, name):
+        self.keyword_cache.invalidate_library(name)
         self._lib_cache.expire()
 
     def get_keywords_from_several(self, datafiles):
@@ -509,8 +644,13 @@ class DatafileRetriever(object):
         return [TestCaseUserKeywordInfo(kw) for kw in datafile.keywords if not kw.name.startswith('#')]
 
     def _get_imported_library_keywords(self, datafile, ctx):
-        return self._collect_kws_from_imports(datafile, robotapi.Library,
-                                              self._lib_kw_getter, ctx)
+        # All library imports of the datafile are fetched with one database query
+        libraries = [self._library_import(imp, ctx)
+                     for imp in self._collect_import_of_type(datafile, robotapi.Library)]
+        kws = []
+        for keywords in self._lib_cache.get_keywords_of_libraries(libraries):
+            kws.extend(keywords)
+        return kws
 
     def _collect_kws_from_imports(self, datafile, instance_type, getter, ctx):
         kws = []
@@ -519,13 +659,17 @@ class DatafileRetriever(object):
         return kws
 
     def _lib_kw_getter(self, imp, ctx):
+        return self._lib_cache.get_library_keywords(*self._library_import(imp, ctx))
+
+    def _library_import(self, imp, ctx):
         # update cur dir for recursive import
         self._namespace.update_cur_dir_global_var(imp.directory)
         name = ctx.replace_variables(imp.name)
         name = self._convert_to_absolute_path(name, imp)
         args = [ctx.replace_variables(a) for a in imp.args]
         alias = ctx.replace_variables(imp.alias) if imp.alias else None
-        return self._lib_cache.get_library_keywords(name, args, alias)
+        ctx.libraries.add(name)
+        return name, args, alias
 
     @staticmethod
     def _convert_to_absolute_path(name, import_):
@@ -587,10 +731,13 @@ class DatafileRetriever(object):
     def get_keywords_cached(self, datafile, context_factory, caseless=False):
         values = self.keyword_cache.get(datafile.source)
         if not values:
-            words = self.get_keywords_from(datafile, context_factory.ctx_for_datafile(datafile))
+            ctx = context_factory.ctx_for_datafile(datafile)
+            words = self.get_keywords_from(datafile, ctx)
             words.extend(self.default_kws)
             values = _Keywords(words, caseless=caseless)
-            self.keyword_cache.put(datafile.source, values)
+            self.keyword_cache.put(datafile.source, values,
+                                   resources=[res.source for res in ctx.parsed],
+                                   libraries=ctx.libraries)
         # print(f"DEBUG: namespace.py DatafileRetrieve get_keywords_cached returning cached keywords values=={values}"
         #       f"\ndatafile={datafile.source}")
         # print(f"DEBUG: namespace.py DatafileRetrieve get_keywords_cached datafile = {datafile.source}")
@@ -661,8 +808,32 @@ class _Keywords(object):
         self.normalized_bdd_prefixes = utils.normalize_pipe_list(list(self.new_lang.bdd_prefixes), spaces=False)
         self.gherkin_prefix = re.compile(fr'^({self.normalized_bdd_prefixes}) (.*)', re.IGNORECASE)
         self.keywords = robotapi.NormalizedDict(ignore=['_'], caseless=caseless)
-        self.embedded_keywords = {}
+        self.embedded_keywords = EmbeddedKeywordMatcher()
         self._add_keywords(keywords)
+        self._all_keywords = keywords
+        self._prefix_index = None
+        self._ranked_index = None
+
+    def begins_with(self, prefix):
+        """Returns the keywords whose normalized name or long name starts with ``prefix``."""
+        if self._prefix_index is None:
+            self._prefix_index = PrefixIndex(
+                set(self._all_keywords), lambda kw: {utils.normalize(kw.name), utils.normalize(kw.longname)})
+        return self._prefix_index.find([prefix])
+
+    def ranked_index(self):
+        """Returns the keywords in a :class:`RankedIndex` for ranked suggestions."""
+        if self._ranked_index is None:
+            self._ranked_index = RankedIndex(set(self._all_keywords), locality=self._locality)
+        return self._ranked_index
+
+    @staticmethod
+    def _locality(keyword):
+        if isinstance(keyword, TestCaseUserKeywordInfo):
+            return SAME_FILE
+        if isinstance(keyword, UserKeywordInfo):
+            return RESOURCE
+        return LIBRARY
 
     def _add_keywords(self, keywords):
         for kw in keywords:
@@ -682,9 +853,9 @@ class _Keywords(object):
             return
         try:
             handler = EmbeddedArgsHandler(kw)
-            self.embedded_keywords[handler.name_regexp] = kw
+            self.embedded_keywords.add(handler.name_regexp, kw.name, kw)
             if hasattr(handler, 'longname_regexp'):
-                self.embedded_keywords[handler.longname_regexp] = kw
+                self.embedded_keywords.add(handler.longname_regexp, kw.longname, kw)
             # print(f"DEBUG: namespace.py _add_embedded add kw={kw.name} longname={kw.longname}\n"
             #       f"handler.name_regexp={handler.name_regexp}")
         except TypeError:
@@ -702,17 +873,7 @@ class _Keywords(object):
         bdd_name = self._get_bdd_name(kw_name)
         if bdd_name and bdd_name in self.keywords:
             return self.keywords[bdd_name]
-        # print(f"DEBUG: namespace.py _Keywords get embedded kws {self.embedded_keywords}"
-        #       f"\nseaching keyword={kw_name}")
-        for regexp in self.embedded_keywords:
-            try:
-                if regexp.match(kw_name) or (bdd_name and regexp.match(bdd_name)):
-                    # print(f"DEBUG: namespace.py _Keywords get keywords in REGEX FOUND {kw_name}"
-                    #       f" source={self.embedded_keywords[regexp].source}")
-                    return self.embedded_keywords[regexp]
-            except AttributeError:
-                pass
-        return None
+        return self.embedded_keywords.match(kw_name, bdd_name)
 
     def _get_bdd_name(self, kw_name):
         match = self.gherkin_prefix.match(kw_name)
@@ -0,0 +1,48 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from bisect import bisect_left
+
+
+class PrefixIndex(object):
+    """Items in a sorted array of their keys, found by key prefix with bisect.
+
+    ``keys`` is a function returning the keys of an item. An item with
+    several matching keys is returned only once.
+    """
+
+    def __init__(self, items, keys):
+        self._items = list(items)
+        entries = sorted((key, position) for position, item in enumerate(self._items)
+                         for key in keys(item))
+        self._keys = [key for key, _ in entries]
+        self._positions = [position for _, position in entries]
+
+    def __len__(self):
+        return len(self._items)
+
+    def find(self, prefixes):
+        """Returns the items with a key starting with any of ``prefixes``, in key order."""
+        found = []
+        seen = set()
+        for prefix in sorted(set(prefixes)):
+            index = bisect_left(self._keys, prefix)
+            while index < len(self._keys) and self._keys[index].startswith(prefix):
+                position = self._positions[index]
+                if position not in seen:
+                    seen.add(position)
+                    found.append(self._items[position])
+                index += 1
+        return found
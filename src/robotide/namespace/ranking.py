@@ -0,0 +1,263 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import heapq
+from collections import OrderedDict
+from math import log2
+from operator import itemgetter
+
+from .. import utils
+
+# Locality of a candidate, from farthest to nearest the edited file
+OTHER = 0
+LIBRARY = 1
+RESOURCE = 2
+SAME_FILE = 3
+
+_IGNORED = ' _$&@%{}[]()='
+_SEPARATORS = ' _.-'
+_MAX_USAGE_BONUS = 5.0
+_MAX_RECENT_BONUS = 5.0
+_MAX_BONUS = _MAX_USAGE_BONUS + _MAX_RECENT_BONUS
+# Number of queries whose matches are kept by a RankedIndex
+_KEPT_QUERIES = 32
+# Match states before matching any characters
+_UNMATCHED = (True, 0, -2, 0.0)
+_UNPREFERRED = (False, 0, -2, 0.0)
+
+
+class RecentlyUsed(object):
+    """Names of the latest accepted completions, newest last."""
+
+    def __init__(self, size=50):
+        self._size = size
+        self._names = OrderedDict()
+
+    def add(self, name):
+        self._names.pop(name, None)
+        self._names[name] = True
+        if len(self._names) > self._size:
+            self._names.popitem(last=False)
+
+    def score(self, name):
+        """Returns 1.0 for the newest name, decreasing to 0 for unused names."""
+        return self.scores().get(name, 0.0)
+
+    def scores(self):
+        """Returns the scores of the recently used names by name."""
+        return {name: 1.0 - age / self._size for age, name in enumerate(reversed(self._names))}
+
+
+class RankedIndex(object):
+    """Completion candidates ranked by a fuzzy match of their names.
+
+    The query matches a name when its characters are found in the same
+    order, ignoring case, spaces, underscores and variable decoration, so
+    ``sbe`` matches ``Should Be Equal``. Matches at word starts (also camel
+    case words), consecutive matches and prefix matches score higher. The
+    locality of the candidate, its usage count and recent use are added to
+    the score.
+
+    Everything not depending on the query, and the matches of all one
+    character queries, are computed when the index is created. The matches
+    of the latest longer queries are kept sorted, best first, and a query
+    extending a kept one only continues matching the candidates that
+    matched it, so typing a name does not scan the whole index again.
+    Candidates without all the query characters are skipped by comparing
+    character bit masks.
+    """
+
+    def __init__(self, items, locality=None, name=None):
+        self._items = list(items)
+        name = name or _name
+        self._entries = [_entry(name(item), locality(item) if locality else OTHER)
+                         for item in self._items]
+        self._masks = [_mask(entry[2]) for entry in self._entries]
+        self._firsts = [_firsts(entry[2], entry[3]) for entry in self._entries]
+        self._by_first = self._first_character_matches()
+        self._by_name = {}
+        self._by_normalized = {}
+        for index, entry in enumerate(self._entries):
+            self._by_name.setdefault(entry[0], []).append(index)
+            self._by_normalized.setdefault(entry[1], []).append(index)
+        self._matches = OrderedDict()
+        self._usage_bonus = None, {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def find(self, query, limit=50, usage=None, recent=None):
+        """Returns at most ``limit`` best matching items, best first."""
+        return [item for _, item in top(self.scored(query, usage, recent, limit), limit)]
+
+    def scored(self, query, usage=None, recent=None, limit=None):
+        """Generates ``(score, item)`` pairs of the items matching ``query``.
+
+        With ``limit``, items that cannot be among the ``limit`` best ones
+        are left out.
+        """
+        bonus = self._bonus(usage, recent)
+        threshold = None
+        for count, (score, index, _) in enumerate(self._matches_of(_compact(query))):
+            if threshold is not None and score < threshold:
+                break
+            if count + 1 == limit:
+                threshold = score - _MAX_BONUS
+            yield score + bonus.get(index, 0.0), self._items[index]
+
+    def _first_character_matches(self):
+        # The matches of all empty and one character queries, best first
+        by_first = {'': [(static, index, _UNMATCHED) for index, (_, _, _, _, _, static)
+                         in enumerate(self._entries)]}
+        for index, ((_, _, compact, starts, penalty, static), firsts) in enumerate(zip(self._entries, self._firsts)):
+            for c, position in firsts.items():
+                score = (4.0 if position in starts else 1.0) + static - penalty
+                if compact[0] == c:
+                    score += 10.0 if len(compact) > 1 else 20.0
+                by_first.setdefault(c, []).append((score, index, None))
+        for matches in by_first.values():
+            matches.sort(key=itemgetter(0), reverse=True)
+        return by_first
+
+    def _matches_of(self, key):
+        if len(key) < 2:
+            return self._by_first.get(key, [])
+        if key in self._matches:
+            self._matches.move_to_end(key)
+            return self._matches[key]
+        previous = max((k for k in self._matches if key.startswith(k)), key=len, default=key[0])
+        suffix = key[len(previous):]
+        mask = _mask(key)
+        masks = self._masks
+        entries = self._entries
+        matches = []
+        first = key[0]
+        firsts = self._firsts
+        for _, index, state in self._matches_of(previous):
+            if masks[index] & mask == mask:
+                _, _, compact, starts, penalty, static = entries[index]
+                if state is None:
+                    position = firsts[index][first]
+                    state = True, position + 1, position, 4.0 if position in starts else 1.0
+                state = _extend(state, suffix, key, compact, starts)
+                if state is not None:
+                    score = state[3] + static - penalty
+                    if compact.startswith(key):
+                        score += 10.0 if len(compact) > len(key) else 20.0
+                    matches.append((score, index, state))
+        matches.sort(key=itemgetter(0), reverse=True)
+        self._matches[key] = matches
+        if len(self._matches) > _KEPT_QUERIES:
+            self._matches.popitem(last=False)
+        return matches
+
+    def _bonus(self, usage, recent):
+        if usage is not self._usage_bonus[0]:
+            bonus = {}
+            for normalized, count in (usage or {}).items():
+                for index in self._by_normalized.get(normalized, ()):
+                    bonus[index] = min(log2(1 + count), _MAX_USAGE_BONUS)
+            self._usage_bonus = usage, bonus
+        bonus = self._usage_bonus[1]
+        recent_scores = recent.scores() if recent else None
+        if recent_scores:
+            bonus = dict(bonus)
+            for name, score in recent_scores.items():
+                for index in self._by_name.get(name, ()):
+                    bonus[index] = bonus.get(index, 0.0) + _MAX_RECENT_BONUS * score
+        return bonus
+
+
+def _entry(name, locality):
+    compact, starts = _words(name)
+    penalty = min(len(compact) / 100.0, 1.0)
+    return name, utils.normalize(name, ignore=('_',)), compact, starts, penalty, 2.0 * locality
+
+
+def top(scored, limit=50):
+    """Returns the ``limit`` highest scored ``(score, item)`` pairs, best first."""
+    return heapq.nlargest(limit, scored, key=itemgetter(0))
+
+
+def _name(item):
+    return getattr(item, 'name', item)
+
+
+def _compact(text):
+    return ''.join(c for c in text.lower() if c not in _IGNORED)
+
+
+def _mask(text):
+    mask = 0
+    for c in text:
+        mask |= 1 << (ord(c) & 63)
+    return mask
+
+
+def _words(name):
+    """Returns the compacted name and the positions of its word starts in it."""
+    compact = []
+    starts = []
+    previous = ' '
+    for c in name:
+        if c in _IGNORED:
+            previous = ' '
+            continue
+        if previous in _SEPARATORS or (c.isupper() and previous.islower()):
+            starts.append(len(compact))
+        compact.append(c.lower())
+        previous = c
+    return ''.join(compact), tuple(starts)
+
+
+def _firsts(compact, starts):
+    """Returns the positions where each character is matched as the first one of a query."""
+    firsts = {}
+    for position, c in enumerate(compact):
+        if c not in firsts or (position in starts and firsts[c] not in starts):
+            firsts[c] = position
+    return firsts
+
+
+def _extend(state, suffix, query, compact, starts):
+    """Matches the characters of ``suffix`` after the ones matched in ``state``.
+
+    ``state`` tells whether word starts are preferred, where to continue
+    searching, the position of the previous matched character and the score
+    so far. If the characters are not found when preferring word starts, the
+    whole ``query`` is matched again without preferring them. Returns the new
+    state or ``None`` when ``query`` does not match.
+    """
+    prefer_starts, index, previous, score = state
+    for c in suffix:
+        found = compact.find(c, index)
+        if found == -1:
+            if prefer_starts:
+                return _extend(_UNPREFERRED, query, query, compact, starts)
+            return None
+        if prefer_starts and found not in starts and found != previous + 1:
+            start = found
+            while start != -1 and start not in starts:
+                start = compact.find(c, start + 1)
+            if start != -1:
+                found = start
+        score += 1.0
+        if found in starts:
+            score += 3.0
+        if found == previous + 1:
+            score += 2.0
+        previous = found
+        index = found + 1
+    return prefer_starts, index, previous, score
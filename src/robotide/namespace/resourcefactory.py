@@ -67,6 +67,9 @@ class ResourceFactory(object):
                                                                    report_status=True)
         del self.cache[self._normalize(old_name)]
 
+    def resource_changed(self, path):
+        self.cache.pop(self._normalize(path), None)
+
     def _get_python_path(self, name):
         if name not in self.python_path_cache:
             path_from_pythonpath = utils.find_from_pythonpath(name)
@@ -52,6 +52,52 @@ class SuggestionSource(object):
             # print(f"DEBUG: suggesters.py SuggestionSource get_suggestions IN LOOP initial ={initial} len sugs={len(sugs)}")
         return list(sugs)
 
+    def get_ranked_suggestions(self, value, row=None, limit=50):
+        """Returns at most ``limit`` suggestions fuzzy matching ``value``, best first."""
+        namespace = self._local_namespace(row)
+        if namespace:
+            return namespace.get_ranked_suggestions(value, limit, self._usage_counts())
+        if self._plugin:
+            return list(self._plugin.content_assist_values(value))[:limit]
+        return []
+
+    def note_used(self, name):
+        """Tells the namespace that a suggestion was accepted."""
+        namespace = self._local_namespace()
+        if namespace:
+            namespace.namespace.note_suggestion_used(name)
+
+    def _local_namespace(self, row=None):
+        if not self._controller:
+            return None
+        try:
+            return self._controller.get_local_namespace_for_row(row)
+        except AttributeError:
+            try:
+                return self._controller.get_local_namespace()
+            except AttributeError:  # For example TestCaseFileController
+                return None
+
+    def update_usage_counts(self):
+        """Counts the keyword uses ranking the suggestions.
+
+        Counting visits every datafile, so it is done outside the keystrokes
+        showing suggestions, which use the counts computed last.
+        """
+        project = self._project()
+        if project:
+            project.keyword_usage_counts()
+
+    def _usage_counts(self):
+        project = self._project()
+        return project.keyword_usage_counts(compute=False) if project else None
+
+    def _project(self):
+        try:
+            return self._controller.datafile_controller.project
+        except AttributeError:
+            return None
+
     def update_from_local(self, words: list, language:str):
         from ..lib.compat.parsing.languages import Language
         if isinstance(language, list):
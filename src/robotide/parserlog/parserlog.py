@@ -15,7 +15,6 @@
 import atexit
 import builtins
 import glob
-import io
 import os
 import sys
 import tempfile
@@ -25,7 +24,7 @@ import wx
 
 from .. import context
 from .. import widgets
-from ..log import LogWindow, message_to_string
+from ..log import LogModel, LogWindow, RotatingLogFile, message_to_string
 from ..pluginapi import Plugin
 from ..action import ActionInfo
 from ..publish.messages import RideParserLogMessage
@@ -43,33 +42,26 @@ class ParserLogPlugin(Plugin):
             'log_to_file': True
         })
         self.title = _('Parser Log')
-        self._log = []
+        self._log = LogModel()
         self._panel = None
         self._path = os.path.join(
             tempfile.gettempdir(), '{}-ride_parser.log'.format(uuid.uuid4()))
-        self._outfile = None
+        self._logfile = RotatingLogFile(self._path)
         self._remove_old_log_files()
         atexit.register(self._close)
 
     def _close(self):
-        if self._outfile is not None:
-            self._outfile.close()
+        self._logfile.close()
 
     @staticmethod
     def _remove_old_log_files():
         for fname in glob.glob(
-                os.path.join(tempfile.gettempdir(), '*-ride_parser.log')):
+                os.path.join(tempfile.gettempdir(), '*-ride_parser.log*')):
             try:
                 os.remove(fname)
             except (OSError, IOError) as e:
                 sys.stderr.write(f"Removing old *-ride_parser.log files failed with: {repr(e)}\n")
 
-    @property
-    def _logfile(self):
-        if self._outfile is None:
-            self._outfile = io.open(self._path, 'w', encoding='utf8')
-        return self._outfile
-
     def enable(self):
         self._create_menu()
         self.subscribe(self._log_message, RideParserLogMessage)
@@ -92,7 +84,6 @@ class ParserLogPlugin(Plugin):
             print("{}".format(message_to_string(message, True)))  # >> sys.stdout, _message_to_string(message)
         if self.log_to_file:
             self._logfile.write(message_to_string(message, True))
-            self._outfile.flush()
         if message.notify_user:
             font_size = 13 if context.IS_MAC else -1
             widgets.HtmlDialog(message.level, message.message,
@@ -231,6 +231,10 @@ class TextEditorPreferences(EditorPreferences):
                                                 _('Enable auto suggestions'))
         set_colors(l_auto_suggest, self.background_color, self.foreground_color)
         sizer.AddMany([l_auto_suggest, editor])
+        l_ranked, editor = pdiag.boolean_editor(self, settings, 'ranked suggestions',
+                                                _('Rank suggestions by fuzzy match and usage'))
+        set_colors(l_ranked, self.background_color, self.foreground_color)
+        sizer.AddMany([l_ranked, editor])
         return sizer
 
 
@@ -247,7 +251,7 @@ class GridEditorPreferences(EditorPreferences):
 
     def _create_grid_config_editor(self):
         settings = self._settings
-        sizer = wx.FlexGridSizer(rows=6, cols=2, vgap=10, hgap=10)
+        sizer = wx.FlexGridSizer(rows=7, cols=2, vgap=10, hgap=10)
         l_col_size = self._label_for(_('Default column size'))
         set_colors(l_col_size, self.background_color, self.foreground_color)
         sizer.Add(l_col_size)
@@ -266,6 +270,10 @@ class GridEditorPreferences(EditorPreferences):
                                                 _('Enable auto suggestions'))
         set_colors(l_auto_suggest, self.background_color, self.foreground_color)
         sizer.AddMany([l_auto_suggest, editor])
+        l_ranked, editor = pdiag.boolean_editor(self, settings, 'ranked suggestions',
+                                                _('Rank suggestions by fuzzy match and usage'))
+        set_colors(l_ranked, self.background_color, self.foreground_color)
+        sizer.AddMany([l_ranked, editor])
         return sizer
 
     def _label_for(self, name):
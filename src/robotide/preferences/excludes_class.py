@@ -14,14 +14,22 @@
 #  limitations under the License.
 
 import os
-from fnmatch import fnmatch
+import re
+from fnmatch import translate
 
 
 class Excludes(object):
+    """The excluded paths and path patterns in the ``excludes`` settings file.
+
+    ``contains`` uses a matcher built from the file, which is rebuilt only
+    when the excludes are written or the file is changed on disk.
+    """
 
     def __init__(self, directory):
         self._settings_directory = directory
         self._exclude_file_path = os.path.join(self._settings_directory, 'excludes')
+        self._matcher = None
+        self._file_stamp = None
 
     def get_excludes(self, separator='\n'):
         return separator.join(self._get_excludes())
@@ -44,6 +52,7 @@ class Excludes(object):
                 if not exclude:
                     continue
                 exclude_file.write("%s\n" % exclude)
+        self._matcher = None
         # print("DEBUG:real excluded self._get_excludes()=%s\n" % self._get_excludes())
 
     def update_excludes(self, new_excludes):
@@ -68,18 +77,22 @@ class Excludes(object):
     def contains(self, path, excludes=None):
         if not path:
             return False
-        excludes = excludes or self._get_excludes()
-        if len(excludes) < 1:
-            return False
-        path = self._normalize(path)
-        excludes = [self._normalize(e) for e in excludes]
-        # print("DEBUG: excludes contains %s path %s\n"
-        #      "any: %s\n" % (excludes[0], path, any(self._match(path, e) for e in excludes)) )
-        return any(self._match(path, e) for e in excludes)
+        matcher = _ExcludeMatcher(excludes) if excludes else self._get_matcher()
+        return matcher.match(self._normalize(path))
 
-    @staticmethod
-    def _match(path, e):
-        return fnmatch(path, e) or path.startswith(e)
+    def _get_matcher(self):
+        stamp = self._get_file_stamp()
+        if self._matcher is None or stamp is None or stamp != self._file_stamp:
+            self._matcher = _ExcludeMatcher(self._get_excludes())
+            self._file_stamp = stamp if stamp is not None else self._get_file_stamp()
+        return self._matcher
+
+    def _get_file_stamp(self):
+        try:
+            stat = os.stat(self._exclude_file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
 
     @staticmethod
     def _normalize(path):
@@ -92,3 +105,16 @@ class Excludes(object):
             if '*' in path or '?' in path or ']' in path:
                 path += '*'
         return path
+
+
+class _ExcludeMatcher(object):
+    # A path is excluded when it starts with an exclude or matches an exclude pattern
+
+    def __init__(self, excludes):
+        excludes = [e for e in (Excludes._normalize(e) for e in excludes) if e]
+        self._prefixes = tuple(excludes)
+        patterns = [translate(e) for e in excludes if any(c in e for c in '*?[')]
+        self._pattern = re.compile('|'.join(patterns)) if patterns else None
+
+    def match(self, path):
+        return path.startswith(self._prefixes) or bool(self._pattern and self._pattern.match(path))
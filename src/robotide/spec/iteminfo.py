@@ -99,11 +99,11 @@ class VariableInfo(ItemInfo):
         return os.path.basename(source) if source else ''
 
     def name_matches(self, pattern):
-        normalized = utils.normalize(self._undecorate(pattern))
+        normalized = utils.normalize(self.undecorate(pattern))
         return utils.normalize(self.name[2:-1]).startswith(normalized)
 
     @staticmethod
-    def _undecorate(pattern):
+    def undecorate(pattern):
         def get_prefix_length():
             if pattern[0] not in ['$', '@', '&']:
                 return 0
@@ -17,23 +17,43 @@ import os
 import sqlite3
 import time
 
-from ..preferences.settings import SETTINGS_DIRECTORY
+from ..context import SETTINGS_DIRECTORY
 from ..spec.iteminfo import LibraryKeywordInfo
 from ..lib.robot.utils import system_decode
 
+INDEX_SCRIPT = """\
+CREATE INDEX IF NOT EXISTS libraries_by_name_and_arguments
+    ON libraries (name, arguments, last_updated);
+CREATE INDEX IF NOT EXISTS keywords_by_library ON keywords (library);
+"""
+
+# Scripts upgrading an existing database to the schema version used as key.
+# The version is stored in the ``user_version`` pragma of the database.
+MIGRATIONS = {
+    1: INDEX_SCRIPT,
+    2: 'ALTER TABLE libraries ADD COLUMN fingerprint TEXT;'
+}
+SCHEMA_VERSION = max(MIGRATIONS)
+
 CREATION_SCRIPT = """\
 CREATE TABLE libraries (id INTEGER PRIMARY KEY,
                         name TEXT,
                         doc_format TEXT,
                         arguments TEXT,
-                        last_updated REAL);
+                        last_updated REAL,
+                        fingerprint TEXT);
 CREATE TABLE keywords (name TEXT,
                        doc TEXT,
                        arguments TEXT,
                        library_name TEXT,
                        library INTEGER,
                        FOREIGN KEY(library) REFERENCES libraries(id));
-"""
+""" + INDEX_SCRIPT + """\
+PRAGMA user_version = %d;
+""" % SCHEMA_VERSION
+
+# Keeps the number of host parameters of a single query below the SQLite limit.
+_QUERY_CHUNK_SIZE = 400
 
 DATABASE_FILE = os.path.join(system_decode(SETTINGS_DIRECTORY),
                              'librarykeywords.db')
@@ -59,6 +79,24 @@ def _validate_database():
         connection.close()
 
 
+def migrate_database(connection):
+    """Upgrades the schema of an existing database in place."""
+    version = connection.execute('PRAGMA user_version').fetchone()[0]
+    for target in sorted(MIGRATIONS):
+        if target > version:
+            connection.executescript(MIGRATIONS[target])
+            connection.execute('PRAGMA user_version = %d' % target)
+    connection.commit()
+
+
+def _migrate_database():
+    connection = sqlite3.connect(DATABASE_FILE)
+    try:
+        migrate_database(connection)
+    finally:
+        connection.close()
+
+
 def initialize_database():
     if not os.path.exists(SETTINGS_DIRECTORY):
         os.makedirs(SETTINGS_DIRECTORY)
@@ -76,12 +114,16 @@ def initialize_database():
                 print('failed to remove database "%s"' % DATABASE_FILE)
                 raise err
             _create_database()
+    _migrate_database()
 
 
 class LibraryDatabase(object):
 
-    def __init__(self, database):
-        self._connection = sqlite3.connect(database, timeout=30.0)
+    def __init__(self, database, check_same_thread=True):
+        self._connection = sqlite3.connect(database, timeout=30.0, check_same_thread=check_same_thread)
+        if database != ':memory:':
+            # Readers in the UI thread do not block the library manager writing
+            self._connection.execute('PRAGMA journal_mode=WAL')
 
     def create_database(self):
         self._cursor().executescript(CREATION_SCRIPT)
@@ -93,8 +135,11 @@ class LibraryDatabase(object):
     def close(self):
         self._connection.close()
 
+    def commit(self):
+        self._connection.commit()
+
     def insert_library_keywords(self, library_name, library_arguments,
-                                keywords):
+                                keywords, fingerprint=None, commit=True):
         library_doc_format = "ROBOT"
         if len(keywords) > 0:
             library_doc_format = keywords[0].doc_format
@@ -107,19 +152,29 @@ class LibraryDatabase(object):
         cur.executemany('delete from keywords where library = ?', old_versions)
         cur.executemany('delete from libraries where id = ?', old_versions)
         lib = self._insert_library(library_name, library_doc_format,
-                                   library_arguments, cur)
+                                   library_arguments, fingerprint, cur)
         keyword_values = [[kw.name, kw.doc, u' | '.join(kw.arguments),
                            kw.source,
                            lib[0]] for kw in keywords if kw is not None]
         self._insert_library_keywords(keyword_values, cur)
-        self._connection.commit()
-
-    def update_library_timestamp(self, name, arguments, milliseconds=None):
-        self._cursor().execute('update libraries set last_updated = ?'
-                               ' where name = ? and arguments = ?',
-                               (milliseconds or time.time(), name,
-                                str(arguments)))
-        self._connection.commit()
+        if commit:
+            self._connection.commit()
+
+    def update_library_timestamp(self, name, arguments, milliseconds=None,
+                                 fingerprint=None, commit=True):
+        if fingerprint is None:
+            self._cursor().execute('update libraries set last_updated = ?'
+                                   ' where name = ? and arguments = ?',
+                                   (milliseconds or time.time(), name,
+                                    str(arguments)))
+        else:
+            self._cursor().execute('update libraries set last_updated = ?,'
+                                   ' fingerprint = ? where name = ? and'
+                                   ' arguments = ?',
+                                   (milliseconds or time.time(), fingerprint,
+                                    name, str(arguments)))
+        if commit:
+            self._connection.commit()
 
     def fetch_library_keywords(self, library_name, library_arguments):
         lib = self._fetch_lib(library_name, library_arguments, self._cursor())
@@ -132,6 +187,36 @@ class LibraryDatabase(object):
                                          ' library_name from keywords where'
                                          ' library = ?', [lib[0]])]
 
+    def fetch_keywords_of_libraries(self, libraries):
+        """Fetches the newest keywords of several libraries at once.
+
+        ``libraries`` is an iterable of ``(name, arguments)`` pairs. Returns
+        a dictionary mapping ``(name, str(arguments))`` of the libraries found
+        from the database to ``(last_updated, fingerprint, keywords)`` tuples.
+        """
+        keys = list(dict.fromkeys((name, str(arguments)) for name, arguments in libraries))
+        newest = {}
+        for chunk in self._chunks(keys):
+            query = ('select id, name, doc_format, arguments, last_updated, fingerprint from libraries'
+                     ' where (name, arguments) in (values %s)' % ', '.join(['(?, ?)'] * len(chunk)))
+            for lib in self._connection.execute(query, [value for key in chunk for value in key]):
+                key = (lib[1], lib[3])
+                if key not in newest or lib[4] > newest[key][4]:
+                    newest[key] = lib
+        by_id = {lib[0]: lib for lib in newest.values()}
+        keywords = {lib_id: [] for lib_id in by_id}
+        for chunk in self._chunks(list(by_id)):
+            query = ('select library, name, doc, arguments, library_name from keywords'
+                     ' where library in (%s) order by rowid' % ', '.join(['?'] * len(chunk)))
+            for lib_id, name, doc, arguments, library_name in self._connection.execute(query, chunk):
+                keywords[lib_id].append(LibraryKeywordInfo(name, doc, by_id[lib_id][2], library_name,
+                                                           arguments.split(u' | ') if arguments else []))
+        return {key: (lib[4], lib[5], keywords[lib[0]]) for key, lib in newest.items()}
+
+    @staticmethod
+    def _chunks(items):
+        return [items[i:i + _QUERY_CHUNK_SIZE] for i in range(0, len(items), _QUERY_CHUNK_SIZE)]
+
     def library_exists(self, library_name, library_arguments):
         return self._fetch_lib(library_name, library_arguments,
                                self._cursor()) is not None
@@ -142,19 +227,25 @@ class LibraryDatabase(object):
             return 0.0
         return lib[4]
 
-    def _insert_library(self, name, doc_format, arguments, cursor):
-        cursor.execute('insert into libraries values (null, ?, ?, ?, ?)',
-                       (name, doc_format, str(arguments), time.time()))
+    def get_library_fingerprint(self, library_name, library_arguments):
+        lib = self._fetch_lib(library_name, library_arguments, self._cursor())
+        if not lib:
+            return None
+        return lib[5]
+
+    def _insert_library(self, name, doc_format, arguments, fingerprint, cursor):
+        cursor.execute('insert into libraries (name, doc_format, arguments,'
+                       ' last_updated, fingerprint) values (?, ?, ?, ?, ?)',
+                       (name, doc_format, str(arguments), time.time(),
+                        fingerprint))
         return self._fetch_lib(name, arguments, cursor)
 
     @staticmethod
     def _fetch_lib(name, arguments, cursor):
-        t = cursor.execute('select max(last_updated) from libraries where name'
-                           ' = ?  and arguments = ?',
-                           (name, str(arguments))).fetchone()[0]
-        return cursor.execute('select * from libraries where name = ?'
-                              '  and arguments = ? and last_updated = ?',
-                              (name, str(arguments), t)).fetchone()
+        return cursor.execute('select id, name, doc_format, arguments,'
+                              ' last_updated, fingerprint from libraries where name = ?'
+                              ' and arguments = ? order by last_updated desc'
+                              ' limit 1', (name, str(arguments))).fetchone()
 
     @staticmethod
     def _insert_library_keywords(data, cursor):
@@ -13,12 +13,49 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from ..robotapi import TestLibrary
+import os
+import sys
+
+from ..robotapi import DataError, TestLibrary
 from .iteminfo import LibraryKeywordInfo
+from .libraryfingerprint import library_files, library_fingerprint
+from .xmlreaders import get_path
+
+
+def import_library_keywords(library_name, library_args, doc_paths=None, python_path=None):
+    """Imports a library and returns its keywords and the fingerprint of its source files.
+
+    The library is searched first relative to the current directory and then
+    from ``doc_paths``, a comma separated list of directories. This is also run
+    in the worker processes of `LibraryManager`, which get RIDE's ``sys.path``
+    as ``python_path``. Raises `DataError` if the library has no keywords.
+    """
+    for path in python_path or []:
+        if path not in sys.path:
+            sys.path.append(path)
+    sources = []
+    path = get_path(library_name.replace('/', os.sep), os.path.abspath('.'))
+    if path:
+        results = get_import_result(path, library_args, sources)
+        if results:
+            return results, library_fingerprint(sources)
+    collection = []
+    if doc_paths:
+        for p in doc_paths.split(','):
+            path = get_path(library_name.replace('/', os.sep), p.strip())
+            if path:
+                results = get_import_result(path, library_args, sources)
+                if results:
+                    collection.extend(results)
+    if collection:
+        return collection, library_fingerprint(sources)
+    raise DataError
 
 
-def get_import_result(path, args):
+def get_import_result(path, args, sources=None):
     lib = TestLibrary(path, args)
+    if sources is not None:
+        sources.extend(library_files(lib.source))
     kws = [
         LibraryKeywordInfo(
             kw.name,
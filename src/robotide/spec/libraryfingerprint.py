@@ -0,0 +1,87 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+import os
+
+# First item of the entry telling how many times in a row importing a library has failed
+_FAILED_IMPORT = '<failed import>'
+
+
+def library_fingerprint(sources, failed_imports=0):
+    """Returns a fingerprint of the files a library was read from.
+
+    ``sources`` are the paths of the library modules and spec files. The
+    fingerprint contains their modification times and sizes, so it changes
+    whenever one of the files is edited, replaced or removed. With
+    ``failed_imports`` the fingerprint also tells how many times in a row the
+    library could not be imported, and its keywords, if any, were read from
+    a spec file.
+    """
+    files = [[path] + _file_state(path) for path in sorted(set(filter(None, sources)))]
+    return json.dumps(([[_FAILED_IMPORT, failed_imports]] if failed_imports else []) + files)
+
+
+def library_files(source):
+    """Returns the files whose changes change a library read from ``source``.
+
+    For a package library, ``source`` is its ``__init__.py`` or directory and
+    the files are the package directories and all the modules in them.
+    """
+    if not source:
+        return []
+    if os.path.isdir(source):
+        package = source
+    elif os.path.splitext(os.path.basename(source))[0] == '__init__':
+        package = os.path.dirname(source)
+    else:
+        return [source]
+    files = []
+    for root, dirs, names in os.walk(package):
+        dirs[:] = [d for d in dirs if not d.startswith(('.', '__pycache__'))]
+        files.append(root)
+        files.extend(os.path.join(root, name) for name in names if name.endswith('.py'))
+    return files
+
+
+def fingerprint_changed(fingerprint):
+    """Tells whether a file in ``fingerprint`` has changed since it was taken."""
+    files = _load(fingerprint)
+    if files is None:
+        return True
+    return any(_file_state(path) != state for path, *state in files if path != _FAILED_IMPORT)
+
+
+def failed_imports(fingerprint):
+    """Returns how many times in a row importing the library of ``fingerprint`` had failed."""
+    for path, *state in _load(fingerprint) or []:
+        if path == _FAILED_IMPORT:
+            return state[0] if state else 1
+    return 0
+
+
+def _load(fingerprint):
+    try:
+        return json.loads(fingerprint)
+    except (TypeError, ValueError):
+        return None
+
+
+def _file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [None, None]
+    return [stat.st_mtime_ns, stat.st_size]
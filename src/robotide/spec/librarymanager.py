@@ -13,25 +13,47 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import multiprocessing
 import os
 import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from sqlite3 import OperationalError
-from threading import Thread
+from threading import Lock, Thread, get_ident
 
-import robotide.robotapi
 from ..publish import RideLogException, RideLogMessage
 from ..spec.librarydatabase import LibraryDatabase
-from ..spec.libraryfetcher import get_import_result
-from ..spec.xmlreaders import get_path, SpecInitializer
+from ..spec.libraryfingerprint import failed_imports, library_fingerprint
+from ..spec.libraryfetcher import import_library_keywords
+from ..spec.xmlreaders import SpecInitializer
 
 
 class LibraryManager(Thread):
+    """Fetches library keywords in the background and stores them to the library database.
 
-    def __init__(self, database_name, spec_initializer=None):
+    Libraries are imported in a pool of ``processes`` worker processes, so that
+    importing independent libraries happens concurrently and arbitrary library
+    code cannot break RIDE itself. Requests for a library that is already being
+    fetched wait for that import instead of starting a new one. All database
+    writes are done by this thread, one transaction per batch of results,
+    together with a fingerprint of the files each library was read from.
+    With ``processes=0`` libraries are imported by this thread.
+    """
+
+    def __init__(self, database_name, spec_initializer=None, processes=0):
         self._database_name = database_name
         self._database = None
         self._messages = queue.Queue()
+        self._connections = {}
+        self._connections_lock = Lock()
         self._spec_initializer = spec_initializer or SpecInitializer()
+        self._processes = processes
+        self._executor = None
+        self._in_flight = {}
+        self._results = []
+        self._results_lock = Lock()
         Thread.__init__(self)
         self.daemon = True
 
@@ -44,19 +66,40 @@ class LibraryManager(Thread):
             except Exception as err:
                 msg = 'Library import handling threw an unexpected exception'
                 RideLogException(message=msg, exception=err, level='WARN').publish()
+        self._shutdown_executor()
         self._database.close()
 
     def _initiate_database_connection(self):
         self._database = LibraryDatabase(self._database_name)
 
-    def get_new_connection_to_library_database(self):
-        library_database = LibraryDatabase(self._database_name)
+    def get_library_database(self):
+        """Returns the connection to the library database of the calling thread.
+
+        The connection is opened on first use and kept for later calls until
+        the manager is stopped, so callers must not close it.
+        """
+        with self._connections_lock:
+            library_database = self._connections.get(get_ident())
+            if library_database is None:
+                library_database = self.get_new_connection_to_library_database(check_same_thread=False)
+                self._connections[get_ident()] = library_database
+        return library_database
+
+    def get_new_connection_to_library_database(self, check_same_thread=True):
+        library_database = LibraryDatabase(self._database_name, check_same_thread)
         if self._database_name == ':memory:':
             # In memory database does not point to the right place.
             # this is here for unit tests.
             library_database.create_database()
         return library_database
 
+    def _close_connections(self):
+        # The connections are used only by their own threads, but closed by the caller of stop
+        with self._connections_lock:
+            connections, self._connections = self._connections, {}
+        for library_database in connections.values():
+            library_database.close()
+
     def _handle_message(self):
         message = self._messages.get()
         if not message:
@@ -66,71 +109,120 @@ class LibraryManager(Thread):
             self._handle_fetch_keywords_message(message)
         elif msg_type == 'insert':
             self._handle_insert_keywords_message(message)
+        elif msg_type == 'imported':
+            self._handle_imported_message()
         elif msg_type == 'create':
             self._database.create_database()
         return True
 
     def _handle_fetch_keywords_message(self, message):
         _, library_name, library_args, callback = message
-        keywords = self._fetch_keywords(library_name, library_args)
-        self._update_database_and_call_callback_if_needed((library_name, library_args), keywords, callback)
+        self._request(library_name, library_args, callback, insert=False)
 
-    def _fetch_keywords(self, library_name, library_args):
-        if library_name in ("DataDriver", "Remote"):  # Known libraries without keywords
+    def _handle_insert_keywords_message(self, message):
+        _, library_name, library_args, result_queue = message
+        self._request(library_name, library_args,
+                      lambda res: result_queue.put(res, timeout=3), insert=True)
+
+    def _request(self, library_name, library_args, callback, insert):
+        key = (library_name, str(library_args))
+        if key in self._in_flight:
+            self._in_flight[key].append((callback, insert))
+            return
+        self._in_flight[key] = [(callback, insert)]
+        if self._known_without_keywords(library_name):
+            self._update_database_and_call_callbacks(
+                [(library_name, library_args, [], library_fingerprint([]))])
+        elif self._processes:
+            self._submit(library_name, library_args)
+        else:
+            keywords, fingerprint = self._fetch_keywords(library_name, library_args)
+            self._update_database_and_call_callbacks([(library_name, library_args, keywords, fingerprint)])
+
+    @staticmethod
+    def _known_without_keywords(library_name):
+        if library_name in ("DataDriver", "Remote"):
             msg = 'Library "%s" does not contain keywords' % library_name
             RideLogMessage(message=msg, level='INFO').publish()
-            return []
+            return True
+        return False
+
+    def _submit(self, library_name, library_args):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._processes,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        future = self._executor.submit(import_library_keywords, library_name, library_args,
+                                       os.getenv('RIDE_DOC_PATH'), sys.path[:])
+        future.add_done_callback(
+            lambda f: self._library_imported(library_name, library_args, f))
+
+    def _library_imported(self, library_name, library_args, future):
+        # Called in a thread of the executor, the results are handled by this thread
+        with self._results_lock:
+            self._results.append((library_name, library_args, future))
+        self._messages.put(('imported',))
+
+    def _handle_imported_message(self):
+        with self._results_lock:
+            results, self._results = self._results, []
+        if not results:
+            return
+        libraries = []
+        for library_name, library_args, future in results:
+            try:
+                keywords, fingerprint = future.result()
+            except BrokenProcessPool as err:
+                # A library killed its worker, a new pool is started for the next import
+                self._shutdown_executor()
+                keywords, fingerprint = self._keywords_from_spec(library_name, library_args, err)
+            except Exception as err:
+                keywords, fingerprint = self._keywords_from_spec(library_name, library_args, err)
+            libraries.append((library_name, library_args, keywords, fingerprint))
+        self._update_database_and_call_callbacks(libraries)
+
+    def _fetch_keywords(self, library_name, library_args):
         try:
-            doc_paths = os.getenv('RIDE_DOC_PATH')
-            collection = []
-            path = get_path(library_name.replace('/', os.sep), os.path.abspath('.'))
-            if path:
-                results = get_import_result(path, library_args)
-                if results:
-                    return results
-            if doc_paths:
-                for p in doc_paths.split(','):
-                    path = get_path(library_name.replace('/', os.sep), p.strip())
-                    if path:
-                        results = get_import_result(path, library_args)
-                        if results:
-                            collection.extend(results)
-            if collection:
-                return collection
-            raise robotide.robotapi.DataError
+            return import_library_keywords(library_name, library_args, os.getenv('RIDE_DOC_PATH'))
         except Exception as err:
+            return self._keywords_from_spec(library_name, library_args, err)
+
+    def _keywords_from_spec(self, library_name, library_args, err):
+        # Retries of a failed import are not reported again
+        attempts = failed_imports(self._database.get_library_fingerprint(library_name, library_args)) + 1
+        if attempts == 1:
             try:
                 print('FAILED', library_name, err)
             except IOError:
                 pass
-            kws = self._spec_initializer.init_from_spec(library_name)
-            if not kws:
+        kws = self._spec_initializer.init_from_spec(library_name)
+        if not kws:
+            if attempts == 1:
                 msg = 'Importing test library "%s" failed' % library_name
                 RideLogException(message=msg, exception=err, level='WARN').publish()
-            return kws
+            return kws, library_fingerprint([], failed_imports=attempts)
+        return kws, library_fingerprint([self._spec_initializer.find_spec_file(library_name)],
+                                        failed_imports=attempts)
 
-    def _handle_insert_keywords_message(self, message):
-        _, library_name, library_args, result_queue = message
-        keywords = self._fetch_keywords(library_name, library_args)
-        self._insert(library_name, library_args, keywords,
-                     lambda res: result_queue.put(res, timeout=3))
-
-    def _insert(self, library_name, library_args, keywords, callback):
-        self._database.insert_library_keywords(
-            library_name, library_args, keywords or [])
-        self._call(callback, keywords)
-
-    def _update_database_and_call_callback_if_needed(
-            self, library_key, keywords, callback):
-        db_keywords = self._database.fetch_library_keywords(*library_key)
+    def _update_database_and_call_callbacks(self, libraries):
+        all_waiters = [self._in_flight.pop((library_name, str(library_args)), [])
+                   for library_name, library_args, _, _ in libraries]
+        calls = []
         try:
-            if not db_keywords or self._keywords_differ(keywords, db_keywords):
-                self._insert(
-                    library_key[0], library_key[1], keywords, callback)
-            else:
-                self._database.update_library_timestamp(*library_key)
+            for (library_name, library_args, keywords, fingerprint), waiters in zip(libraries, all_waiters):
+                db_keywords = self._database.fetch_library_keywords(library_name, library_args)
+                changed = not db_keywords or self._keywords_differ(keywords, db_keywords)
+                if changed or any(insert for _, insert in waiters):
+                    self._database.insert_library_keywords(
+                        library_name, library_args, keywords or [], fingerprint, commit=False)
+                else:
+                    self._database.update_library_timestamp(library_name, library_args,
+                                                            fingerprint=fingerprint, commit=False)
+                calls.extend((callback, keywords) for callback, insert in waiters if changed or insert)
+            self._database.commit()
         except OperationalError:
             pass
+        for callback, keywords in calls:
+            self._call(callback, keywords)
 
     @staticmethod
     def _call(callback, *args):
@@ -145,20 +237,44 @@ class LibraryManager(Thread):
                            timeout=3)
 
     def get_and_insert_keywords(self, library_name, library_args):
-        result_queue = queue.Queue(maxsize=1)
-        self._messages.put(('insert', library_name, library_args, result_queue), timeout=3)
-        try:
-            return result_queue.get(timeout=5)
-        except queue.Empty as e:
-            RideLogMessage(u'Failed to read keywords from library db: {}'
-                           .format(str(e))).publish()
-            return []
+        keywords, = self.get_and_insert_keywords_of_libraries([(library_name, library_args)])
+        return keywords or []
+
+    def get_and_insert_keywords_of_libraries(self, libraries, timeout=5):
+        """Fetches the keywords of several libraries and waits for all of them.
+
+        All the libraries are requested before waiting, so that they are
+        imported concurrently by the worker processes. Returns the keywords
+        in the order of ``libraries``, ``None`` for the libraries that were not
+        fetched within ``timeout`` seconds.
+        """
+        result_queues = []
+        for library_name, library_args in libraries:
+            result_queue = queue.Queue(maxsize=1)
+            self._messages.put(('insert', library_name, library_args, result_queue), timeout=3)
+            result_queues.append(result_queue)
+        deadline = time.monotonic() + timeout
+        results = []
+        for result_queue in result_queues:
+            try:
+                results.append(result_queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty as e:
+                RideLogMessage(u'Failed to read keywords from library db: {}'
+                               .format(str(e))).publish()
+                results.append(None)
+        return results
 
     def create_database(self):
         self._messages.put(('create',), timeout=3)
 
     def stop(self):
         self._messages.put(False, timeout=3)
+        self._close_connections()
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
 
     @staticmethod
     def _keywords_differ(keywords1, keywords2):
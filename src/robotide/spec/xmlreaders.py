@@ -26,13 +26,17 @@ class SpecInitializer(object):
     def __init__(self, directories=None):
         self._directories = directories or []
         self._directories.append(context.LIBRARY_XML_DIRECTORY)
+        self._directory_indexes = {}
 
     def init_from_spec(self, name):
-        specfile = self._find_from_pythonpath(name) or \
-            self._find_from_library_xml_directories(name)
+        specfile = self.find_spec_file(name)
         print(f"\nDEBUG: spec.xmlreaders SpecInitializer specfile={specfile}")
         return self._init_from_specfile(specfile, name)
 
+    def find_spec_file(self, name):
+        return self._find_from_pythonpath(name) or \
+            self._find_from_library_xml_directories(name)
+
     def _find_from_library_xml_directories(self, name):
         for directory in self._directories:
             path = self._find_from_library_xml_directory(directory, name)
@@ -41,35 +45,9 @@ class SpecInitializer(object):
         return None
 
     def _find_from_library_xml_directory(self, directory, name):
-        current_xml_file = None
-        for xml_file in self._list_xml_files_in(directory):
-            name_from_xml = get_name_from_xml(xml_file)
-            if name_from_xml == name:
-                current_xml_file = self._get_newest_xml_file(
-                    xml_file, current_xml_file)
-        return current_xml_file
-
-    def _get_newest_xml_file(self, xml_file, current_xml_file):
-        version1 = self._get_version(xml_file)
-        version2 = self._get_version(current_xml_file)
-        if cmp_versions(version1, version2) == 1:
-            return xml_file
-        return current_xml_file
-
-    @staticmethod
-    def _get_version(xml_file):
-        try:
-            return utils.ET.parse(xml_file).getroot().find('version').text
-        except Exception as e:
-            print(e)
-            return None
-
-    @staticmethod
-    def _list_xml_files_in(directory):
-        for filename in os.listdir(directory):
-            path = os.path.join(directory, filename)
-            if path.endswith('.xml') and os.path.isfile(path):
-                yield path
+        if directory not in self._directory_indexes:
+            self._directory_indexes[directory] = SpecDirectoryIndex(directory)
+        return self._directory_indexes[directory].find(name)
 
     def _find_from_pythonpath(self, name):
         return utils.find_from_pythonpath(name + '.xml')
@@ -85,6 +63,103 @@ class SpecInitializer(object):
             return []
 
 
+class SpecDirectoryIndex(object):
+    """Index of the library names and versions of spec files in a directory.
+
+    Only the header of each spec file is read, and only when the file is new
+    or its modification time has changed. The directory itself is listed
+    again only when its modification time changes.
+    """
+
+    def __init__(self, directory):
+        self._directory = directory
+        self._mtime = None
+        self._files = {}
+        self._newest = {}
+
+    def find(self, name):
+        """Returns the path of the newest spec file of library ``name`` or None."""
+        self._refresh()
+        return self._newest.get(name)
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self._directory).st_mtime_ns
+        except OSError:
+            self._mtime, self._files, self._newest = None, {}, {}
+            return
+        if mtime != self._mtime:
+            self._mtime = mtime
+            paths = list(self._list_xml_files())
+        else:
+            paths = list(self._files)
+        files = {}
+        for path in paths:
+            try:
+                file_mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            entry = self._files.get(path)
+            if entry is None or entry[0] != file_mtime:
+                entry = (file_mtime,) + self._read_header(path)
+            files[path] = entry
+        if files != self._files:
+            self._files = files
+            self._newest = self._newest_by_name(paths)
+
+    def _list_xml_files(self):
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith('.xml') and entry.is_file():
+                yield entry.path
+
+    @staticmethod
+    def _read_header(path):
+        try:
+            return read_spec_header(path)
+        except Exception as e:
+            print(e)
+            return None, None
+
+    def _newest_by_name(self, paths):
+        newest = {}
+        for path in paths:
+            if path not in self._files:
+                continue
+            _, name, version = self._files[path]
+            if name is None:
+                continue
+            if name not in newest or cmp_versions(version, newest[name][1]) == 1:
+                newest[name] = (path, version)
+        return {name: path for name, (path, _) in newest.items()}
+
+
+def read_spec_header(path):
+    """Returns the library name and version of a spec file.
+
+    The file is parsed incrementally and only until its version is known,
+    so the keyword documentation of large spec files is not read.
+    """
+    name = version = None
+    depth = 0
+    with open(path, 'rb') as source:
+        for event, element in utils.ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                if depth == 0:
+                    name = element.get('name')
+                elif depth == 1 and element.tag in _ELEMENTS_AFTER_VERSION:
+                    break
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 1 and element.tag == 'version':
+                    version = element.text
+                    break
+    return name, version
+
+
+_ELEMENTS_AFTER_VERSION = ('doc', 'inits', 'keywords', 'kw')
+
+
 def _parse_xml(file, name):
     print(f"\nDEBUG: spec.xmlreaders _parse_xml ENTER file={file}  name={name}")
     root = utils.ET.parse(file).getroot()
@@ -131,9 +206,7 @@ def _get_library_name(name):
 
 def get_name_from_xml(path):
     try:
-        root = utils.ET.parse(path).getroot()
-        name = root.get('name')
-        return name
+        return read_spec_header(path)[0]
     except Exception as e:
         print(e)
         return None
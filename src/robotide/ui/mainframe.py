@@ -711,6 +711,10 @@ class RideFrame(wx.Frame):
         ret = message_box.ShowModal()
         confirmed = ret == wx.ID_YES
         if confirmed:
+            # Reload only the changed files when possible, instead of the whole workspace
+            changed_paths = RideFSWatcherHandler.get_changed_paths()
+            if changed_paths and self.controller.reload_changed_files(changed_paths):
+                return
             # workspace_path should update after open directory/suite
             # There are two scenarios:
             # 1. path is a directory
@@ -24,9 +24,9 @@ import wx.lib.mixins.listctrl as listmix
 from wx import Colour
 
 from ..context import IS_MAC
+from ..controller.keywordusages import KeywordCalls
 from ..spec.iteminfo import LibraryKeywordInfo
 from ..ui.searchdots import DottedSearch
-from ..usages.commands import FindUsages
 from ..widgets import ButtonWithHandler, Label, RIDEDialog
 
 _ = wx.GetTranslation  # To keep linter/code analyser happy
@@ -400,27 +400,27 @@ class ReviewRunner(object):
     def _run(self):
         self._stop_requested = False
         self._model.status = _('listing datafiles')
+        # Calls are counted from the whole project, also from the files the filter leaves out
+        calls = KeywordCalls()
+        for df in self._controller.datafiles:
+            time.sleep(0)  # GIVE SPACE TO OTHER THREADS -- Thread.yield in Java
+            self._model.status = _('searching from ') + self._libname(df)
+            if not self._model.searching:
+                break
+            calls.add_datafile(df)
         for df in self.get_datafile_list():
-            libname = os.path.basename(df.source).rsplit('.', 1)[0]
-            self._model.status = _('searching from ') + str(libname)
+            if not self._model.searching:
+                break
+            libname = self._libname(df)
             for keyword in df.keywords:
-                time.sleep(0)  # GIVE SPACE TO OTHER THREADS -- Thread.yield in Java
                 self._model.status = "%s.%s" % (libname, keyword.name)
-                if not self._model.searching:
-                    break
-                # Check if it is unused
-                if not isinstance(keyword, LibraryKeywordInfo) and keyword.name and self._is_unused(keyword):
+                if not isinstance(keyword, LibraryKeywordInfo) and keyword.name and not calls.is_used(keyword):
                     self._model.add_unused_keyword(keyword)
-            if not self._model.searching:
-                break
         self._model.end_search()
 
-    def _is_unused(self, keyword):
-        try:
-            next(self._controller.execute(FindUsages(keyword.name, keyword_info=keyword.info)))
-            return False
-        except StopIteration:
-            return True
+    @staticmethod
+    def _libname(datafile):
+        return str(os.path.basename(datafile.source or '').rsplit('.', 1)[0])
 
 
 class ResultFilter(object):
@@ -15,6 +15,7 @@
 
 import builtins
 import os
+import threading
 
 import wx
 from wx import Colour, Point
@@ -225,6 +226,9 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         self._bind_tree_events()
         self._images = TreeImageList()
         self._animctrl = None
+        self._animated_node = None
+        self._pending_results = {}
+        self._pending_results_lock = threading.Lock()
         self._silent_mode = False
         self.SetImageList(self._images)
         self.label_editor = TreeLabelEditListener(self, action_registerer)
@@ -277,6 +281,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         self.Bind(wx.EVT_TREE_ITEM_ACTIVATED, self.on_item_activated)
         self.Bind(customtreectrl.EVT_TREE_ITEM_CHECKED, self.on_tree_item_checked)
         self.Bind(wx.EVT_TREE_ITEM_COLLAPSING, self.on_tree_item_collapsing)
+        self.Bind(wx.EVT_TREE_DELETE_ITEM, self.on_tree_item_deleted)
         self.Bind(wx.EVT_CLOSE, self.on_close)
 
     def on_selection(self, event):
@@ -386,11 +391,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         if not test:
             # test object will be None when running with DataDriver
             # when runner is interrupted, is also None, so let's stop animation
-            if self._animctrl:
-                self._animctrl.Stop()
-                self._animctrl.Animation.Destroy()
-                self._animctrl.Destroy()
-                self._animctrl = None
+            self._stop_animation()
             return
         if isinstance(message, RideTestPassed):
             test.run_passed = True
@@ -400,21 +401,30 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
             test.run_passed = False
         else:
             test.run_passed = None
-        wx.CallAfter(self._set_icon_from_execution_results, message.item)
+        # Results are shown in batches, so that the tree keeps up with fast runs
+        with self._pending_results_lock:
+            if not self._pending_results:
+                wx.CallAfter(self._set_icons_from_execution_results)
+            self._pending_results.pop(id(test), None)
+            self._pending_results[id(test)] = test
+
+    def _set_icons_from_execution_results(self):
+        with self._pending_results_lock:
+            controllers = list(self._pending_results.values())
+            self._pending_results = {}
+        latest = None
+        for controller in controllers:
+            node = self.controller.find_node_by_controller(controller)
+            if node:
+                # Always set the static icon
+                self.SetItemImage(node, self._get_icon_index_for(controller))
+                latest = controller, node
+        if latest:
+            self._show_execution_of(*latest)
 
-    def _set_icon_from_execution_results(self, controller):
-        node = self.controller.find_node_by_controller(controller)
-        if not node:
-            return
+    def _show_execution_of(self, controller, node):
         img_index = self._get_icon_index_for(controller)
-        # Always set the static icon
-        self.SetItemImage(node, img_index)
-        if self._animctrl:
-            self._animctrl.Stop()
-            self._animctrl.Animation.Destroy()
-            self._animctrl.Destroy()
-            self._animctrl = None
-            self.DeleteItemWindow(node)
+        self._stop_animation()
         if img_index in (RUNNING_IMAGE_INDEX, PAUSED_IMAGE_INDEX):
             from wx.adv import Animation, AnimationCtrl
             import os
@@ -430,6 +440,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
                 self._animctrl = AnimationCtrl(obj, -1, ani, rect)
                 self._animctrl.SetBackgroundColour('white')
                 self.SetItemWindow(node, self._animctrl, False)
+                self._animated_node = node
                 self._animctrl.Play()
             except AttributeError:  # In fast executions the element self._animctrl.Play() does not exists
                 pass
@@ -441,6 +452,17 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         self.ExpandAllChildren(node)
         self.Update()
 
+    def _stop_animation(self):
+        if not self._animctrl:
+            return
+        self._animctrl.Stop()
+        self._animctrl.Animation.Destroy()
+        self._animctrl.Destroy()
+        self._animctrl = None
+        if self._animated_node:
+            self.DeleteItemWindow(self._animated_node)
+            self._animated_node = None
+
     def _get_icon_index_for(self, controller):
         if not self._execution_results:
             return ROBOT_IMAGE_INDEX
@@ -464,6 +486,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
 
     def _clear_tree_data(self):
         self.DeleteAllItems()
+        self.controller.clear_nodes()
         self.root = self.AddRoot('')
         self._resource_root = self._create_resource_root()
         self.datafile_nodes = []
@@ -558,6 +581,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
             self.SetItemTextColour(node, TREETEXTCOLOUR)  # wxPython3 hack
         action_handler = handler_class(controller, self, node, self.controller.settings)
         self.SetPyData(node, action_handler)
+        self.controller.register_node(node, controller)
 
         # if we have a TestCase node we have to make sure that
         # we retain the checked state
@@ -958,6 +982,10 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         if node.IsOk():
             self._render_children(node)
 
+    def on_tree_item_deleted(self, event):
+        self.controller.unregister_node(event.GetItem())
+        event.Skip()
+
     # This exists because CustomTreeItem does not remove animations
     def on_tree_item_collapsing(self, event):
         item = event.GetItem()
@@ -29,6 +29,7 @@ class _RideFSWatcherHandler:
     def __init__(self):
         self._fs_watcher = None
         self._is_workspace_dirty = False
+        self._changed_paths = {}
         self._initial_watched_path = None
         self._watched_path = set()
         self._excluded_path = set()
@@ -105,6 +106,7 @@ class _RideFSWatcherHandler:
 
     def stop_listening(self):
         self._is_workspace_dirty = False
+        self._changed_paths = {}
         self._fs_watcher.RemoveAll()
         self._watched_path = set()
 
@@ -197,9 +199,26 @@ class _RideFSWatcherHandler:
     def get_workspace_new_path(self):
         return self._initial_watched_path  # Returning file or directory name
 
+    def get_changed_paths(self):
+        """Returns the paths changed since listening started, mapped to the kind of change."""
+        return dict(self._changed_paths)
+
     def _on_fs_event(self, event):
         if self._is_mark_dirty_needed(event):
             self._is_workspace_dirty = True
+            self._record_change(event)
+
+    def _record_change(self, event):
+        change_type = event.GetChangeType()
+        if change_type == wx.FSW_EVENT_CREATE:
+            self._changed_paths[event.GetNewPath()] = 'created'
+        elif change_type == wx.FSW_EVENT_DELETE:
+            self._changed_paths[event.GetPath()] = 'deleted'
+        elif change_type == wx.FSW_EVENT_RENAME:
+            self._changed_paths[event.GetPath()] = 'renamed'
+            self._changed_paths[event.GetNewPath()] = 'renamed'
+        else:
+            self._changed_paths[event.GetPath()] = 'modified'
 
     def _is_mark_dirty_needed(self, event):
         new_path = event.GetNewPath()
@@ -258,6 +258,18 @@ def generate_big_project(ctx, _install=False, upgrade=False, args=''):
         _log("Use 'invoke generate_big_project --install'")
 
 
+@task
+def benchmark(ctx, sizes='100,1000,10000', repeat=3, output='benchmarks.json'):
+    """Benchmark RIDE operations on projects generated with rfgen.py."""
+    _ = ctx
+    _remove_bytecode_files()
+    _set_development_path()
+    sys.path.insert(0, '.')
+    sys.argv = ['benchmarks.py', '--sizes', sizes, '--repeat', str(repeat), '--output', output]
+    from utest.benchmarks import main
+    main()
+
+
 @task
 def random_test(ctx):
     """Use rtest go_find_bugs.py to randomly test RIDE API."""
@@ -273,6 +285,30 @@ def random_test(ctx):
         shutil.rmtree(_dir, ignore_errors=True)
 
 
+@task
+def profile_random_test(ctx, steps=10000, seed=None, cprofile=False, tracemalloc=False, output=None):
+    """Use rtest profiler.py to report the latencies of the random actions of RIDE API."""
+    _ = ctx
+    _remove_bytecode_files()
+    _set_development_path()
+    sys.path.insert(0, '.')
+    from rtest.profiler import main
+    args = ['--steps', str(steps)]
+    if seed is not None:
+        args += ['--seed', str(seed)]
+    if cprofile:
+        args.append('--cprofile')
+    if tracemalloc:
+        args.append('--tracemalloc')
+    if output:
+        args += ['--output', output]
+    _dir = tempfile.mkdtemp()
+    try:
+        main([_dir] + args)
+    finally:
+        shutil.rmtree(_dir, ignore_errors=True)
+
+
 # Installation and distribution tasks
 @task
 def version(ctx, _version):
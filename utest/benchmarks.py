@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Benchmarks of RIDE operations on projects generated with rfgen.py.
+
+Projects of the given numbers of tests are generated with a fixed seed, and
+the operations are run headless, without a display, `--repeat` times each.
+The results are written as JSON, so that they can be compared between
+versions.
+
+Usage: python utest/benchmarks.py [--sizes 100,1000,10000] [--seed 1]
+                                  [--repeat 3] [--output benchmarks.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+# Number of tests: suites, tests in a suite and resource files of the generated project
+PROJECT_SIZES = {
+    100: (5, 20, 2),
+    1000: (20, 50, 5),
+    10000: (100, 100, 20)
+}
+SUGGESTION_STARTS = ['', 'L', 'No', 'My', '${']
+
+
+def generate_project(directory, tests, seed):
+    suites, tests_in_suite, resource_files = _project_size(tests)
+    command = [sys.executable, os.path.join(ROOT, 'rfgen.py'), '--dir', directory, '--seed', str(seed),
+               '--suites', str(suites), '--tests', str(tests_in_suite), '--resourcefiles', str(resource_files),
+               '--libs', '5', '--keywords', '10', '--testdepth', '4']
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    return os.path.join(directory, 'testdir')
+
+
+def _project_size(tests):
+    if tests in PROJECT_SIZES:
+        return PROJECT_SIZES[tests]
+    suites = max(tests // 100, 1)
+    return suites, max(tests // suites, 1), max(suites // 5, 1)
+
+
+class Timings(object):
+
+    def __init__(self):
+        self.samples = {}
+
+    @contextmanager
+    def timing(self, operation):
+        start = time.perf_counter()
+        yield
+        self.samples.setdefault(operation, []).append(time.perf_counter() - start)
+
+    def as_dict(self):
+        return dict((operation, {'count': len(samples),
+                                 'min': min(samples),
+                                 'median': statistics.median(samples),
+                                 'max': max(samples),
+                                 'total': sum(samples)})
+                    for operation, samples in self.samples.items())
+
+
+class ProjectBenchmark(object):
+    """Times the operations of RIDE on one project."""
+
+    def __init__(self, path, repeat):
+        self._path = path
+        self._repeat = repeat
+        self.timings = Timings()
+        self.project = None
+        self._settings = None
+
+    def run(self):
+        for _ in range(self._repeat):
+            with self.timings.timing('load project'):
+                self.project = self._load_project()
+        self._parse_in_parallel()
+        self._resolve_keywords()
+        self._content_assist()
+        self._find_usages()
+        self._rename_keyword()
+        self._save_all()
+        self._text_editor_round_trip()
+        return self
+
+    def _load_project(self):
+        from robotide.controller import Project
+        from robotide.controller.ctrlcommands import NullObserver
+        from robotide.namespace import Namespace
+        from robotide.spec.librarymanager import LibraryManager
+        from utest.resources import FakeSettings
+
+        if self.project:
+            self.project.close()
+        settings = self._settings = FakeSettings()
+        library_manager = LibraryManager(':memory:')
+        library_manager.create_database()
+        project = Project(Namespace(settings), settings, library_manager)
+        project.load_data(self._path, NullObserver())
+        return project
+
+    @property
+    def size(self):
+        datafiles = [df for df in self.project.datafiles if df.tests]
+        return {'datafiles': len(list(self.project.datafiles)),
+                'tests': sum(len(df.tests) for df in datafiles),
+                'steps': sum(len(test.steps) for test in self._tests())}
+
+    def _tests(self):
+        for datafile in self.project.datafiles:
+            for test in datafile.tests:
+                yield test
+
+    def _steps(self):
+        for test in self._tests():
+            for step in test.steps:
+                if step.keyword:
+                    yield test.datafile_controller, step
+
+    def _parse_in_parallel(self):
+        from robotide.controller import dataloader
+
+        processes = max(2, (os.cpu_count() or 1) - 1)
+        for _ in range(self._repeat):
+            with self.timings.timing('parse sequentially'):
+                dataloader.test_data(self._path, settings=self._settings)
+            with self.timings.timing('parse in %d processes' % processes):
+                with dataloader.ParallelParser(processes, min_files=1) as parser:
+                    parsed_files = parser.parse_directory(self._path, self._settings)
+                    dataloader.test_data(self._path, settings=self._settings, parsed_files=parsed_files)
+
+    def _resolve_keywords(self):
+        steps = list(self._steps())
+        for operation in ['resolve keywords (first)'] + ['resolve keywords'] * self._repeat:
+            with self.timings.timing(operation):
+                for datafile, step in steps:
+                    datafile.keyword_info(None, step.keyword)
+
+    def _content_assist(self):
+        test = next(self._tests())
+        namespace = self.project.namespace
+        for start in SUGGESTION_STARTS * self._repeat:
+            with self.timings.timing('content assist'):
+                namespace.get_suggestions_for(test, start)
+
+    def _find_usages(self):
+        from robotide.usages.commands import FindUsages
+
+        test = next(self._tests())
+        names = ['Log', 'No Operation', self._library_keyword()]
+        for name in names * self._repeat:
+            with self.timings.timing('find usages'):
+                list(test.execute(FindUsages(name)))
+
+    def _library_keyword(self):
+        # A keyword of a generated library, used with the library name
+        for _, step in self._steps():
+            if '.' in step.keyword:
+                return step.keyword
+        return 'Get Time'
+
+    def _rename_keyword(self):
+        from robotide.controller.ctrlcommands import NullObserver, RenameKeywordOccurrences
+
+        test = next(self._tests())
+        for _ in range(self._repeat):
+            for old_name, new_name in (('No Operation', 'No Operation Renamed'),
+                                       ('No Operation Renamed', 'No Operation')):
+                with self.timings.timing('rename keyword'):
+                    test.execute(RenameKeywordOccurrences(old_name, new_name, NullObserver()))
+
+    def _save_all(self):
+        from robotide.controller.ctrlcommands import SaveAll
+
+        for _ in range(self._repeat):
+            for datafile in self.project.datafiles:
+                datafile.mark_dirty()
+            with self.timings.timing('save all'):
+                self.project.execute(SaveAll())
+
+    def _text_editor_round_trip(self):
+        from robotide.editor.texteditor import DataFileWrapper
+
+        datafile = max((df for df in self.project.datafiles if df.tests), key=lambda df: len(df.tests))
+        for _ in range(self._repeat):
+            wrapper = DataFileWrapper(datafile, self._settings)
+            with self.timings.timing('text editor content'):
+                content = wrapper.content
+            with self.timings.timing('text editor apply'):
+                wrapper.update_from(content)
+
+
+def run_benchmarks(sizes, seed=1, repeat=3, directory=None):
+    results = []
+    for tests in sizes:
+        project_dir = tempfile.mkdtemp(prefix='ride-benchmark-', dir=directory)
+        try:
+            start = time.perf_counter()
+            path = generate_project(project_dir, tests, seed)
+            generation_time = time.perf_counter() - start
+            benchmark = ProjectBenchmark(path, repeat).run()
+            result = {'size': tests, 'generation time': generation_time}
+            result.update(benchmark.size)
+            result['operations'] = benchmark.timings.as_dict()
+            benchmark.project.close()
+            results.append(result)
+        finally:
+            shutil.rmtree(project_dir, ignore_errors=True)
+    return {'ride version': _ride_version(),
+            'robot version': _robot_version(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'results': results}
+
+
+def _ride_version():
+    from robotide.version import VERSION
+    return VERSION
+
+
+def _robot_version():
+    from robot.version import get_version
+    return get_version()
+
+
+def write_summary(benchmarks, write):
+    for result in benchmarks['results']:
+        write('%d tests in %d datafiles, %d steps\n' % (result['size'], result['datafiles'], result['steps']))
+        for operation, timing in result['operations'].items():
+            write('  %s%8.4f s (median of %d, max %.4f s)\n'
+                  % (operation.ljust(30), timing['median'], timing['count'], timing['max']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark RIDE operations on generated projects.')
+    parser.add_argument('--sizes', default='100,1000,10000',
+                        help='comma separated numbers of tests in the generated projects')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the generated projects')
+    parser.add_argument('--repeat', type=int, default=3, help='times each operation is run')
+    parser.add_argument('--output', default='benchmarks.json', help='file to write the JSON results to')
+    parser.add_argument('--dir', default=None, help='directory to generate the projects in')
+    options = parser.parse_args()
+    sizes = [int(size) for size in options.sizes.split(',')]
+    benchmarks = run_benchmarks(sizes, options.seed, options.repeat, options.dir)
+    with open(options.output, 'w') as output:
+        json.dump(benchmarks, output, indent=2)
+    write_summary(benchmarks, sys.stdout.write)
+
+
+if __name__ == '__main__':
+    main()
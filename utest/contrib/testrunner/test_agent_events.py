@@ -0,0 +1,105 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+import time
+import unittest
+
+from robotide.contrib.testrunner.TestRunnerAgent import (KeywordCoalescer, FRAMING_BINARY, EVENTS_TESTS,
+                                                         EVENTS_FAILURES, EVENTS_KEYWORDS, EVENTS_TRACE,
+                                                         TestRunnerAgent as RunnerAgent)
+from robotide.contrib.testrunner.testrunner import RideListenerServer, RideListenerHandler
+
+KEYWORD_ATTRS = {'args': [], 'doc': '', 'assign': [], 'status': 'PASS'}
+
+
+class TestKeywordCoalescer(unittest.TestCase):
+
+    def test_updates_are_coalesced(self):
+        sent = []
+        coalescer = KeywordCoalescer(sent.append, rate=5)
+        coalescer.start_keyword('First')
+        for i in range(100):
+            coalescer.start_keyword('Keyword %d' % i)
+            coalescer.end_keyword()
+        coalescer.start_keyword('Last')
+        assert sent == ['First']
+        time.sleep(0.4)
+        assert sent == ['First', 'Last']
+        coalescer.end_keyword()
+        coalescer.end_keyword()
+        coalescer.close()
+
+
+class TestAgentSubscriptions(unittest.TestCase):
+
+    def _run(self, *options):
+        events = []
+        closed = threading.Event()
+
+        def callback(name, *args):
+            events.append((name, args))
+            if name == 'close':
+                closed.set()
+        server = RideListenerServer(RideListenerHandler, callback)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        listener = RunnerAgent(server.server_address[1], 'False', FRAMING_BINARY, *options)
+        try:
+            listener.start_test('Test', {'longname': 'Suite.Test'})
+            for i in range(50):
+                listener.start_keyword('Keyword %d' % i, KEYWORD_ATTRS)
+                listener.log_message({'message': 'info %d' % i, 'level': 'INFO'})
+                listener.end_keyword('Keyword %d' % i, KEYWORD_ATTRS)
+            listener.log_message({'message': 'warning', 'level': 'WARN'})
+            listener.end_test('Test', {'longname': 'Suite.Test', 'status': 'PASS'})
+            listener.close()
+            assert closed.wait(5)
+        finally:
+            listener._killer.shutdown()
+            listener._killer.server_close()
+            server.shutdown()
+            server.server_close()
+        return [name for name, _ in events], [args[0]['message'] for name, args in events if name == 'log_message']
+
+    def test_every_event_without_subscription(self):
+        names, messages = self._run()
+        assert names.count('start_keyword') == names.count('end_keyword') == 50
+        assert len(messages) == 51
+
+    def test_trace(self):
+        names, _ = self._run(EVENTS_TRACE, 'INFO')
+        assert names.count('start_keyword') == 50
+
+    def test_keywords(self):
+        names, messages = self._run(EVENTS_KEYWORDS, 'WARN')
+        assert 'start_keyword' not in names and 'end_keyword' not in names
+        assert 1 <= names.count('current_keyword') < 50
+        assert messages == ['warning']
+
+    def test_failures(self):
+        names, messages = self._run(EVENTS_FAILURES, 'INFO')
+        assert 1 <= names.count('current_keyword') < 50
+        assert messages == ['warning']
+
+    def test_tests(self):
+        names, messages = self._run(EVENTS_TESTS, 'TRACE')
+        assert names == ['pid', 'port', 'start_test', 'end_test', 'close']
+        assert messages == []
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -41,6 +41,14 @@ class CommandCreationTests(unittest.TestCase):
         self.assertEqual(result,
                          'prefix -A "C:\\User name\\Temp\\Ride\\arg_file.robot" --listener "C:\\My Work\\Python\\TestRunnerAgent.py:5522:False" "C:\\My Work\\TestSuite.robot"')
 
+    def test_build_command_with_listener_options(self):
+        command = CommandStub().with_listener(5522, True, 'binary', 'keywords', 'DEBUG')
+        self.assertEqual(command.build(),
+                         '--listener "C:\\My Work\\Python\\TestRunnerAgent.py:5522:True:binary:keywords:DEBUG"')
+        command = CommandStub().with_listener(5522, False, None, 'tests')
+        self.assertEqual(command.build(),
+                         '--listener "C:\\My Work\\Python\\TestRunnerAgent.py:5522:False::tests"')
+
     def test_build_command_call_some_method_twice(self):
         command = CommandStub() \
             .with_prefix('prefix_1') \
@@ -0,0 +1,135 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+import time
+import unittest
+from io import BytesIO
+
+from robotide.contrib.testrunner.consolebuffer import ColoredText, OutputBuffer, parse_colors
+from robotide.contrib.testrunner.Process import StreamReaderThread
+
+PASS_LINE = b'Passing     | \x1b[32mPASS\x1b[0m |\n'
+FAIL_LINE = b'Failing     | \x1b[31mFAIL\x1b[0m |\n'
+LINK_LINE = b'Log:  \x1b]8;;file:///tmp/log.html\x1b\\/tmp/log.html\x1b]8;;\x1b\\\n'
+
+
+class TestParseColors(unittest.TestCase):
+
+    def test_text_without_escapes(self):
+        parsed = parse_colors(b'Small Test\n')
+        assert parsed.text == b'Small Test\n'
+        assert parsed.colors == []
+
+    def test_colors_are_removed_and_mapped(self):
+        parsed = parse_colors(PASS_LINE + FAIL_LINE)
+        assert parsed.text == b'Passing     | PASS |\nFailing     | FAIL |\n'
+        assert parsed.colors == [(14, 'GREEN'), (18, None), (35, 'RED'), (39, None)]
+
+    def test_yellow_and_blue(self):
+        parsed = parse_colors(b'\x1b[33mSKIP\x1b[0m \x1b[34mlink\x1b[0m')
+        assert parsed.text == b'SKIP link'
+        assert parsed.colors == [(0, 'YELLOW'), (4, None), (5, 'BLUE'), (9, None)]
+
+    def test_hyperlinks(self):
+        parsed = parse_colors(LINK_LINE)
+        assert parsed.text == b'Log:  file:///tmp/log.html/tmp/log.html\n'
+        assert parsed.colors == [(6, 'BLUE'), (26, None), (39, None)]
+
+    def test_unknown_and_incomplete_escapes_are_kept(self):
+        parsed = parse_colors(b'\x1b[1mbold\x1b')
+        assert parsed.text == b'\x1b[1mbold\x1b'
+        assert parsed.colors == []
+
+    def test_strings_are_not_parsed(self):
+        parsed = parse_colors('\n')
+        assert parsed.text == '\n'
+        assert parsed.colors == []
+
+    def test_large_output_is_parsed_in_linear_time(self):
+        data = (PASS_LINE + FAIL_LINE) * 50000
+        start = time.time()
+        parsed = parse_colors(data)
+        assert time.time() - start < 2
+        assert len(parsed.colors) == 200000
+
+
+class TestColoredText(unittest.TestCase):
+
+    def test_join_moves_colors(self):
+        joined = ColoredText.join([parse_colors(PASS_LINE), parse_colors(b'plain\n'), parse_colors(FAIL_LINE)])
+        assert joined.text == b'Passing     | PASS |\nplain\nFailing     | FAIL |\n'
+        assert joined.colors == [(14, 'GREEN'), (18, None), (41, 'RED'), (45, None)]
+        assert len(joined) == len(joined.text)
+
+    def test_join_nothing(self):
+        joined = ColoredText.join([])
+        assert joined.text == b''
+        assert not joined
+
+
+class TestOutputBuffer(unittest.TestCase):
+
+    def test_pop_returns_bytes_read_since_previous_pop(self):
+        buffer = OutputBuffer()
+        buffer.append(b'first\n')
+        buffer.append(b'second\n')
+        assert buffer.pop() == b'first\nsecond\n'
+        assert buffer.pop() == b''
+
+    def test_parser_converts_appended_data(self):
+        buffer = OutputBuffer(parse_colors)
+        buffer.append(PASS_LINE)
+        popped = buffer.pop()
+        assert popped.text == b'Passing     | PASS |\n'
+        assert popped.colors == [(14, 'GREEN'), (18, None)]
+        assert buffer.pop().text == b''
+
+    def test_concurrent_appends_are_not_lost(self):
+        buffer = OutputBuffer()
+        popped = []
+
+        def append():
+            for _ in range(10000):
+                buffer.append(b'x')
+
+        threads = [threading.Thread(target=append) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            popped.append(buffer.pop())
+        popped.append(buffer.pop())
+        assert len(b''.join(popped)) == 40000
+
+
+class TestStreamReaderThread(unittest.TestCase):
+
+    def _read(self, data, parser=None):
+        reader = StreamReaderThread(BytesIO(data), parser)
+        reader.run()
+        reader._thread.join()
+        return reader.pop()
+
+    def test_output_is_read_as_bytes(self):
+        assert self._read(PASS_LINE * 3) == PASS_LINE * 3
+
+    def test_output_is_parsed_by_reader(self):
+        popped = self._read(PASS_LINE + FAIL_LINE, parse_colors)
+        assert popped.text == b'Passing     | PASS |\nFailing     | FAIL |\n'
+        assert popped.colors == [(14, 'GREEN'), (18, None), (35, 'RED'), (39, None)]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+import time
+import unittest
+from io import BytesIO
+
+from robotide.contrib.testrunner.TestRunnerAgent import (StreamHandler, BatchWriter, DecodeError, FRAMING_BINARY,
+                                                         msgpack, TestRunnerAgent as RunnerAgent)
+from robotide.contrib.testrunner.testrunner import RideListenerServer, RideListenerHandler
+
+EVENT = ['log_message', [{'message': 'Hyvää päivää', 'level': 'INFO'}]]
+
+
+class TestStreamHandler(unittest.TestCase):
+
+    def _load_all(self, data):
+        handler = StreamHandler(BytesIO(data))
+        events = []
+        while True:
+            try:
+                events.extend(handler.load_events())
+            except EOFError:
+                return events
+
+    def test_json_messages_are_read_from_binary_stream(self):
+        fp = BytesIO()
+        StreamHandler(fp).dump(EVENT)
+        StreamHandler(fp).dump(['close', []])
+        assert self._load_all(fp.getvalue()) == [EVENT, ['close', []]]
+
+    def test_batches(self):
+        fp = BytesIO()
+        StreamHandler(fp).dump_batch([EVENT, EVENT])
+        StreamHandler(fp).dump(['close', []])
+        assert fp.getvalue()[:1] == b'B'
+        assert self._load_all(fp.getvalue()) == [EVENT, EVENT, ['close', []]]
+
+    @unittest.skipUnless(msgpack, 'msgpack is not installed')
+    def test_msgpack_batches(self):
+        fp = BytesIO()
+        StreamHandler(fp).dump_batch([EVENT], use_msgpack=True)
+        assert fp.getvalue()[:1] == b'M'
+        assert self._load_all(fp.getvalue()) == [EVENT]
+
+    def test_invalid_message(self):
+        with self.assertRaises(DecodeError):
+            StreamHandler(BytesIO(b'X12|foo')).load_events()
+
+    def test_batch_writer_writes_when_full_or_immediate(self):
+        fp = BytesIO()
+        writer = BatchWriter(StreamHandler(fp), size=3, interval=60)
+        writer.write(EVENT)
+        writer.write(EVENT)
+        assert fp.getvalue() == b''
+        writer.write(['paused', []], immediate=True)
+        assert self._load_all(fp.getvalue()) == [EVENT, EVENT, ['paused', []]]
+        for _ in range(4):
+            writer.write(EVENT)
+        assert len(self._load_all(fp.getvalue())) == 6
+        writer.close()
+        assert len(self._load_all(fp.getvalue())) == 7
+
+    def test_batch_writer_writes_after_interval(self):
+        fp = BytesIO()
+        writer = BatchWriter(StreamHandler(fp), interval=0.01)
+        writer.write(EVENT)
+        for _ in range(100):
+            if fp.getvalue():
+                break
+            time.sleep(0.01)
+        writer.close()
+        assert self._load_all(fp.getvalue()) == [EVENT]
+
+
+class TestAgentToListenerServer(unittest.TestCase):
+
+    def test_events_with_binary_framing(self):
+        events = []
+        closed = threading.Event()
+
+        def callback(name, *args):
+            events.append((name, args))
+            if name == 'close':
+                closed.set()
+        server = RideListenerServer(RideListenerHandler, callback)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        listener = RunnerAgent(server.server_address[1], 'False', FRAMING_BINARY)
+        try:
+            for i in range(1000):
+                listener.log_message({'message': 'message %d' % i, 'level': 'INFO'})
+            listener.close()
+            assert closed.wait(5)
+        finally:
+            listener._killer.shutdown()
+            listener._killer.server_close()
+            server.shutdown()
+            server.server_close()
+        names = [name for name, _ in events]
+        assert names[:2] == ['pid', 'port']
+        assert names[-1] == 'close'
+        assert [args[0]['message'] for name, args in events if name == 'log_message'] == \
+            ['message %d' % i for i in range(1000)]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -401,6 +401,40 @@ class TestCellInfo(unittest.TestCase):
         self._verify_cell_info(0, 0, ContentType.STRING, CellType.UNKNOWN)
         self._verify_cell_info(0, 1, ContentType.EMPTY, CellType.UNKNOWN)
 
+    def test_keyword_is_looked_up_once_for_all_columns(self):
+        self.test.execute(paste_area((0, 0), [['Get File', 'reaktor.robot', 'UTF-8', 'strict']]))
+        self.testsuite.imports.add_library('OperatingSystem', [], '')
+        self.test.get_keyword_info('Get File')  # Library is loaded and namespace updated
+        step = self.test.steps[0]
+        looked_up = []
+        get_keyword_info = self.test.get_keyword_info
+        self.test.get_keyword_info = lambda name: looked_up.append(name) or get_keyword_info(name)
+        try:
+            infos = [step.get_cell_info(col) for col in range(6)]
+            assert [info.cell_type for info in infos] == [CellType.KEYWORD, CellType.MANDATORY, CellType.OPTIONAL,
+                                                           CellType.OPTIONAL, CellType.MUST_BE_EMPTY,
+                                                           CellType.MUST_BE_EMPTY]
+            assert looked_up == ['Get File', 'reaktor.robot', 'UTF-8', 'strict']
+            looked_up.clear()
+            assert step.get_cell_info(1).cell_type == CellType.MANDATORY
+            assert looked_up == []
+            step.change(2, 'ASCII')
+            assert step.get_cell_info(1).cell_type == CellType.MANDATORY
+            assert looked_up
+        finally:
+            del self.test.get_keyword_info
+            self.testsuite.imports.delete(-1)
+
+    def test_analysis_of_step_is_renewed_when_namespace_changes(self):
+        self.test.execute(paste_area((0, 0), [['Get File', 'reaktor.robot']]))
+        step = self.test.steps[0]
+        assert step.get_cell_info(0).content_type == ContentType.STRING
+        self.testsuite.imports.add_library('OperatingSystem', [], '')
+        assert step.get_cell_info(0).content_type == ContentType.LIBRARY_KEYWORD
+        assert step.get_cell_info(1).cell_type == CellType.MANDATORY
+        self.testsuite.imports.delete(-1)
+        assert step.get_cell_info(0).content_type == ContentType.STRING
+
     def _verify_string_change(self, row, col, celltype):
         self._verify_cell_info(row, col, ContentType.EMPTY, celltype)
         self.test.execute(ChangeCellValue(row, col, 'diipadaapa'))
@@ -0,0 +1,235 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from robotide.controller import dataloader
+from robotide.controller.modelcache import ParsedModelCache
+from robotide.robotapi import ROBOT_LOGGER, TestCaseFile, TestDataDirectory
+
+TEST_FILE = """\
+*** Settings ***
+Library    Collections
+Resource    ../common.resource
+
+*** Variables ***
+${VALUE}    %(index)d
+
+*** %(section)s ***
+%(tests)s
+*** Keywords ***
+My Keyword
+    [Arguments]    ${arg}
+    Log    ${arg}
+"""
+
+TEST = """\
+Test %(index)d
+    [Documentation]    Test number %(index)d
+    [Tags]    t%(index)d    smoke
+    ${x}=    Set Variable    ${VALUE}
+    Log    Hello ${x}    WARN
+    FOR    ${i}    IN RANGE    3
+        Log    ${i}
+    END
+    My Keyword    ${x}
+
+"""
+
+
+def generate_tree(root, directories, files, tests):
+    with open(os.path.join(root, 'common.resource'), 'w') as resource:
+        resource.write('*** Keywords ***\nCommon\n    No Operation\n')
+    for d in range(directories):
+        directory = os.path.join(root, 'suite_%02d' % d)
+        os.makedirs(directory)
+        with open(os.path.join(directory, '__init__.robot'), 'w') as init_file:
+            init_file.write('*** Settings ***\nDocumentation    Suite %d\n' % d)
+        for f in range(files):
+            section = 'Tasks' if f == 1 else 'Test Cases'
+            with open(os.path.join(directory, 'test_%03d.robot' % f), 'w') as test_file:
+                test_file.write(TEST_FILE % {'index': f, 'section': section,
+                                             'tests': ''.join(TEST % {'index': t} for t in range(tests))})
+        with open(os.path.join(directory, 'invalid.robot'), 'w') as invalid:
+            invalid.write('*** Settings ***\nNon Existing    value\n\n*** Test Cases ***\nTest\n    No Operation\n')
+        with open(os.path.join(directory, 'keywords.resource'), 'w') as resource:
+            resource.write('*** Keywords ***\nKeyword\n    No Operation\n')
+    os.makedirs(os.path.join(root, 'excluded'))
+    with open(os.path.join(root, 'excluded', 'excluded.robot'), 'w') as excluded:
+        excluded.write('*** Test Cases ***\nTest\n    No Operation\n')
+
+
+class _Excludes(object):
+
+    def __init__(self, *paths):
+        self._paths = paths
+
+    def contains(self, path, excludes=None):
+        return any(path.startswith(p) for p in self._paths)
+
+
+class _Settings(dict):
+
+    def __init__(self, root):
+        dict.__init__(self, {'txt number of spaces': 4})
+        self.excludes = _Excludes(os.path.join(root, 'excluded'))
+
+
+class _MessageRecorder(object):
+
+    def __init__(self):
+        self.messages = []
+
+    def message(self, msg):
+        if msg.level in ('WARN', 'ERROR'):
+            self.messages.append((msg.message, msg.level))
+
+
+def model_summary(data, depth=0):
+    summary = [(depth, type(data).__name__, data.source, getattr(data.parent, 'source', None),
+                getattr(data, 'tasks', None))]
+    if isinstance(data, (TestCaseFile, TestDataDirectory)):
+        summary.extend((test.name, test.parent.parent is data, [step.as_list() for step in test.steps])
+                       for test in data.testcase_table.tests)
+        summary.extend(keyword.name for keyword in data.keyword_table.keywords)
+        summary.extend(setting.as_list() for setting in data.setting_table)
+    for child in data.children:
+        summary.extend(model_summary(child, depth + 1))
+    return summary
+
+
+class TestParallelParsing(unittest.TestCase):
+
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self._recorder = _MessageRecorder()
+        ROBOT_LOGGER.register_logger(self._recorder)
+
+    def tearDown(self):
+        ROBOT_LOGGER.unregister_logger(self._recorder)
+        shutil.rmtree(self._root)
+
+    def test_model_is_same_as_when_parsing_sequentially(self):
+        generate_tree(self._root, directories=3, files=4, tests=3)
+        sequential, sequential_messages = self._parse()
+        parallel, parallel_messages = self._parse(processes=2)
+        self.assertEqual(model_summary(parallel), model_summary(sequential))
+        self.assertEqual(sorted(set(parallel_messages)), sorted(set(sequential_messages)))
+        self.assertTrue(any('Non Existing' in message for message, _ in parallel_messages))
+
+    def test_small_projects_are_parsed_sequentially(self):
+        generate_tree(self._root, directories=1, files=2, tests=1)
+        with dataloader.ParallelParser(2) as parser:
+            self.assertIsNone(parser.parse_directory(self._root, _Settings(self._root)))
+
+    def _parse(self, processes=0):
+        self._recorder.messages = []
+        settings = _Settings(self._root)
+        if not processes:
+            data = dataloader.test_data(self._root, settings=settings)
+        else:
+            with dataloader.ParallelParser(processes, min_files=1) as parser:
+                parsed_files = parser.parse_directory(self._root, settings)
+                data = dataloader.test_data(self._root, settings=settings, parsed_files=parsed_files)
+                self.assertEqual(len(parsed_files), 0)
+        return data, self._recorder.messages
+
+
+class TestParsedModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self._cache_file = os.path.join(self._root, 'models.db')
+        self._data = os.path.join(self._root, 'data')
+        os.makedirs(self._data)
+        generate_tree(self._data, directories=2, files=3, tests=2)
+        self._recorder = _MessageRecorder()
+        ROBOT_LOGGER.register_logger(self._recorder)
+
+    def tearDown(self):
+        ROBOT_LOGGER.unregister_logger(self._recorder)
+        shutil.rmtree(self._root)
+
+    def test_unchanged_files_are_not_parsed_again(self):
+        first, first_messages = self._load()
+        with patch.object(dataloader, '_parse_datafile', side_effect=AssertionError('parsed')):
+            second, second_messages = self._load()
+        self.assertEqual(model_summary(second), model_summary(first))
+        self.assertEqual(model_summary(first), model_summary(self._load(cache=False)[0]))
+        self.assertEqual(second_messages, first_messages)
+        self.assertTrue(any('Non Existing' in message for message, _ in second_messages))
+
+    def test_changed_file_is_parsed_again(self):
+        self._load()
+        path = os.path.join(self._data, 'suite_00', 'test_000.robot')
+        with open(path, 'a') as test_file:
+            test_file.write('New Keyword\n    No Operation\n')
+        data, _ = self._load()
+        suite = [c for c in data.children if c.source.endswith('suite_00')][0]
+        test_file = [c for c in suite.children if c.source.endswith('test_000.robot')][0]
+        keywords = [kw.name for kw in test_file.keyword_table.keywords]
+        self.assertEqual(keywords, ['My Keyword', 'New Keyword'])
+
+    def test_model_is_not_used_with_different_language_or_tab_size(self):
+        path = os.path.join(self._data, 'suite_00', 'test_000.robot')
+        cache = ParsedModelCache(self._cache_file)
+        stat = os.stat(path)
+        cache.put(path, None, 4, (stat.st_mtime_ns, stat.st_size), ('model', None, None, []))
+        self.assertEqual(cache.get(path, None, 4), ('model', None, None, []))
+        self.assertIsNone(cache.get(path, ['fi'], 4))
+        self.assertIsNone(cache.get(path, None, 2))
+        cache.put(path, None, 4, (stat.st_mtime_ns - 1, stat.st_size), ('model', None, None, []))
+        self.assertIsNone(cache.get(path, None, 4))
+        cache.close()
+
+    def test_freshness_is_checked_without_reading_the_model(self):
+        path = os.path.join(self._data, 'suite_00', 'test_000.robot')
+        self._load()
+        cache = ParsedModelCache(self._cache_file)
+        statements = []
+        cache._connection.set_trace_callback(statements.append)
+        self.assertTrue(cache.is_fresh(path, None, 4))
+        self.assertFalse(cache.is_fresh(path, None, 2))
+        self.assertFalse(any('model from' in statement for statement in statements))
+        cache.close()
+
+    def test_broken_model_is_ignored(self):
+        path = os.path.join(self._data, 'suite_00', 'test_000.robot')
+        self._load()
+        cache = ParsedModelCache(self._cache_file)
+        cache._connection.execute("update models set model = x'00'")
+        self.assertIsNone(cache.get(path, None, 4))
+        cache.close()
+
+    def _load(self, cache=True):
+        self._recorder.messages = []
+        settings = _Settings(self._data)
+        model_cache = ParsedModelCache(self._cache_file) if cache else None
+        try:
+            with dataloader.ParallelParser(0, model_cache) as parser:
+                parsed_files = parser.parse_directory(self._data, settings)
+                data = dataloader.test_data(self._data, settings=settings, parsed_files=parsed_files)
+        finally:
+            if model_cache:
+                model_cache.close()
+        return data, self._recorder.messages
+
+
+if __name__ == '__main__':
+    unittest.main()
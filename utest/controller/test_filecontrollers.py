@@ -125,6 +125,22 @@ class TestCaseFileControllerTest(unittest.TestCase):
         test_ctrl = self.ctrl.create_test('Foo')
         assert test_ctrl.name == 'Foo'
 
+    def test_find_test(self):
+        foo = self.ctrl.create_test('Foo')
+        bar = self.ctrl.create_test('Bar')
+        assert self.ctrl.find_test('Foo') is foo
+        assert self.ctrl.find_controller_by_longname('Test.Cases.Bar', 'Bar') is bar
+        assert self.ctrl.find_test('Quux') is None
+
+    def test_find_test_after_changes(self):
+        foo = self.ctrl.create_test('Foo')
+        assert self.ctrl.find_test('Foo') is foo
+        foo.rename('Renamed')
+        assert self.ctrl.find_test('Foo') is None
+        assert self.ctrl.find_test('Renamed') is foo
+        foo.delete()
+        assert self.ctrl.find_test('Renamed') is None
+
     def test_create_keyword(self):
         kw_ctrl = self.ctrl.create_keyword('An UK')
         assert kw_ctrl.name == 'An UK'
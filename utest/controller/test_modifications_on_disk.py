@@ -26,7 +26,7 @@ from robotide.controller.filecontrollers import (
     TestCaseFileController, TestDataDirectoryController,
     ResourceFileController)
 from robotide.controller import Project
-from robotide.publish.messages import RideDataFileRemoved
+from robotide.publish.messages import RideDataFileRemoved, RideDataFileSet
 from robotide.publish import PUBLISHER
 from robotide.namespace.namespace import Namespace
 from robotide.spec.librarymanager import LibraryManager
@@ -226,5 +226,75 @@ class DeleteCommandTest(_DataDependentTest):
         assert len(self.suite.setting_table.imports) == import_count
 
 
+class TestReloadChangedFiles(_DataDependentTest):
+
+    def setUp(self):
+        _DataDependentTest.setUp(self)
+        self.project = create_project()
+        self.project.load_data(self._dirpath)
+        self.suite = self.project.data.suites[0]
+        self.resource = self.project.resources[0]
+        self._changed = []
+        PUBLISHER.subscribe(self._datafile_set, RideDataFileSet)
+
+    def tearDown(self):
+        PUBLISHER.unsubscribe(self._datafile_set, RideDataFileSet)
+        _DataDependentTest.tearDown(self)
+
+    def _datafile_set(self, message):
+        self._changed.append(message.item)
+
+    def test_modified_suite_is_reloaded_in_place(self):
+        with open(self._filepath, 'a') as file:
+            file.write('Second Test\n  Log  Hello World!\n')
+        os.utime(self._filepath, (1, 1))
+        assert self.project.reload_changed_files([self._filepath])
+        assert self.project.data.suites == [self.suite]
+        assert [test.name for test in self.suite.tests] == ['Ride Unit Test', 'Second Test']
+        assert self.project.data.data.children == [self.suite.data]
+        assert self._changed == [self.suite]
+        assert self.project.resources == [self.resource]
+
+    def test_modified_resource_is_reloaded_in_place(self):
+        with open(self._resource_path, 'a') as resource:
+            resource.write('Second Keyword  No Operation\n')
+        os.utime(self._resource_path, (1, 1))
+        assert self.project.reload_changed_files([self._resource_path])
+        assert [kw.name for kw in self.resource.keywords] == ['Unit Test Keyword', 'Second Keyword']
+        assert self.project.namespace.get_resource(self._resource_path) is self.resource.data
+        assert self._changed == [self.resource]
+
+    def test_unmodified_files_are_not_reloaded(self):
+        assert self.project.reload_changed_files([self._filepath, self._resource_path])
+        assert self._changed == []
+
+    def test_created_suite_and_resource_are_added(self):
+        suite_path = os.path.join(self._dirpath, 'new.robot')
+        with open(suite_path, 'w') as file:
+            file.write('*** Test Cases ***\nNew Test\n  No Operation\n')
+        resource_path = os.path.join(self._dirpath, 'new.resource')
+        with open(resource_path, 'w') as file:
+            file.write('*** Keywords ***\nNew Keyword\n  No Operation\n')
+        assert self.project.reload_changed_files([suite_path, resource_path])
+        new_suite = [child for child in self.project.data.suites if child.filename == suite_path][0]
+        assert new_suite.tests[0].name == 'New Test'
+        assert new_suite.data in self.project.data.data.children
+        assert [res.filename for res in self.project.resources] == [self._resource_path, resource_path]
+
+    def test_removed_suite_and_resource_are_removed(self):
+        os.remove(self._filepath)
+        os.remove(self._resource_path)
+        assert self.project.reload_changed_files([self._filepath, self._resource_path])
+        assert self.project.data.children == []
+        assert self.project.data.data.children == []
+        assert self.project.resources == []
+
+    def test_changed_init_file_or_directory_needs_full_reload(self):
+        assert not self.project.reload_changed_files([self._init_path])
+        new_directory = os.path.join(self._dirpath, 'new_directory')
+        os.mkdir(new_directory)
+        assert not self.project.reload_changed_files([new_directory])
+
+
 if __name__ == "__main__":
     unittest.main()
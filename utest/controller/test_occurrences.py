@@ -6,6 +6,7 @@ from robotide.controller.macrocontrollers import KEYWORD_NAME_FIELD
 from robotide.controller.ctrlcommands import (
     Undo, FindOccurrences, FindVariableOccurrences, NullObserver,
     RenameKeywordOccurrences, ChangeCellValue)
+from robotide.controller.keywordusages import KeywordCalls, KeywordUsageIndex
 from robotide.controller.filecontrollers import (
     TestCaseFileController, TestCaseTableController, TestCaseController)
 from robotide.publish import PUBLISHER
@@ -306,6 +307,95 @@ class FindOccurrencesTest(unittest.TestCase):
                           USERKEYWORD1_NAME, KEYWORD_NAME_FIELD)
 
 
+class _Step(object):
+
+    def __init__(self, *cells):
+        self._cells = list(cells)
+
+    def as_list(self):
+        return self._cells
+
+
+class _Datafile(object):
+
+    def __init__(self, language, steps):
+        self.language = language
+        self.settings = steps
+        self.tests = []
+        self.keywords = []
+
+
+class KeywordUsageIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.test_ctrl, self.namespace = TestCaseControllerWithSteps()
+        self.datafile_ctrl = self.test_ctrl.datafile_controller
+
+    def _usages(self, *names):
+        items = self.datafile_ctrl.keyword_usages.items_using(names, self.datafile_ctrl.source)
+        return [item.as_list() if hasattr(item, 'as_list') else item.parent.name for item in items]
+
+    def test_index_finds_items_in_datafile_order(self):
+        assert self._usages('No Operation') == [['Run Keyword', 'No Operation'], ['No Operation'],
+                                                      ['No Operation']]
+
+    def test_index_finds_names_with_bdd_and_resource_prefix(self):
+        self.test_ctrl.execute(ChangeCellValue(0, 0, 'Given some_resource.User Keyword'))
+        assert self._usages('userkeyword') == [['Given some_resource.User Keyword', 'Hello'], USERKEYWORD1_NAME]
+        assert self._usages('some resource.user keyword') == [['Given some_resource.User Keyword', 'Hello']]
+
+    def test_index_does_not_find_words_inside_names(self):
+        assert self._usages('Operation') == []
+        assert self._usages('Keyword') == []
+
+    def test_index_finds_names_with_localized_bdd_prefix(self):
+        step = _Step('Oletetaan User Keyword')
+        assert KeywordUsageIndex(_Datafile(['fi'], [step])).items_using(['userkeyword'], None) == [step]
+        assert KeywordUsageIndex(_Datafile(None, [step])).items_using(['userkeyword'], None) == []
+        step = _Step('Oletetaan some_resource.User Keyword')
+        assert KeywordUsageIndex(_Datafile(['fi'], [step])).items_using(['someresource.userkeyword'],
+                                                                         None) == [step]
+        assert KeywordUsageIndex(_Datafile(None, [step])).items_using(['someresource.userkeyword'],
+                                                                      None) == []
+
+    def test_usage_counts(self):
+        counts = self.datafile_ctrl.keyword_usages.usage_counts
+        assert counts['nooperation'] == 3
+        self.test_ctrl.execute(ChangeCellValue(0, 0, 'some_resource.User Keyword'))
+        counts = self.datafile_ctrl.keyword_usages.usage_counts
+        assert counts['someresource.userkeyword'] == counts['userkeyword'] == 1
+
+    def test_keyword_name_is_found_only_from_keyword_source(self):
+        assert self.datafile_ctrl.keyword_usages.items_using([USERKEYWORD1_NAME], 'other.robot') == []
+
+    def test_keyword_calls(self):
+        user_keyword, juuser_keyword, embedded_keyword = self.datafile_ctrl.keywords
+        calls = self._keyword_calls()
+        assert not calls.is_used(user_keyword)
+        assert calls.count(juuser_keyword) == 1
+        assert calls.count(embedded_keyword) == 1
+        self.test_ctrl.execute(ChangeCellValue(0, 0, 'Given ' + USERKEYWORD1_NAME))
+        self.test_ctrl.execute(ChangeCellValue(1, 1, USERKEYWORD1_NAME))
+        self.test_ctrl.execute(ChangeCellValue(2, 1, USERKEYWORD2_NAME))
+        calls = self._keyword_calls()
+        assert calls.count(user_keyword) == 2
+        assert calls.count(juuser_keyword) == 1
+        assert calls.is_used(user_keyword)
+
+    def _keyword_calls(self):
+        calls = KeywordCalls()
+        calls.add_datafile(self.datafile_ctrl)
+        return calls
+
+    def test_index_is_rebuilt_when_steps_change(self):
+        index = self.datafile_ctrl.keyword_usages
+        assert self.datafile_ctrl.keyword_usages is index
+        assert list(self.test_ctrl.execute(FindOccurrences('Keyword Name'))) == []
+        self.test_ctrl.execute(ChangeCellValue(0, 0, 'Keyword Name'))
+        assert self.datafile_ctrl.keyword_usages is not index
+        assert_occurrence(self.test_ctrl, 'Keyword Name', TEST1_NAME, 'Steps')
+
+
 class FindVariableOccurrencesTest(unittest.TestCase):
 
     @classmethod
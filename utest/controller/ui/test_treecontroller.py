@@ -132,6 +132,71 @@ class TestNavigationHistory(_BaseTreeControllerTest, unittest.TestCase):
             self._go_forward_and_return_selection() == expected_selection)
 
 
+class _FakeTree(object):
+
+    def __init__(self, controllers):
+        self.root = 'root'
+        self.handlers = {}
+        self.children = {self.root: []}
+        self.visited = 0
+        for index, controller in enumerate(controllers):
+            self.add('node %d' % index, controller)
+
+    def add(self, node, controller):
+        self.handlers[node] = type('Handler', (object,), {'controller': controller})()
+        self.children[self.root].append(node)
+
+    def GetItemData(self, node):
+        self.visited += 1
+        return self.handlers.get(node)
+
+    def GetFirstChild(self, node):
+        return self.GetNextChild(node, 0)
+
+    def GetNextChild(self, node, cookie):
+        children = self.children.get(node, [])
+        return (children[cookie], cookie + 1) if cookie < len(children) else (None, cookie)
+
+    def ItemHasChildren(self, node):
+        return bool(self.children.get(node))
+
+
+class TestFindNodeByController(unittest.TestCase):
+
+    def setUp(self):
+        self.controllers = [object() for _ in range(100)]
+        self.tree = _FakeTree(self.controllers)
+        self.controller = TreeController(self.tree, None, None, None)
+
+    def test_registered_node_is_found_without_search(self):
+        self.controller.register_node('node 42', self.controllers[42])
+        assert self.controller.find_node_by_controller(self.controllers[42]) == 'node 42'
+        assert self.tree.visited == 1
+
+    def test_unregistered_node_is_searched_and_remembered(self):
+        assert self.controller.find_node_by_controller(self.controllers[42]) == 'node 42'
+        self.tree.visited = 0
+        assert self.controller.find_node_by_controller(self.controllers[42]) == 'node 42'
+        assert self.tree.visited == 1
+
+    def test_node_with_other_controller_is_not_returned(self):
+        self.controller.register_node('node 1', self.controllers[2])
+        assert self.controller.find_node_by_controller(self.controllers[2]) == 'node 2'
+
+    def test_unregister_node(self):
+        self.controller.register_node('node 3', self.controllers[3])
+        self.controller.unregister_node('node 3')
+        self.tree.children[self.tree.root].remove('node 3')
+        assert self.controller.find_node_by_controller(self.controllers[3]) is None
+
+    def test_clear_nodes(self):
+        self.controller.register_node('node 3', self.controllers[3])
+        self.controller.clear_nodes()
+        self.tree.visited = 0
+        self.controller.find_node_by_controller(self.controllers[3])
+        assert self.tree.visited == 4
+
+
 class TestTestSelectionController(UIUnitTestBase):
 
     def setUp(self):
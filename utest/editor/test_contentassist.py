@@ -85,6 +85,18 @@ class TestSuggestions(unittest.TestCase):
         choices = suggestions.get_for('a')
         self.assertEqual(choices, ['aarnio', 'fo.aaatio', 'bA.AAATIO'])
 
+    def test_ranked_suggestions_keep_order_and_are_not_cached(self):
+        mock_source = self._create_mock_source()
+        mock_source.get_ranked_suggestions = lambda value, row=None: self._suggestions(
+            ('zeta', 'fo.zeta'), ('aarnio', 'fo.aarnio'))
+        suggestions = Suggestions(mock_source, ranked=True)
+        self.assertEqual(suggestions.get_for('za'), ['zeta', 'aarnio'])
+        self.assertEqual(suggestions.get_for('zaa'), ['zeta', 'aarnio'])
+        self.assertEqual(mock_source.request_count, 0)
+
+    def test_ranked_requires_ranked_source(self):
+        self.assertFalse(Suggestions(self._create_mock_source(), ranked=True).ranked)
+
     def test_bdd_suggestions_en(self):
         choices = obtain_bdd_prefixes('En')
         self.assertEqual(choices.sort(), ['Given', 'When', 'Then', 'And', 'But'].sort())
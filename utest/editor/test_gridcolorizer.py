@@ -318,6 +318,130 @@ class TestPerformance(unittest.TestCase):
             colorizer._colorize_cell(1,1, cdata)
 
 
+class ScrolledMockGrid(MockGrid):
+    NumberRows = 400
+    NumberCols = 5
+    row_height = 20
+    window_height = 200
+
+    def __init__(self):
+        self.top = 0
+        self.colored = []
+        self.refreshed = 0
+        self.values = {}
+
+    def SetCellBackgroundColour(self, row, col, color):
+        self.colored.append((row, col))
+
+    def GetCellValue(self, row, col):
+        return self.values.get((row, col), 'kw%d' % row if col == 0 else '')
+
+    def CalcUnscrolledPosition(self, x, y):
+        return x, y + self.top
+
+    def GetGridWindow(self):
+        return self
+
+    def GetClientSize(self):
+        return Size(600, self.window_height)
+
+    def YToRow(self, y):
+        row = y // self.row_height
+        return row if row < self.NumberRows else -1
+
+    def ForceRefresh(self):
+        self.refreshed += 1
+
+
+class CountingController(ControllerWithCellInfo):
+
+    def __init__(self):
+        ControllerWithCellInfo.__init__(self)
+        self.cell_info_calls = 0
+
+    def get_cell_info(self, row, column):
+        self.cell_info_calls += 1
+        return ControllerWithCellInfo.get_cell_info(self, row, column)
+
+
+class TestVisibleRowColoring(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = ScrolledMockGrid()
+        self.controller = CountingController()
+        self.colorizer = Colorizer(self.grid, self.controller)
+
+    def _color(self, selection_content=''):
+        self.colorizer.colorize(selection_content)
+        self._run_task()
+
+    def _run_task(self):
+        # Runs the batches that would be run one event loop round at a time
+        task_id = self.colorizer._current_task_id
+        rows = None
+        while self.grid.refreshed == 0:
+            rows = self._run_batch(task_id, rows)
+        self.grid.refreshed = 0
+
+    def _run_batch(self, task_id, rows):
+        if rows is None:
+            rows = self.colorizer._rows_to_color()
+            rows.reverse()
+        self.colorizer._coloring_task(task_id, self.colorizer._selection_content, rows)
+        return rows
+
+    def _colored_rows(self):
+        return sorted(set(row for row, _ in self.grid.colored))
+
+    def test_only_rows_in_view_and_margin_are_colored(self):
+        self.grid.top = 100 * self.grid.row_height
+        self._color()
+        assert self._colored_rows() == list(range(80, 131))
+        assert self.controller.cell_info_calls == 51 * self.grid.NumberCols
+
+    def test_rows_in_view_are_colored_first_in_batches(self):
+        self.grid.top = 100 * self.grid.row_height
+        self.colorizer.colorize('')
+        rows = self._run_batch(self.colorizer._current_task_id, None)
+        assert rows
+        assert self._colored_rows() == list(range(91, 131))
+        assert self.grid.refreshed == 0
+
+    def test_rows_scrolled_into_view_are_colored(self):
+        self._color()
+        assert self._colored_rows() == list(range(0, 31))
+        self.grid.top = 200 * self.grid.row_height
+        self.grid.colored = []
+        self.colorizer.colorize_view()
+        self._run_task()
+        assert self._colored_rows() == list(range(180, 231))
+
+    def test_new_selection_uses_cached_cell_info(self):
+        self._color()
+        calls = self.controller.cell_info_calls
+        self.grid.colored = []
+        self._color('kw3')
+        assert self._colored_rows() == list(range(0, 31))
+        assert self.controller.cell_info_calls == calls
+
+    def test_changed_row_and_invalidate_get_new_cell_info(self):
+        self._color()
+        calls = self.controller.cell_info_calls
+        self.grid.values[(2, 0)] = 'changed'
+        self._color('kw3')
+        assert self.controller.cell_info_calls == calls + self.grid.NumberCols
+        self.colorizer.invalidate()
+        self._color('kw3')
+        assert self.controller.cell_info_calls == calls + 32 * self.grid.NumberCols
+
+    def test_nothing_is_colored_again_without_changes(self):
+        self._color('kw1')
+        self.grid.colored = []
+        self.colorizer.colorize_view()
+        self._color('kw1')
+        assert self.grid.colored == []
+
+
 class TestColorIdentification(unittest.TestCase):
     _data = ['xyz', 'FOR', 'try', 'for', 'LOG', 'My KW']
     _type = [CellInfo(CellContent(ContentType.STRING, _data[0]), CellPosition(CellType.UNKNOWN, None)),
@@ -382,7 +506,7 @@ class TestColorIdentification(unittest.TestCase):
     def test_private_bad(self):
         grid = MockGrid()
         colorizer = Colorizer(grid, ControllerWithCellInfo('Another Test', 'other'))
-        colorizer._coloring_task(0, 'My KW', 1, 1)
+        colorizer._colorize_cell(1, 1, 'My KW')
         txt_color = colorizer._get_text_color(self._type[5])
         # print(f"DEBUG: Text color={txt_color.title().upper()}")
         self._type[5].set_or_clear_error(True)  # forcing error
@@ -0,0 +1,210 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+from bisect import bisect_right
+from multiprocessing import shared_memory
+
+from robotide.editor.incrementalstyler import IncrementalStyler
+from robotide.lib.compat.pygments import robotframework as robotframeworklexer
+
+SETTINGS = """\
+*** Settings ***
+Documentation     Styling test data
+...               with a continuation row
+Library           OperatingSystem
+Test Template     Should Be Equal
+
+"""
+
+VARIABLES = """\
+*** Variables ***
+${NAME}           Hyvää päivää
+@{LIST}           one    two
+...               three
+
+"""
+
+TEST = """\
+Test {index}
+    [Documentation]    Test ${{NAME}} number {index}
+    Given something    ${{LIST}}[0]    # comment
+    ${{result}}=    Keyword {index}    ${{NAME}}
+    ...    more    arguments
+    FOR    ${{item}}    IN    @{{LIST}}
+        Log    ${{item}}
+    END
+
+"""
+
+KEYWORD = """\
+Keyword {index}
+    [Arguments]    ${{arg}}    ${{other}}
+    Log Many    ${{arg}}    ${{other}}
+    [Return]    ${{arg}}
+
+"""
+
+
+def robot_data(tests):
+    return (SETTINGS + VARIABLES + '*** Test Cases ***\n' + ''.join(TEST.format(index=i) for i in range(tests)) +
+            '*** Keywords ***\n' + ''.join(KEYWORD.format(index=i) for i in range(tests)))
+
+
+class FakeEditor(object):
+    """The parts of StyledTextCtrl used in styling, with UTF-8 positions."""
+
+    def __init__(self, text):
+        self.set_text(text)
+
+    def set_text(self, text):
+        self._data = text.encode('utf-8')
+        self.styles = bytearray(len(self._data))
+        self._line_starts = [0] + [i + 1 for i, c in enumerate(self._data) if c == 10]
+        self.end_styled = 0
+        self._position = 0
+
+    def insert(self, position, text):
+        data = self._data[:position] + text.encode('utf-8') + self._data[position:]
+        styles = self.styles[:position] + bytearray(len(text.encode('utf-8'))) + self.styles[position:]
+        end_styled = min(self.end_styled, position)
+        self.set_text(data.decode('utf-8'))
+        self.styles = styles
+        self.end_styled = end_styled
+
+    def position_of(self, text):
+        return self._data.index(text.encode('utf-8'))
+
+    def GetLength(self):
+        return len(self._data)
+
+    def GetEndStyled(self):
+        return self.end_styled
+
+    def GetLineCount(self):
+        return len(self._line_starts)
+
+    def LineFromPosition(self, position):
+        return bisect_right(self._line_starts, position) - 1
+
+    def PositionFromLine(self, line):
+        return self._line_starts[line]
+
+    def GetTextRange(self, start, end):
+        return self._data[start:end].decode('utf-8')
+
+    def StartStyling(self, position):
+        self._position = position
+
+    def SetStyling(self, length, style):
+        assert self._position + length <= len(self._data)
+        self.styles[self._position:self._position + length] = bytes([style]) * length
+        self._position += length
+        self.end_styled = self._position
+
+
+class TestIncrementalStyler(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            self.shared_mem = shared_memory.ShareableList(['en'], name="language")
+        except FileExistsError:  # Other instance created file
+            self.shared_mem = shared_memory.ShareableList(name="language")
+        self.lexer = robotframeworklexer.RobotFrameworkLexer()
+        tokens = ('ARGUMENT', 'COMMENT', 'ERROR', 'GHERKIN', 'HEADING', 'IMPORT', 'KEYWORD', 'SEPARATOR',
+                  'SETTING', 'SYNTAX', 'TC_KW_NAME', 'VARIABLE')
+        self.styles = {getattr(robotframeworklexer, token): index for index, token in enumerate(tokens)}
+
+    def tearDown(self):
+        self.shared_mem.shm.close()
+        self.shared_mem.shm.unlink()
+
+    def _styler(self, editor):
+        return IncrementalStyler(editor, robotframeworklexer, self.lexer, self.styles)
+
+    def _expected_styles(self, text):
+        # Styling of the whole text like done before incremental styling
+        styles = bytearray()
+        for _, token, value in self.lexer.get_tokens_unprocessed(text):
+            styles += bytes([self.styles[token]]) * len(value.encode('utf-8'))
+        return styles[:len(text.encode('utf-8'))]
+
+    def _assert_styled_like_whole_text(self, editor):
+        expected = self._expected_styles(editor.GetTextRange(0, editor.GetLength()))
+        assert editor.end_styled == editor.GetLength()
+        assert editor.styles == expected
+
+    def test_styling_whole_text(self):
+        editor = FakeEditor(robot_data(3))
+        self._styler(editor).style()
+        self._assert_styled_like_whole_text(editor)
+
+    def test_styling_to_given_position(self):
+        editor = FakeEditor(robot_data(3))
+        styler = self._styler(editor)
+        end = editor.position_of('Test 1')
+        styler.style(end)
+        assert end <= editor.end_styled < editor.GetLength()
+        styler.style(end)
+        styler.style()
+        self._assert_styled_like_whole_text(editor)
+
+    def test_restyling_after_changes(self):
+        editor = FakeEditor(robot_data(5))
+        styler = self._styler(editor)
+        styler.style()
+        for text, position in [('    Log    ${NAME}\n', 'Keyword 2\n'),
+                               ('    ... ', '    ...    more    arguments'),
+                               ('    [Template]    Log\n', '    [Documentation]    Test ${NAME} number 3'),
+                               ('*** Keywords ***\n', 'Test 4\n'),
+                               ('Ä', 'Test 1\n'),
+                               ('#', '*** Test Cases ***')]:
+            editor.insert(editor.position_of(position), text)
+            styler.style()
+            self._assert_styled_like_whole_text(editor)
+
+    def test_only_changed_block_is_restyled(self):
+        editor = FakeEditor(robot_data(100))
+        styler = self._styler(editor)
+        styler.style()
+        editor.insert(editor.position_of('Keyword 50\n'), '    Log    Hello\n')
+        assert editor.end_styled == editor.position_of('    Log    Hello\n')
+        styled = []
+        set_styling = editor.SetStyling
+        editor.SetStyling = lambda length, style: styled.append(length) or set_styling(length, style)
+        styler.style(editor.position_of('Keyword 51\n'))
+        # From the start of Keyword 49 to the end of the line of Keyword 51
+        assert sum(styled) < 300
+
+    def test_restyled_range_does_not_depend_on_file_size(self):
+        for tests in (20, 200):
+            editor = FakeEditor(robot_data(tests))
+            styler = self._styler(editor)
+            styler.style()
+            styled = []
+            set_styling = editor.SetStyling
+            editor.SetStyling = lambda length, style: styled.append(length) or set_styling(length, style)
+            for index in range(0, tests - 1, tests // 10):
+                editor.insert(editor.position_of('Keyword %d\n' % index), '    No Operation\n')
+                del styled[:]
+                styler.style(editor.position_of('Keyword %d\n' % (index + 1)))
+                # At most from the start of the previous keyword to the end of the line of the next one
+                assert sum(styled) < 300, (tests, index, sum(styled))
+                # Like scrolling through the rest of the file before the next change
+                styler.style()
+            self._assert_styled_like_whole_text(editor)
+
+if __name__ == '__main__':
+    unittest.main()
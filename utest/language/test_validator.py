@@ -0,0 +1,91 @@
+#  Copyright 2023-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from robot.api import Token
+from robot.api.parsing import get_model, get_tokens
+
+from robotide.lib.compat.parsing import ErrorReporter, find_token_error
+from robotide.lib.robot.errors import DataError
+
+VALID = """\
+*** Settings ***
+Library    OperatingSystem
+
+*** Test Cases ***
+Test
+    Log    Hello
+
+*** Keywords ***
+Keyword
+    [Arguments]    ${arg}
+    Log    ${arg}
+"""
+
+INVALID_LANGUAGE = "Language: Xyz\n\n" + VALID
+
+FINNISH = """\
+*** Asetukset ***
+Kirjasto    OperatingSystem
+
+*** Testit ***
+Test
+    Log    Hei
+"""
+
+
+def _first_token_error(text, lang=None):
+    # The result of tokenizing the text separately
+    for token in get_tokens(text, lang=lang):
+        if token.type in (Token.ERROR, Token.INVALID_HEADER):
+            return token
+    return None
+
+
+class TestFindTokenError(unittest.TestCase):
+
+    def test_valid_data(self):
+        model = get_model(VALID)
+        assert find_token_error(model) is None
+        ErrorReporter().visit(model)
+
+    def test_error_token_is_found_from_model(self):
+        token = find_token_error(get_model(INVALID_LANGUAGE))
+        assert token.type == Token.ERROR
+        assert token.value == 'Language: Xyz'
+        assert repr(token) == repr(_first_token_error(INVALID_LANGUAGE))
+
+    def test_first_error_in_data_order(self):
+        text = VALID.replace('Log    Hello', 'FOR    ${x}    IN    a\n        Log    ${x}\n    END\n    END') + \
+            INVALID_LANGUAGE
+        token = find_token_error(get_model(text))
+        assert repr(token) == repr(_first_token_error(text))
+        assert token.lineno == 9
+
+    def test_headers_of_the_model_language(self):
+        token = find_token_error(get_model(FINNISH))
+        assert repr(token) == repr(_first_token_error(FINNISH))
+        assert token.type == Token.INVALID_HEADER
+        assert find_token_error(get_model(FINNISH, lang='fi')) is None
+
+    def test_statement_errors_are_reported(self):
+        model = get_model(VALID.replace('    Log    Hello', '    IF    $x\n        Log    Hello'))
+        assert find_token_error(model) is None
+        with self.assertRaises(DataError):
+            ErrorReporter().visit(model)
+
+
+if __name__ == '__main__':
+    unittest.main()
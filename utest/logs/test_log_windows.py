@@ -15,7 +15,7 @@ import unittest
 import pytest
 from pytest import MonkeyPatch
 
-from robotide.log import LogWindow, message_to_string
+from robotide.log import LogModel, LogWindow, message_to_string
 
 
 class Message:
@@ -65,6 +65,30 @@ class TestLogWindows(unittest.TestCase):
         myapp.Destroy()
         myapp = None
 
+    def test_new_messages_are_appended_and_filtered(self):
+        import wx
+        import wx.lib.agw.aui as aui
+        from robotide.ui.notebook import NoteBook
+
+        myapp = wx.App(None)
+        frame = wx.Frame(None)
+        note = NoteBook(frame, myapp, aui.AUI_NB_DEFAULT_STYLE)
+        model = LogModel(log[:1])
+        panel = LogWindow(notebook=note, title='RIDE Log', log=model)
+        panel.update_log()
+        assert panel._output.GetText() == message_to_string(log[0])
+        for message in log[1:]:
+            model.append(message)
+        panel.update_log()
+        panel.update_log()
+        assert panel._output.GetText() == ''.join(message_to_string(msg) for msg in log)
+        panel.set_filter('PARSER')
+        assert panel._output.GetText() == message_to_string(log[2])
+        panel.set_filter(text='started ride')
+        assert panel._output.GetText() == message_to_string(log[1])
+        panel.close(note)
+        myapp.Destroy()
+
     def test_message_log(self):
         result = message_to_string(log[0])
         assert result.strip() == '20230604 20:40:41.415 [INFO]: Found Robot Framework version 6.0.2 from path'
@@ -0,0 +1,102 @@
+#  Copyright 2023-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import os
+import shutil
+import tempfile
+import unittest
+
+from robotide.log.logmodel import LogFilter, LogModel, RotatingLogFile
+
+
+class Message:
+
+    def __init__(self, timestamp, loglevel, message):
+        self.timestamp = timestamp
+        self.level = loglevel
+        self.message = message
+
+
+def _messages(count, level='INFO'):
+    return [Message('20230604 20:40:41.%03d' % i, level, 'Message %d' % i) for i in range(count)]
+
+
+class TestLogModel(unittest.TestCase):
+
+    def test_messages_since_index(self):
+        log = LogModel(_messages(5))
+        assert log.count == len(log) == 5
+        assert [m.message for m in log.since(3)] == ['Message 3', 'Message 4']
+        assert log.since(5) == []
+        assert len(log.since(0)) == 5
+
+    def test_only_latest_messages_are_kept(self):
+        log = LogModel(max_messages=3)
+        for message in _messages(10):
+            log.append(message)
+        assert log.count == 10
+        assert [m.message for m in log] == ['Message 7', 'Message 8', 'Message 9']
+        assert [m.message for m in log.since(8)] == ['Message 8', 'Message 9']
+        assert [m.message for m in log.since(2)] == ['Message 7', 'Message 8', 'Message 9']
+
+    def test_levels(self):
+        log = LogModel(_messages(2, 'WARN') + _messages(2, 'INFO'))
+        assert log.levels == ['INFO', 'WARN']
+
+
+class TestLogFilter(unittest.TestCase):
+
+    def test_empty_filter_matches_all(self):
+        assert not LogFilter().active
+        assert all(LogFilter().matches(m) for m in _messages(3))
+
+    def test_level_and_text(self):
+        messages = _messages(12, 'WARN') + _messages(12, 'INFO')
+        log_filter = LogFilter('WARN', 'message 1')
+        assert log_filter.active
+        assert [m.message for m in messages if log_filter.matches(m)] == ['Message 1', 'Message 10', 'Message 11']
+
+
+class TestRotatingLogFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test-ride.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _read(self, path):
+        with open(path, encoding='utf8') as log_file:
+            return log_file.read()
+
+    def test_written_text_is_flushed(self):
+        log_file = RotatingLogFile(self.path)
+        assert not os.path.exists(self.path)
+        log_file.write('Hyvää päivää\n')
+        assert self._read(self.path) == 'Hyvää päivää\n'
+        log_file.close()
+
+    def test_file_is_rotated_when_too_big(self):
+        log_file = RotatingLogFile(self.path, max_bytes=10, backups=2)
+        for text in ('first line\n', 'second line\n', 'third line\n', 'last\n'):
+            log_file.write(text)
+        log_file.close()
+        assert self._read(self.path) == 'last\n'
+        assert self._read(self.path + '.1') == 'third line\n'
+        assert self._read(self.path + '.2') == 'second line\n'
+        assert not os.path.exists(self.path + '.3')
+
+
+if __name__ == '__main__':
+    unittest.main()
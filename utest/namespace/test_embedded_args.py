@@ -13,9 +13,10 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import time
 import pytest
 import unittest
-from robotide.namespace.embeddedargs import EmbeddedArgsHandler
+from robotide.namespace.embeddedargs import EmbeddedArgsHandler, EmbeddedKeywordMatcher
 
 
 class KWMock(object):
@@ -51,5 +52,56 @@ class TestEmbeddedArgs(unittest.TestCase):
         assert not args.name_regexp.match('Say hello to ABCD')
 
 
+class TestEmbeddedKeywordMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = EmbeddedKeywordMatcher()
+        for name in ['add user ${user} to db', '${user} should ${foo} and ${bar}',
+                     'Say hello to ${user:[A-C]+}', 'Say ${greeting} to ${user}']:
+            self._add(name)
+
+    def _add(self, name, matcher=None):
+        kw = KWMock(name)
+        (self.matcher if matcher is None else matcher).add(EmbeddedArgsHandler(kw).name_regexp, name, kw)
+        return kw
+
+    def test_match(self):
+        assert self.matcher.match('Add User john to DB').name == 'add user ${user} to db'
+        assert self.matcher.match('john should eat and drink').name == '${user} should ${foo} and ${bar}'
+        assert self.matcher.match('add user john to somewhere else') is None
+
+    def test_first_added_template_wins(self):
+        assert self.matcher.match('Say hello to ABC').name == 'Say hello to ${user:[A-C]+}'
+        assert self.matcher.match('Say hello to ABCD').name == 'Say ${greeting} to ${user}'
+
+    def test_match_any_of_several_names(self):
+        assert self.matcher.match('Given add user john to db', 'add user john to db').name == \
+            'add user ${user} to db'
+        assert self.matcher.match('not matching', None) is None
+
+    def test_template_with_only_argument(self):
+        kw = self._add('${anything}')
+        assert self.matcher.match('whatever it is') is kw
+
+    def test_matching_performance_against_linear_scan(self):
+        matcher = EmbeddedKeywordMatcher()
+        regexps = []
+        for index in range(500):
+            kw = self._add('Keyword %d with ${arg} and ${other} args' % index, matcher)
+            regexps.append(EmbeddedArgsHandler(kw).name_regexp)
+        names = ['Library keyword number %d' % index for index in range(200)]
+        start_time = time.time()
+        for name in names:
+            assert not any(regexp.match(name) for regexp in regexps)
+        linear_time = time.time() - start_time
+        start_time = time.time()
+        for name in names:
+            assert matcher.match(name) is None
+        indexed_time = time.time() - start_time
+        assert matcher.match('Keyword 499 with 1 and 2 args').name == 'Keyword 499 with ${arg} and ${other} args'
+        assert indexed_time < linear_time, 'Indexed matching took %fs, linear scan %fs.' % (indexed_time,
+                                                                                         linear_time)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,66 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import unittest
+
+from robotide.namespace.cache import KeywordIndex
+
+
+class TestKeywordIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = KeywordIndex()
+        self.index.put('suite.robot', 'suite keywords',
+                       resources=['common.resource'], libraries=['OperatingSystem'])
+        self.index.put('common.resource', 'resource keywords')
+
+    def test_cache_hit(self):
+        assert 'suite keywords' == self.index.get('suite.robot')
+        assert 'resource keywords' == self.index.get('common.resource')
+
+    def test_entries_do_not_expire(self):
+        self.index.get('suite.robot')
+        self.index.get('suite.robot')
+        assert 'suite keywords' == self.index.get('suite.robot')
+
+    def test_invalidating_datafile(self):
+        self.index.invalidate('suite.robot')
+        assert self.index.get('suite.robot') is None
+        assert 'resource keywords' == self.index.get('common.resource')
+
+    def test_invalidating_imported_resource_invalidates_importers(self):
+        self.index.invalidate('common.resource')
+        assert self.index.get('common.resource') is None
+        assert self.index.get('suite.robot') is None
+
+    def test_invalidating_library(self):
+        self.index.invalidate_library('OperatingSystem')
+        assert self.index.get('suite.robot') is None
+        assert 'resource keywords' == self.index.get('common.resource')
+
+    def test_unrelated_invalidation(self):
+        self.index.invalidate('other.robot')
+        self.index.invalidate_library('Collections')
+        assert 'suite keywords' == self.index.get('suite.robot')
+
+    def test_statistics(self):
+        self.index.get('suite.robot')
+        self.index.get('missing.robot')
+        self.index.clear()
+        self.index.get('suite.robot')
+        assert {'hits': 1, 'misses': 2, 'size': 0} == self.index.statistics
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,9 +16,11 @@
 import unittest
 import sys
 import os
+import time
 from robotide.spec.librarymanager import LibraryManager
 from threading import Thread
 from robotide.namespace.cache import LibraryCache
+from robotide.spec.libraryfingerprint import library_fingerprint
 from utest.resources import DATAPATH
 
 sys.path.append(os.path.join(DATAPATH, 'libs'))
@@ -48,6 +50,20 @@ class TestLibraryCache(unittest.TestCase):
     def test_importing_library_with_dictionary_arg(self):
         LibraryCache({}, lambda:0, self._library_manager)._get_library('ArgLib', [{'moi':'hoi'}, []])
 
+    def test_library_imports_are_fetched_together(self):
+        cache = LibraryCache({}, lambda:0, self._library_manager)
+        batches = []
+        get_libraries = cache._get_libraries
+        cache._get_libraries = lambda libraries: batches.append(libraries) or get_libraries(libraries)
+        test_lib, arg_lib, aliased = cache.get_keywords_of_libraries(
+            [('TestLib', None, None), ('ArgLib', ['foo'], None), ('TestLib', None, 'Other')])
+        self.assertEqual(len(batches), 1)
+        self._assert_keyword_in_keywords(test_lib, 'Testlib Keyword')
+        self._assert_keyword_in_keywords(arg_lib, 'Get Mandatory')
+        self._assert_keyword_in_keywords(aliased, 'Testlib Keyword')
+        cache.get_library_keywords('ArgLib', ['foo'])
+        self.assertEqual(len(batches), 1)
+
     def test_importing_from_two_threads(self):
         cache = self._create_cache_with_auto_imports('TestLib')
         self._thread_results = []
@@ -62,6 +78,34 @@ class TestLibraryCache(unittest.TestCase):
         t2.join()
         self.assertEqual(['ok', 'ok'], self._thread_results)
 
+    def test_library_is_refetched_only_when_its_files_change(self):
+        source = os.path.join(DATAPATH, 'libs', 'TestLib.py')
+        fingerprint = library_fingerprint([source])
+        self.assertFalse(LibraryCache._is_stale(time.time() - 3600, fingerprint))
+        self.assertTrue(LibraryCache._is_stale(time.time(), fingerprint.replace(source, source + 'c')))
+        self.assertTrue(LibraryCache._is_stale(time.time(), None))
+
+    def test_failed_import_is_retried_after_a_while(self):
+        fingerprint = library_fingerprint([], failed_imports=1)
+        self.assertFalse(LibraryCache._is_stale(time.time(), fingerprint))
+        self.assertTrue(LibraryCache._is_stale(time.time() - 3600, fingerprint))
+
+    def test_failed_import_is_retried_less_often_after_every_failure(self):
+        self.assertTrue(LibraryCache._is_stale(time.time() - 15, library_fingerprint([], failed_imports=1)))
+        self.assertFalse(LibraryCache._is_stale(time.time() - 15, library_fingerprint([], failed_imports=2)))
+        self.assertTrue(LibraryCache._is_stale(time.time() - 25, library_fingerprint([], failed_imports=2)))
+        self.assertFalse(LibraryCache._is_stale(time.time() - 1800, library_fingerprint([], failed_imports=10)))
+        self.assertTrue(LibraryCache._is_stale(time.time() - 3700, library_fingerprint([], failed_imports=100)))
+
+    def test_library_without_keywords_is_not_retried(self):
+        self.assertFalse(LibraryCache._is_stale(time.time() - 3600, library_fingerprint([])))
+
+    def test_import_falling_back_to_spec_is_retried_after_a_while(self):
+        spec = os.path.join(DATAPATH, 'libs', 'TestLib.py')
+        fingerprint = library_fingerprint([spec], failed_imports=1)
+        self.assertFalse(LibraryCache._is_stale(time.time(), fingerprint))
+        self.assertTrue(LibraryCache._is_stale(time.time() - 3600, fingerprint))
+
     def _create_cache_with_auto_imports(self, auto_import):
         settings = {'auto imports': [auto_import]}
         return LibraryCache(settings, lambda:0, self._library_manager)
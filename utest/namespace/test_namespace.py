@@ -7,6 +7,7 @@ from robotide.robotapi import (
     TestCaseFile, Resource, VariableTable, TestDataDirectory)
 from robotide.context import IS_WINDOWS
 from robotide.namespace.namespace import _VariableStash
+from robotide.publish import RideUserKeywordAdded
 from robotide.controller.basecontroller import WithNamespace
 from robotide.controller.filecontrollers import data_controller
 from robotide.spec.iteminfo import ArgumentInfo, VariableInfo
@@ -140,6 +141,17 @@ class TestKeywordSuggestions(_DataFileTest):
         sugs = self.ns.get_suggestions_for(self.kw, 'sHoUlD')
         assert EXISTING_USER_KEYWORD in [s.name for s in sugs]
 
+    def test_ranked_suggestions(self):
+        sugs = self.ns.get_ranked_suggestions_for(self.kw, 'sbik')
+        assert sugs[0].name == EXISTING_USER_KEYWORD
+        sugs = self.ns.get_ranked_suggestions_for(self.kw, 'shbeeq', limit=5)
+        assert len(sugs) <= 5
+        assert 'Should Be Equal' in [s.name for s in sugs]
+
+    def test_ranked_suggestions_prefer_used_keywords(self):
+        sugs = self.ns.get_ranked_suggestions_for(self.kw, 'shbeeq', usage={'shouldbeequalasstrings': 10})
+        assert sugs[0].name == 'Should Be Equal As Strings'
+
     def test_user_embedded_arg_keywords(self):
         sugs = self.ns.get_suggestions_for(self.kw, 'My')
         assert 'My ${private} Keyword' in [s.name for s in sugs]
@@ -494,6 +506,17 @@ class TestKeywordSearch(_DataFileTest):
         assert self.ns.find_user_keyword(
             self.tcf, 'given and UK Fromresource from rESOURCE with variaBLE') is None
 
+    def test_keyword_cache_is_invalidated_by_data_changes(self):
+        tcf = _build_test_case_file()
+        tcf.source = '/tmp/keyword_cache.robot'
+        assert self.ns.find_user_keyword(tcf, 'Added Later') is None
+        hits = self.ns.keyword_cache_statistics()['hits']
+        tcf.keyword_table.add('Added Later')
+        assert self.ns.find_user_keyword(tcf, 'Added Later') is None
+        assert self.ns.keyword_cache_statistics()['hits'] == hits + 1
+        RideUserKeywordAdded(datafile=tcf, name='Added Later', item=None).publish()
+        assert self.ns.find_user_keyword(tcf, 'Added Later') is not None
+
     def assert_in_keywords(self, keywords, *kw_names):
         for kw_name in kw_names:
             if not self._in_keywords(keywords, kw_name):
@@ -38,6 +38,22 @@ class TestNamespacePerformance(unittest.TestCase):
         end_time = self._execute_keyword_find_function_n_times(find_function_name, times)
         assert end_time < 0.5, 'Checking %d kws took too long: %fs.' % (times, end_time)
 
+    def test_suggestion_performance(self):
+        # Ctrl+Space in a suite with 4000 user keywords, about 5000 with the libraries
+        ns, project, library_manager = self._load_project(KW4000_TESTCASEFILE)
+        try:
+            ns.update_words_cache(['${word %d}' % i for i in range(1000)])
+            controller = project.controller.tests[0]
+            assert [sug.name for sug in ns.get_suggestions_for(controller, 'My Keyword 3999')] == ['My Keyword 3999']
+            times = 100
+            start_time = time.time()
+            for i in range(times):
+                ns.get_suggestions_for(controller, 'My Keyword %d' % i)
+            end_time = time.time() - start_time
+            assert end_time < 0.5, 'Suggesting %d times took too long: %fs.' % (times, end_time)
+        finally:
+            library_manager.stop()
+
     def _FLICKERS_measure_user_keyword_find_performance(self):
         times = 1000
         kw1000_result = self._execute_keyword_find_function_n_times('is_user_keyword', times, KW1000_TESTCASEFILE)
@@ -81,13 +97,18 @@ class TestNamespacePerformance(unittest.TestCase):
         return a, b, c
 
     def _load(self, testcasefile):
+        ns, project, library_manager = self._load_project(testcasefile)
+        return ns, project.controller.data, library_manager
+
+    @staticmethod
+    def _load_project(testcasefile):
         ns = Namespace(FakeSettings())
         library_manager = LibraryManager(':memory:')
         library_manager.create_database()
         project = Project(ns, settings=ns.settings, library_manager=library_manager)
         project.load_datafile(testcasefile,
                             MessageRecordingLoadObserver())
-        return ns, project.controller.data, library_manager
+        return ns, project, library_manager
 
     def _execute_keyword_find_function_n_times(self, function, n, filename=TESTCASEFILE_WITH_EVERYTHING):
         ns, testcasefile, library_manager = self._load(filename)
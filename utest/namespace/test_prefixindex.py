@@ -0,0 +1,39 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import unittest
+
+from robotide.namespace.prefixindex import PrefixIndex
+
+
+class TestPrefixIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PrefixIndex(['Log Many', 'BuiltIn.Log', 'Should Be Equal', 'Sleep'],
+                                 lambda name: {name.lower(), name.lower().split('.')[-1]})
+
+    def test_find_by_prefix(self):
+        assert self.index.find(['s']) == ['Should Be Equal', 'Sleep']
+        assert self.index.find(['sl']) == ['Sleep']
+        assert self.index.find(['x']) == []
+
+    def test_item_with_several_matching_keys_is_found_once(self):
+        assert self.index.find(['log', 'builtin']) == ['BuiltIn.Log', 'Log Many']
+
+    def test_empty_prefix_finds_all(self):
+        assert len(self.index.find([''])) == len(self.index) == 4
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import time
+import unittest
+
+from robotide.namespace.ranking import RankedIndex, RecentlyUsed, LIBRARY, SAME_FILE
+
+NAMES = ['Should Be Equal', 'Should Be Equal As Strings', 'Set Suite Variable', 'Log', 'Log Many',
+         'BuiltIn.Sleep', 'getValueFromUser', '${suite name}']
+
+
+class TestRankedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = RankedIndex(NAMES)
+
+    def test_subsequence_match_at_word_starts(self):
+        assert self.index.find('sbe')[:2] == ['Should Be Equal', 'Should Be Equal As Strings']
+        assert self.index.find('gvfu') == ['getValueFromUser']
+        assert self.index.find('xyz') == []
+
+    def test_prefix_match_is_best(self):
+        assert self.index.find('log') == ['Log', 'Log Many']
+        assert self.index.find('sle')[0] == 'BuiltIn.Sleep'
+
+    def test_variable_decoration_is_ignored(self):
+        assert self.index.find('${suite')[0] == '${suite name}'
+        assert self.index.find('suitename') == ['${suite name}']
+
+    def test_limit(self):
+        assert len(self.index.find('', limit=3)) == 3
+        assert len(self.index.find('')) == len(NAMES)
+
+    def test_locality_usage_and_recent_use(self):
+        index = RankedIndex(['Open Page', 'Open Panel'],
+                            locality=lambda name: SAME_FILE if name == 'Open Panel' else LIBRARY)
+        assert index.find('op') == ['Open Panel', 'Open Page']
+        assert index.find('op', usage={'openpage': 100}) == ['Open Page', 'Open Panel']
+        recent = RecentlyUsed()
+        recent.add('Open Page')
+        assert index.find('op', recent=recent) == ['Open Page', 'Open Panel']
+
+    def test_recently_used_score(self):
+        recent = RecentlyUsed(size=2)
+        recent.add('a')
+        recent.add('b')
+        assert recent.score('b') > recent.score('a') > 0
+        recent.add('c')
+        assert recent.score('a') == 0
+
+    def test_matches_of_extended_query_are_the_same(self):
+        index = RankedIndex(NAMES)
+        for query in ['s', 'sh', 'sbe', 'sbeq']:
+            index.find(query)
+        assert index.find('sbeq') == RankedIndex(NAMES).find('sbeq')
+        assert index.find('sle') == RankedIndex(NAMES).find('sle')
+
+    def test_top_50_of_10000_candidates(self):
+        words = ['Open', 'Close', 'Get', 'Set', 'Should', 'Be', 'Click', 'Element', 'Wait', 'Until', 'Page']
+        names = ['%s %s %d' % (words[i % 11], words[i // 11 % 11], i) for i in range(10000)]
+        index = RankedIndex(names)
+        usage = {name.lower().replace(' ', ''): i % 7 for i, name in enumerate(names)}
+        recent = RecentlyUsed()
+        ranking_time = scanning_time = 0.0
+        for typed in ['se', 'cle', 'wupc', 'Should Be']:
+            queries = [typed[:end] for end in range(1, len(typed) + 1)]
+            # Typing the query and then deleting it
+            for query in queries + queries[::-1]:
+                start_time = time.perf_counter()
+                assert len(index.find(query, usage=usage, recent=recent)) <= 50
+                ranking_time += time.perf_counter() - start_time
+                start_time = time.perf_counter()
+                _scan(names, query)
+                scanning_time += time.perf_counter() - start_time
+        # Matching the kept matches must be faster than scanning all the candidates for every query
+        assert ranking_time < scanning_time, \
+            'Ranking took %fs, scanning the candidates took %fs.' % (ranking_time, scanning_time)
+
+
+def _scan(names, query):
+    # Finds the names having the characters of the query in the same order
+    query = query.lower().replace(' ', '')
+    result = []
+    for name in names:
+        characters = iter(name.lower())
+        if all(c in characters for c in query):
+            result.append(name)
+    return result
+
+if __name__ == '__main__':
+    unittest.main()
@@ -94,6 +94,39 @@ class TestExcludes(unittest.TestCase):
         self.assertFalse(self.exclude.contains('foo/zar'))
         self.assertTrue(self.exclude.contains('foo/gar'))
 
+    def test_excludes_file_is_not_read_again_when_unchanged(self):
+        self.exclude.update_excludes([_join('foo'), _join('foo', '*', 'bar')])
+        reads = []
+        get_excludes = self.exclude._get_excludes
+        self.exclude._get_excludes = lambda: reads.append(1) or get_excludes()
+        for _ in range(100):
+            self.assertTrue(self.exclude.contains('foo/baz'))
+            self.assertFalse(self.exclude.contains('qux/foo/baz/bar'))
+        self.assertEqual(len(reads), 1)
+
+    def test_updated_excludes_are_used(self):
+        self.assertFalse(self.exclude.contains('foo/bar'))
+        self.exclude.update_excludes([_join('foo')])
+        self.assertTrue(self.exclude.contains('foo/bar'))
+        self.exclude.write_excludes([_join('qux')])
+        self.assertFalse(self.exclude.contains('foo/bar'))
+
+    def test_excludes_file_changed_on_disk_is_read(self):
+        self.exclude.update_excludes([_join('foo')])
+        self.assertTrue(self.exclude.contains('foo/bar'))
+        stat = os.stat(self.file_path)
+        with open(self.file_path, 'w') as exclude_file:
+            exclude_file.write(_join('qux') + '\n')
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertFalse(self.exclude.contains('foo/bar'))
+        self.assertTrue(self.exclude.contains('qux/bar'))
+
+    def test_given_excludes_are_used_instead_of_file(self):
+        self.exclude.update_excludes([_join('foo')])
+        self.assertFalse(self.exclude.contains('foo/bar', excludes=[_join('qux')]))
+        self.assertTrue(self.exclude.contains('qux/bar', excludes=[_join('qux')]))
+
+
 def _join(*args):
     return os.path.join(*args) + sep
 
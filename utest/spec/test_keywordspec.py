@@ -16,11 +16,13 @@
 import unittest
 import sys
 import os
+import shutil
+import tempfile
 import pytest
 
 from utest.resources import DATAPATH
 from robotide.context import LIBRARY_XML_DIRECTORY
-from robotide.spec.xmlreaders import SpecInitializer
+from robotide.spec.xmlreaders import SpecDirectoryIndex, SpecInitializer, read_spec_header
 from robotide.utils import overrides
 
 sys.path.append(os.path.join(DATAPATH, 'libs'))
@@ -126,6 +128,85 @@ class TestSpecInitializer(unittest.TestCase):
         self.assertEqual(specinitializer.directory, 'my_dir')
 
 
+SPEC = '''<?xml version="1.0" encoding="UTF-8"?>
+<keywordspec name="%s" type="LIBRARY" format="ROBOT">
+<version>%s</version>
+<doc>Documentation</doc>
+<keywords>
+<kw name="Keyword"><doc>Doc</doc></kw>
+</keywords>
+</keywordspec>
+'''
+
+
+class CountingSpecDirectoryIndex(SpecDirectoryIndex):
+
+    def __init__(self, directory):
+        SpecDirectoryIndex.__init__(self, directory)
+        self.read = []
+
+    @overrides(SpecDirectoryIndex)
+    def _read_header(self, path):
+        self.read.append(os.path.basename(path))
+        return SpecDirectoryIndex._read_header(path)
+
+
+class TestSpecDirectoryIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._index = CountingSpecDirectoryIndex(self._directory)
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_reading_spec_header(self):
+        self._write('first.xml', 'MyLib', '1.2')
+        self.assertEqual(read_spec_header(os.path.join(self._directory, 'first.xml')), ('MyLib', '1.2'))
+        self.assertEqual(read_spec_header(os.path.join(DATAPATH, 'libs', 'OldStyleLibSpecLibrary.xml')),
+                         ('OldStyleLibSpecLibrary', None))
+
+    def test_newest_version_is_found(self):
+        self._write('old.xml', 'MyLib', '1.0')
+        self._write('new.xml', 'MyLib', '2.0')
+        self._write('other.xml', 'Other', '')
+        self._write('not_a_spec.txt', 'MyLib', '3.0')
+        self.assertEqual(self._index.find('MyLib'), os.path.join(self._directory, 'new.xml'))
+        self.assertEqual(self._index.find('Other'), os.path.join(self._directory, 'other.xml'))
+        self.assertEqual(self._index.find('Missing'), None)
+
+    def test_unchanged_files_are_read_once(self):
+        self._write('first.xml', 'MyLib', '1.0')
+        self._write('second.xml', 'Other', '1.0')
+        self._index.find('MyLib')
+        self._index.find('Other')
+        self._index.find('Missing')
+        self.assertEqual(sorted(self._index.read), ['first.xml', 'second.xml'])
+
+    def test_changed_files_are_read_again(self):
+        self._write('first.xml', 'MyLib', '1.0')
+        self._index.find('MyLib')
+        path = self._write('first.xml', 'Renamed', '1.0')
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self._write('second.xml', 'MyLib', '1.0')
+        self.assertEqual(self._index.find('MyLib'), os.path.join(self._directory, 'second.xml'))
+        self.assertEqual(self._index.find('Renamed'), path)
+        self.assertEqual(self._index.read, ['first.xml', 'first.xml', 'second.xml'])
+
+    def test_removed_files_are_dropped(self):
+        path = self._write('first.xml', 'MyLib', '1.0')
+        self._index.find('MyLib')
+        os.remove(path)
+        self.assertEqual(self._index.find('MyLib'), None)
+
+    def _write(self, filename, name, version):
+        path = os.path.join(self._directory, filename)
+        with open(path, 'w') as spec:
+            spec.write(SPEC % (name, version))
+        return path
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -14,10 +14,11 @@
 #  limitations under the License.
 
 import os
+import sqlite3
 import sys
 import unittest
 from robotide.spec.iteminfo import LibraryKeywordInfo
-from robotide.spec.librarydatabase import LibraryDatabase
+from robotide.spec.librarydatabase import LibraryDatabase, SCHEMA_VERSION, migrate_database
 from robotide.spec.libraryfetcher import get_import_result
 
 testlibpath = os.path.join(os.path.dirname(__file__), '..', 'resources',
@@ -110,6 +111,52 @@ class TestLibraryDatabase(unittest.TestCase):
         self._database.insert_library_keywords('library', '', [])
         self.assertTrue(self._database.library_exists('library', ''))
 
+    def test_fetching_keywords_of_several_libraries(self):
+        collections_kws = self._get_and_insert_keywords('Collections', '')
+        self._database.insert_library_keywords('lib.py', ['foo'], [LibraryKeywordInfo('old', 'doc', 'ROBOT',
+                                                                                        'lib.py', '')])
+        self._database.insert_library_keywords('lib.py', ['foo'], [LibraryKeywordInfo('new', 'doc', 'TEXT',
+                                                                                        'lib.py', ['a', 'b'])])
+        self._database.insert_library_keywords('empty', '', [])
+        result = self._database.fetch_keywords_of_libraries([('Collections', ''), ('lib.py', ['foo']),
+                                                             ('empty', ''), ('missing', '')])
+        self.assertEqual(sorted(result), [('Collections', ''), ('empty', ''), ('lib.py', "['foo']")])
+        self._check_keywords(collections_kws, result['Collections', ''][2])
+        last_updated, _, keywords = result['lib.py', "['foo']"]
+        self.assertEqual(last_updated, self._database.get_library_last_updated('lib.py', ['foo']))
+        self.assertEqual([(kw.name, kw.doc_format, kw.arguments) for kw in keywords], [('new', 'TEXT', ['a', 'b'])])
+        self.assertEqual(result['empty', ''][2], [])
+
+    def test_fingerprint_is_stored_and_updated(self):
+        self._database.insert_library_keywords('lib.py', '', [], 'first')
+        self.assertEqual(self._database.fetch_keywords_of_libraries([('lib.py', '')])['lib.py', ''][1], 'first')
+        self._database.update_library_timestamp('lib.py', '')
+        self.assertEqual(self._database.fetch_keywords_of_libraries([('lib.py', '')])['lib.py', ''][1], 'first')
+        self._database.update_library_timestamp('lib.py', '', fingerprint='second')
+        self.assertEqual(self._database.fetch_keywords_of_libraries([('lib.py', '')])['lib.py', ''][1], 'second')
+
+    def test_created_database_has_current_schema(self):
+        self.assertEqual(self._database._connection.execute('PRAGMA user_version').fetchone()[0], SCHEMA_VERSION)
+        self.assertEqual(self._index_names(self._database._connection),
+                         ['keywords_by_library', 'libraries_by_name_and_arguments'])
+
+    def test_migrating_database_without_indexes(self):
+        connection = sqlite3.connect(':memory:')
+        connection.executescript('CREATE TABLE libraries (id INTEGER PRIMARY KEY, name TEXT, doc_format TEXT,'
+                                 ' arguments TEXT, last_updated REAL);'
+                                 'CREATE TABLE keywords (name TEXT, doc TEXT, arguments TEXT, library_name TEXT,'
+                                 ' library INTEGER, FOREIGN KEY(library) REFERENCES libraries(id));')
+        migrate_database(connection)
+        migrate_database(connection)
+        self.assertEqual(connection.execute('PRAGMA user_version').fetchone()[0], SCHEMA_VERSION)
+        self.assertEqual(self._index_names(connection), ['keywords_by_library', 'libraries_by_name_and_arguments'])
+        self.assertIn('fingerprint', [column[1] for column in connection.execute('PRAGMA table_info(libraries)')])
+        connection.close()
+
+    @staticmethod
+    def _index_names(connection):
+        return sorted(name for name, in connection.execute("select name from sqlite_master where type = 'index'"))
+
     def _get_and_insert_keywords(self, library_name, library_arguments):
         kws = get_import_result(library_name, library_arguments)
         self._database.insert_library_keywords(library_name, library_arguments, kws)
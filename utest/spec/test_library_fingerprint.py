@@ -0,0 +1,86 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+from robotide.spec.libraryfingerprint import (failed_imports, fingerprint_changed, library_files,
+                                              library_fingerprint)
+
+
+class TestLibraryFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        fd, self._path = tempfile.mkstemp(suffix='.py')
+        os.write(fd, b'def keyword():\n    pass\n')
+        os.close(fd)
+
+    def tearDown(self):
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
+    def test_unchanged_files(self):
+        self.assertFalse(fingerprint_changed(library_fingerprint([self._path, None])))
+        self.assertFalse(fingerprint_changed(library_fingerprint([])))
+
+    def test_modified_file(self):
+        fingerprint = library_fingerprint([self._path])
+        with open(self._path, 'a') as source:
+            source.write('# edited\n')
+        self.assertTrue(fingerprint_changed(fingerprint))
+
+    def test_touched_file(self):
+        fingerprint = library_fingerprint([self._path])
+        stat = os.stat(self._path)
+        os.utime(self._path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertTrue(fingerprint_changed(fingerprint))
+
+    def test_removed_file(self):
+        fingerprint = library_fingerprint([self._path])
+        os.remove(self._path)
+        self.assertTrue(fingerprint_changed(fingerprint))
+
+    def test_missing_fingerprint(self):
+        self.assertTrue(fingerprint_changed(None))
+
+    def test_failed_imports(self):
+        fingerprint = library_fingerprint([self._path], failed_imports=3)
+        self.assertEqual(failed_imports(fingerprint), 3)
+        self.assertFalse(fingerprint_changed(fingerprint))
+        self.assertEqual(failed_imports(library_fingerprint([self._path])), 0)
+        self.assertEqual(failed_imports(None), 0)
+        self.assertEqual(failed_imports('[["<failed import>"]]'), 1)
+
+    def test_module_library_files(self):
+        self.assertEqual(library_files(self._path), [self._path])
+        self.assertEqual(library_files(None), [])
+
+    def test_package_library_files(self):
+        package = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, package)
+        os.mkdir(os.path.join(package, 'sub'))
+        for name in ('__init__.py', 'keywords.py', os.path.join('sub', 'more.py')):
+            with open(os.path.join(package, name), 'w') as source:
+                source.write('# module\n')
+        fingerprint = library_fingerprint(library_files(os.path.join(package, '__init__.py')))
+        self.assertFalse(fingerprint_changed(fingerprint))
+        with open(os.path.join(package, 'sub', 'more.py'), 'a') as source:
+            source.write('# edited\n')
+        self.assertTrue(fingerprint_changed(fingerprint))
+
+
+if __name__ == '__main__':
+    unittest.main()
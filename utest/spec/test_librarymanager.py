@@ -13,11 +13,15 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import json
 import os
 import pytest
 import unittest
 import sys
+from unittest.mock import patch
+from robotide.spec import librarymanager
 from robotide.spec.libraryfetcher import get_import_result
+from robotide.spec.libraryfingerprint import failed_imports, fingerprint_changed
 from robotide.spec.librarymanager import LibraryManager
 from utest.resources import DATAPATH
 
@@ -53,6 +57,16 @@ class TestLibraryManager(unittest.TestCase):
         self._library_manager._handle_message()
         self.assertEqual(self._keywords, [])
 
+    def test_only_first_failed_import_is_reported(self):
+        database = self._library_manager._database
+        with patch.object(librarymanager, 'RideLogException') as log_exception:
+            for attempts in (1, 2, 3):
+                self._library_manager.fetch_keywords('FooBarZoo', '', self._callback)
+                self._library_manager._handle_message()
+                _, fingerprint, _ = database.fetch_keywords_of_libraries([('FooBarZoo', '')])['FooBarZoo', '']
+                self.assertEqual(failed_imports(fingerprint), attempts)
+        self.assertEqual(log_exception.call_count, 1)
+
     @pytest.mark.skip("FAILS since 2.2dev33")
     def test_fetching_from_library_xml(self):
         self._library_manager.fetch_keywords('LibSpecLibrary', '', self._callback)
@@ -68,6 +82,73 @@ class TestLibraryManager(unittest.TestCase):
         self._library_manager._handle_message()
         self.assertEqual(self._keywords, [])
 
+    def test_requests_for_library_being_fetched_wait_for_the_same_import(self):
+        calls = []
+        self._library_manager._in_flight[('BuiltIn', '')] = [(self._callback, False)]
+        self._library_manager.fetch_keywords('BuiltIn', '', calls.append)
+        self._library_manager._handle_message()
+        self.assertEqual(calls, [])
+        keywords = get_import_result('BuiltIn', '')
+        self._library_manager._update_database_and_call_callbacks([('BuiltIn', '', keywords, '[]')])
+        self.assertFalse(self._library_manager._keywords_differ(keywords, self._keywords))
+        self.assertEqual(calls, [keywords])
+        self.assertEqual(self._library_manager._in_flight, {})
+
+    def test_results_are_written_in_one_batch(self):
+        collections = get_import_result('Collections', '')
+        string = get_import_result('String', '')
+        for name in ('Collections', 'String'):
+            self._library_manager._in_flight[(name, '')] = [(lambda kws: None, True)]
+        self._library_manager._update_database_and_call_callbacks([('Collections', '', collections, '[]'),
+                                                                   ('String', '', string, '[]')])
+        database = self._library_manager._database
+        self.assertFalse(self._library_manager._keywords_differ(
+            collections, database.fetch_library_keywords('Collections', '')))
+        self.assertFalse(self._library_manager._keywords_differ(
+            string, database.fetch_library_keywords('String', '')))
+
+    def test_fingerprint_of_library_source_is_stored(self):
+        self._library_manager.fetch_keywords('Collections', '', self._callback)
+        self._library_manager._handle_message()
+        database = self._library_manager._database
+        _, fingerprint, _ = database.fetch_keywords_of_libraries([('Collections', '')])['Collections', '']
+        self.assertTrue(any(path.endswith('Collections.py') for path, _, _ in json.loads(fingerprint)))
+        self.assertFalse(fingerprint_changed(fingerprint))
+
+    def test_library_database_connection_is_reused_per_thread(self):
+        from threading import Thread
+        database = self._library_manager.get_library_database()
+        self.assertIs(database, self._library_manager.get_library_database())
+        other = []
+        thread = Thread(target=lambda: other.append(self._library_manager.get_library_database()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(database, other[0])
+
+    def test_libraries_are_imported_in_worker_processes(self):
+        library_manager = LibraryManager(':memory:', processes=2)
+        library_manager.start()
+        library_manager.create_database()
+        try:
+            collections, string, unknown = library_manager.get_and_insert_keywords_of_libraries(
+                [('Collections', ''), ('String', ''), ('FooBarZoo', '')], timeout=60)
+        finally:
+            library_manager.stop()
+            library_manager.join(timeout=60)
+        self.assertFalse(library_manager._keywords_differ(collections, get_import_result('Collections', '')))
+        self.assertFalse(library_manager._keywords_differ(string, get_import_result('String', '')))
+        self.assertEqual(unknown, [])
+        self.assertFalse(library_manager.is_alive())
+        self.assertIsNone(library_manager._executor)
+
+    def test_library_database_connections_are_closed_on_stop(self):
+        import sqlite3
+        database = self._library_manager.get_library_database()
+        self._library_manager.stop()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            database.fetch_library_keywords('BuiltIn', '')
+        self.assertIsNot(database, self._library_manager.get_library_database())
+
     def _callback(self, keywords):
         self._keywords = keywords
 
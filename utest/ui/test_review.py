@@ -15,7 +15,7 @@
 
 import unittest
 from utest.resources import datafilereader
-from robotide.ui.review import ReviewRunner
+from robotide.ui.review import ResultModel, ReviewRunner
 from robotide.publish import PUBLISHER
 
 
@@ -54,6 +54,36 @@ class TestReview(unittest.TestCase):
         assert self.helper(True, True, True, True, True,
                                 ".*es,.*o{2}", ["Abc"])
 
+    def test_unused_keywords(self):
+        assert self._unused_keywords() == [('Abc.robot', 'Another keyword'), ('Res1.robot', 'Not used keyword'),
+                                           ('foobar.robot', 'A third unused keyword')]
+
+    def test_calls_from_filtered_out_files_are_counted(self):
+        self.runner.set_filter_active(True)
+        self.runner.set_filter_source_testcases(False)
+        assert self._unused_keywords() == [('Abc.robot', 'Another keyword'), ('Res1.robot', 'Not used keyword'),
+                                           ('foobar.robot', 'A third unused keyword')]
+        self.runner.parse_filter_string('Res1')
+        assert self._unused_keywords() == [('Abc.robot', 'Another keyword'),
+                                           ('foobar.robot', 'A third unused keyword')]
+
+    def test_keywords_called_with_resource_prefix_are_used(self):
+        project = datafilereader.construct_project(datafilereader.RESOURCE_PREFIXED_KEYWORDS_PATH)
+        try:
+            self.runner = ReviewRunner(project, self.runner._model)
+            assert self._unused_keywords() == [('external_res.resource', 'unusedkw'), ('res01.resource', 'kw4'),
+                                               ('res01.resource', 'kw5')]
+        finally:
+            project.close()
+
+    def _unused_keywords(self):
+        model = ResultModel()
+        self.runner._model = model
+        model.begin_search()
+        self.runner._run()
+        assert not model.searching
+        return sorted((keyword.source, keyword.name) for keyword in model.keywords)
+
     def helper(self, tcfiles, resfiles, exclude, regex, active, string,
                results):
         self.runner.set_filter_active(active)